@@ -1,17 +1,20 @@
 from pathlib import Path
-import io
+import hashlib
+import os
 
 import streamlit as st
 import pandas as pd
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 
-from resume_ranker.pipeline import rank
+from resume_ranker import trace
+from resume_ranker.io import LoadStats, iter_documents, load_jd_text
+from resume_ranker.pipeline import score_texts
 from resume_ranker.config import Config, Weights
+from resume_ranker.results import ScoreTable
 
 st.set_page_config(page_title="Resume Ranker", layout="wide")
 # --- Reset hook (token-protected) --------------------------------------------
-import os, shutil
-import streamlit as st
 
 def _get_query_params():
     # works on older/newer Streamlit
@@ -35,7 +38,6 @@ if reset_flag and allow_token and reset_token == allow_token:
         try:
             if os.path.exists("app_data.db"):
                 os.remove("app_data.db")
-            shutil.rmtree(".streamlit_tmp", ignore_errors=True)
         except Exception:
             pass
 
@@ -66,10 +68,10 @@ h3 { font-size: 1.1rem; font-weight: 600; line-height: 1.3; }
 </style>
 """, unsafe_allow_html=True)
 
-# Keep raw uploaded files (for download buttons later)
-if "raw_files" not in st.session_state:
-    # { candidate_name: (original_filename, raw_bytes) }
-    st.session_state.raw_files = {}
+# Extracted text of this session's uploads, keyed by SHA-256 of the file bytes. Uploads
+# are parsed in memory as they arrive and never written to disk or shared across sessions.
+if "texts" not in st.session_state:
+    st.session_state.texts = {}
 
 # --- Sidebar controls ---------------------------------------------------------
 with st.sidebar:
@@ -112,8 +114,36 @@ skills_input = st.text_input(
 # --- Resume input -------------------------------------------------------------
 st.subheader("Resumes")
 resumes = st.file_uploader("Upload resumes", type=["txt", "pdf", "docx"], accept_multiple_files=True)
+# candidate name -> upload, for the download buttons
+uploads = {Path(f.name).stem: f for f in resumes or []}
+
+# Extract on every rerun: only uploads not seen before in this session are parsed
+docs = []
+if resumes:
+    load_stats = LoadStats()
+    extract_bar = st.progress(0.0, text=f"Reading 0 / {len(resumes)} resumes")
+    for doc in iter_documents(((f.name, f.getvalue()) for f in resumes), stats=load_stats,
+                              memo=st.session_state.texts):
+        docs.append(doc)
+        seen = load_stats.files + len(load_stats.errors)
+        extract_bar.progress(seen / len(resumes), text=f"Reading {seen} / {len(resumes)} resumes")
+    extract_bar.empty()
+    for err in load_stats.errors:
+        st.warning(f"Could not read {err.path}: {err.message}")
+
+# --- Action -----------------------------------------------------------------
+def _upload_key(jd_bytes: bytes, files, skills: str) -> str:
+    """Identity of the uploaded set: scores are reused until this changes."""
+    h = hashlib.sha256(jd_bytes)
+    for f in files:
+        h.update(f.name.encode())
+        h.update(hashlib.sha256(f.getvalue()).digest())
+    h.update(skills.encode())
+    return h.hexdigest()
+
+jd_bytes = jd_file.getvalue() if jd_file else (jd_text or "").encode("utf-8")
+upload_key = _upload_key(jd_bytes, resumes or [], skills_input.strip())
 
-# --- Action -------------------------------------------------------------------
 if st.button("Rank candidates", type="primary"):
     if (jd_mode == "Upload file" and not jd_file) or (jd_mode == "Paste text" and not jd_text):
         st.error("Please provide the Job Description (upload a file or paste text).")
@@ -122,161 +152,167 @@ if st.button("Rank candidates", type="primary"):
         st.error("Please upload at least one resume.")
         st.stop()
 
-    # Prepare temp workspace
-    tmp = Path(".streamlit_tmp")
-    tmp.mkdir(exist_ok=True)
-    res_dir = tmp / "resumes"
-    res_dir.mkdir(exist_ok=True)
-
-    # Reset raw files map each run
-    st.session_state.raw_files = {}
-
-    # Save JD (even in paste mode, write a temp file to reuse pipeline.rank)
-    if jd_mode == "Upload file":
-        jd_path = tmp / jd_file.name
-        jd_path.write_bytes(jd_file.read())
-    else:
-        jd_path = tmp / "jd.txt"
-        jd_path.write_text(jd_text, encoding="utf-8")
-
-    # Save resumes to disk + keep raw bytes for download
-    for f in resumes:
-        raw = f.read()
-        (res_dir / f.name).write_bytes(raw)
-        candidate_name = Path(f.name).stem
-        st.session_state.raw_files[candidate_name] = (f.name, raw)
-
-    # Build config (apply custom skill list if provided)
-    cfg = Config()
-    if skills_input.strip():
-        skills = [s.strip() for s in skills_input.split(",") if s.strip()]
-        if skills:
-            cfg.skills = skills
-    cfg.weights = Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp)
-
-    # Rank
-    df: pd.DataFrame = rank(jd_path, res_dir, top_k=9999, cfg=cfg)
-    # Enforce numeric bounds (similarity can be [-1, 1], clip for UI thresholds)
-    df["skills"] = df["skills"].clip(0.0, 1.0)
-    df["sim"] = df["sim"].clip(0.0, 1.0)
-    df["exp_score"] = df["exp_score"].clip(0.0, 1.0)
-    df["total"] = df["total"].clip(0.0, 1.0)
-
-
-    # Qualification logic
-    if use_component_thresholds:
-        qual_mask = (df["total"] >= min_total) & (df["skills"] >= min_skills) & (df["sim"] >= min_sim)
-    else:
-        qual_mask = (df["total"] >= min_total)
-
-    df["qualified"] = qual_mask
-    qualified_df = df[df["qualified"]].copy()
-    disqualified_df = df[~df["qualified"]].copy()
-
-    # --- Summary KPIs ---------------------------------------------------------
-    c1, c2, c3 = st.columns(3)
-    c1.metric("Total candidates", len(df))
-    c2.metric("Qualified", len(qualified_df))
-    c3.metric("Disqualified", len(disqualified_df))
-
-    st.markdown("---")
-
-    # --- Charts ---------------------------------------------------------------
-    st.subheader("Scores overview")
-
-    # Put charts in a narrower column so they don't span full width
-    plot_col, _ = st.columns([2, 1])
-
-    import matplotlib as mpl
-    mpl.rcParams.update({
-        "figure.dpi": 160,
-        "axes.titlesize": 12,
-        "axes.labelsize": 11,
-        "xtick.labelsize": 8,
-        "ytick.labelsize": 9,
-    })
-
-    top_df = df.sort_values("total", ascending=False).head(top_n_plot)
-
-    with plot_col:
-        # Bar: compact size, don't stretch to container width
-        fig1, ax1 = plt.subplots(figsize=(6.2, 3.0))
-        ax1.bar(top_df["candidate"], top_df["total"])
-        ax1.set_ylabel("Total score")
-        ax1.set_title(f"Top {len(top_df)} candidates")
-        ax1.set_ylim(0, 1)
-        ax1.tick_params(axis="x", rotation=30)
-        st.pyplot(fig1, use_container_width=False)
-
-    with plot_col:
-        # Scatter: compact
-        fig2, ax2 = plt.subplots(figsize=(5.5, 3.2))
-        ax2.scatter(df["sim"], df["skills"])
-        ax2.set_xlabel("Similarity (0–1)")
-        ax2.set_ylabel("Skills match (0–1)")
-        ax2.set_title("Similarity vs Skills")
-        ax2.grid(True, alpha=0.3)
-        st.pyplot(fig2, use_container_width=False)
-
-
-    # --- Qualified table + downloads -----------------------------------------
-    st.markdown('<p class="muted">Experience columns: <b>exp_years</b> (real) · '
-            '<b>exp_target</b> (JD or default) · <b>exp_score</b> (normalized 0–1)</p>',
-            unsafe_allow_html=True)
-
-    st.subheader("Qualified")
-    if len(qualified_df) == 0:
-        st.info("No candidates met the qualification criteria.")
-    else:
-        st.dataframe(
-            qualified_df[["candidate", "skills", "sim", "exp_years", "exp_target", "exp_score", "total"]].reset_index(drop=True),
-      use_container_width=True,
-        )
-        st.download_button(
-            "Download Qualified (CSV)",
-            data=qualified_df.to_csv(index=False),
-            file_name="qualified.csv",
-        )
-
-        with st.expander("Download raw resumes (qualified)"):
-            for _, row in qualified_df.iterrows():
-                cand = str(row["candidate"])
-                if cand in st.session_state.raw_files:
-                    fname, raw = st.session_state.raw_files[cand]
-                    st.download_button(
-                        f"Download {fname}",
-                        data=raw,
-                        file_name=fname,
-                        mime="application/octet-stream",
-                        key=f"qdl_{fname}",
-                    )
+    if not docs:
+        st.error("None of the uploaded resumes could be read.")
+        st.stop()
 
-    st.markdown("---")
+    if st.session_state.get("table_key") != upload_key:
+        # Build config (apply custom skill list if provided)
+        cfg = Config()
+        if skills_input.strip():
+            skills = [s.strip() for s in skills_input.split(",") if s.strip()]
+            if skills:
+                cfg.skills = skills
+        jd_full = load_jd_text(jd_bytes, name=jd_file.name) if jd_file else jd_text
+
+        # Embed and score once per uploaded set, showing each batch as it lands;
+        # sliders only re-weight
+        score_bar = st.progress(0.0, text=f"Scoring 0 / {len(docs)} candidates")
+        live = st.empty()
+        parts = []
+        with trace.tracing(events=False) as tracer:
+            for part in score_texts(jd_full, docs, cfg=cfg):
+                parts.append(part)
+                so_far = ScoreTable.concat(parts)
+                score_bar.progress(len(so_far) / len(docs),
+                                   text=f"Scoring {len(so_far)} / {len(docs)} candidates")
+                live.dataframe(so_far.top_k(10).to_frame(), use_container_width=True)
+        score_bar.empty()
+        live.empty()
+        st.session_state.table = ScoreTable.concat(parts)
+        st.session_state.metrics = tracer.metrics()
+        st.session_state.table_key = upload_key
+
+if st.session_state.get("table_key") != upload_key:
+    st.stop()
 
-    # --- Disqualified table + downloads --------------------------------------
-    st.subheader("Disqualified")
-    if len(disqualified_df) == 0:
-        st.info("Everyone qualified 🎉")
-    else:
-        st.dataframe(
-            disqualified_df[["candidate", "skills", "sim", "exp_years", "exp_target", "exp_score", "total"]].reset_index(drop=True),
-            use_container_width=True,
-        )
-        st.download_button(
-            "Download Disqualified (CSV)",
-            data=disqualified_df.to_csv(index=False),
-            file_name="disqualified.csv",
-        )
-
-        with st.expander("Download raw resumes (disqualified)"):
-            for _, row in disqualified_df.iterrows():
-                cand = str(row["candidate"])
-                if cand in st.session_state.raw_files:
-                    fname, raw = st.session_state.raw_files[cand]
-                    st.download_button(
-                        f"Download {fname}",
-                        data=raw,
-                        file_name=fname,
-                        mime="application/octet-stream",
-                        key=f"ddl_{fname}",
-                    )
+table = st.session_state.table.reweight(Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp))
+table = table[table.order()]
+df: pd.DataFrame = table.to_frame()
+# Enforce numeric bounds (similarity can be [-1, 1], clip for UI thresholds)
+df["skills"] = df["skills"].clip(0.0, 1.0)
+df["sim"] = df["sim"].clip(0.0, 1.0)
+df["exp_score"] = df["exp_score"].clip(0.0, 1.0)
+df["total"] = df["total"].clip(0.0, 1.0)
+
+
+# Qualification logic
+thresholds = {"total": min_total}
+if use_component_thresholds:
+    thresholds.update(skills=min_skills, sim=min_sim)
+qual_mask = table.mask(thresholds)
+
+df["qualified"] = qual_mask
+qualified_df = df[df["qualified"]].copy()
+disqualified_df = df[~df["qualified"]].copy()
+
+# --- Summary KPIs ---------------------------------------------------------
+c1, c2, c3 = st.columns(3)
+c1.metric("Total candidates", len(df))
+c2.metric("Qualified", len(qualified_df))
+c3.metric("Disqualified", len(disqualified_df))
+
+with st.expander("Where the time went (last scoring run)"):
+    spans = st.session_state.get("metrics", {}).get("spans", {})
+    st.dataframe(pd.DataFrame.from_dict(spans, orient="index"), use_container_width=True)
+
+st.markdown("---")
+
+# --- Charts ---------------------------------------------------------------
+st.subheader("Scores overview")
+
+# Put charts in a narrower column so they don't span full width
+plot_col, _ = st.columns([2, 1])
+
+mpl.rcParams.update({
+    "figure.dpi": 160,
+    "axes.titlesize": 12,
+    "axes.labelsize": 11,
+    "xtick.labelsize": 8,
+    "ytick.labelsize": 9,
+})
+
+top_df = df.sort_values("total", ascending=False).head(top_n_plot)
+
+with plot_col:
+    # Bar: compact size, don't stretch to container width
+    fig1, ax1 = plt.subplots(figsize=(6.2, 3.0))
+    ax1.bar(top_df["candidate"], top_df["total"])
+    ax1.set_ylabel("Total score")
+    ax1.set_title(f"Top {len(top_df)} candidates")
+    ax1.set_ylim(0, 1)
+    ax1.tick_params(axis="x", rotation=30)
+    st.pyplot(fig1, use_container_width=False)
+
+with plot_col:
+    # Scatter: compact
+    fig2, ax2 = plt.subplots(figsize=(5.5, 3.2))
+    ax2.scatter(df["sim"], df["skills"])
+    ax2.set_xlabel("Similarity (0–1)")
+    ax2.set_ylabel("Skills match (0–1)")
+    ax2.set_title("Similarity vs Skills")
+    ax2.grid(True, alpha=0.3)
+    st.pyplot(fig2, use_container_width=False)
+
+
+# --- Qualified table + downloads -----------------------------------------
+st.markdown('<p class="muted">Experience columns: <b>exp_years</b> (real) · '
+        '<b>exp_target</b> (JD or default) · <b>exp_score</b> (normalized 0–1)</p>',
+        unsafe_allow_html=True)
+
+st.subheader("Qualified")
+if len(qualified_df) == 0:
+    st.info("No candidates met the qualification criteria.")
+else:
+    st.dataframe(
+        qualified_df[["candidate", "skills", "sim", "exp_years", "exp_target", "exp_score", "total"]].reset_index(drop=True),
+  use_container_width=True,
+    )
+    st.download_button(
+        "Download Qualified (CSV)",
+        data=qualified_df.to_csv(index=False),
+        file_name="qualified.csv",
+    )
+
+    with st.expander("Download raw resumes (qualified)"):
+        for _, row in qualified_df.iterrows():
+            cand = str(row["candidate"])
+            if cand in uploads:
+                fname = uploads[cand].name
+                st.download_button(
+                    f"Download {fname}",
+                    data=uploads[cand].getvalue(),
+                    file_name=fname,
+                    mime="application/octet-stream",
+                    key=f"qdl_{fname}",
+                )
+
+st.markdown("---")
+
+# --- Disqualified table + downloads --------------------------------------
+st.subheader("Disqualified")
+if len(disqualified_df) == 0:
+    st.info("Everyone qualified 🎉")
+else:
+    st.dataframe(
+        disqualified_df[["candidate", "skills", "sim", "exp_years", "exp_target", "exp_score", "total"]].reset_index(drop=True),
+        use_container_width=True,
+    )
+    st.download_button(
+        "Download Disqualified (CSV)",
+        data=disqualified_df.to_csv(index=False),
+        file_name="disqualified.csv",
+    )
+
+    with st.expander("Download raw resumes (disqualified)"):
+        for _, row in disqualified_df.iterrows():
+            cand = str(row["candidate"])
+            if cand in uploads:
+                fname = uploads[cand].name
+                st.download_button(
+                    f"Download {fname}",
+                    data=uploads[cand].getvalue(),
+                    file_name=fname,
+                    mime="application/octet-stream",
+                    key=f"ddl_{fname}",
+                )
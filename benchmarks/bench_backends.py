@@ -0,0 +1,55 @@
+"""Report how far each embedding backend's similarities drift from the torch model.
+
+    python benchmarks/bench_backends.py [--onnx-dir DIR] [--max-drift 0.05]
+
+Needs the all-MiniLM-L6-v2 weights. Scores the sample resumes against the sample JD with
+every backend and prints the largest |sim - torch sim|. The ONNX export (from --onnx-dir
+or RESUME_RANKER_ONNX_DIR) should stay under --max-drift; the exit status is 1 if it does
+not. The sklearn backend is a different model, so its drift is reported but not bounded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from resume_ranker import embed
+
+SAMPLES = Path(__file__).resolve().parents[1] / "samples"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--onnx-dir", type=Path, default=os.environ.get("RESUME_RANKER_ONNX_DIR"))
+    ap.add_argument("--max-drift", type=float, default=0.05)
+    args = ap.parse_args()
+    jd = (SAMPLES / "jd" / "product-analyst.txt").read_text()
+    texts = [p.read_text() for p in sorted((SAMPLES / "resumes").glob("*.txt"))]
+
+    def sims() -> np.ndarray:
+        v = embed.encode([jd, *texts])
+        return v[1:] @ v[0]
+
+    embed.use_backend("torch")
+    ref = sims()
+    backends = [("sklearn", None)]
+    if args.onnx_dir:
+        backends.append(("onnx", Path(args.onnx_dir)))
+    ok = True
+    for name, path in backends:
+        embed.use_backend(name, path)
+        drift = float(np.abs(sims() - ref).max())
+        bounded = name == "onnx"
+        within = drift < args.max_drift
+        ok &= within or not bounded
+        note = ("ok" if within else "OVER") if bounded else "not bounded"
+        print(f"{name:8s} max |sim - torch sim| = {drift:.4f}   ({note})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
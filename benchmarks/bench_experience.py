@@ -0,0 +1,120 @@
+"""Micro-benchmark: single-pass experience extraction vs. the previous multi-scan code path.
+
+    python benchmarks/bench_experience.py [--docs 2000] [--repeat 3]
+
+Checks that both paths agree on every generated resume, then reports docs/sec for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import List, Tuple
+
+from resume_ranker.experience import (
+    EXPLICIT_RE,
+    NAME_RANGE_RE,
+    NUM_RANGE_RE,
+    YEAR_RE,
+    _merge,
+    _norm,
+    _to_index,
+    _to_month,
+    _to_year,
+    estimate_experience_years,
+)
+
+# ── previous implementation (normalizes twice, four scans, datetime.now() per match) ──
+
+
+def _legacy_intervals(text: str) -> List[Tuple[int, int]]:
+    T = _norm(text)
+    intervals: List[Tuple[int, int]] = []
+    for rx in (NAME_RANGE_RE, NUM_RANGE_RE):
+        for m in rx.finditer(T):
+            sm, sy, em, ey = m.group("sm", "sy", "em", "ey")
+            syi = _to_year(sy)
+            smi = _to_month(sm)
+            eyi = _to_year(ey)
+            emi = _to_month(em)
+            if syi and smi and eyi and emi:
+                s = _to_index(syi, smi)
+                e = _to_index(eyi, emi)
+                if e > s:
+                    intervals.append((s, e))
+    return _merge(intervals)
+
+
+def legacy_estimate(text: str) -> float:
+    T = _norm(text)
+    m = EXPLICIT_RE.search(T)
+    if m:
+        return max(0.0, min(float(m.group(1)), 40.0))
+    intervals = _legacy_intervals(T)
+    if intervals:
+        return round(sum(e - s for (s, e) in intervals) / 12.0, 2)
+    years = [int(y) for y in YEAR_RE.findall(T)]
+    years = [y for y in years if 1980 <= y <= datetime.now().year]
+    if len(years) >= 2:
+        return float(max(years) - min(years))
+    return 0.0
+
+
+# ── synthetic resumes ──────────────────────────────────────────────────────────
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FILLER = (
+    "Delivered dashboards in Python and SQL for the finance team, automated ETL jobs, "
+    "mentored two analysts and presented results to stakeholders. "
+)
+
+
+def make_resume(rng: random.Random) -> str:
+    parts = []
+    if rng.random() < 0.2:
+        parts.append(f"{rng.randint(1, 12)}+ years of experience in analytics.")
+    for _ in range(rng.randint(1, 5)):
+        sy = rng.randint(2005, 2023)
+        ey = rng.randint(sy, 2025)
+        if rng.random() < 0.5:
+            end = "Present" if rng.random() < 0.2 else f"{rng.choice(MONTHS)} {ey}"
+            parts.append(f"Analyst, Acme {rng.choice(MONTHS)} {sy} – {end}")
+        else:
+            parts.append(f"Engineer {rng.randint(1, 12):02d}/{sy} - {rng.randint(1, 12):02d}/{ey}")
+        parts.append(FILLER * rng.randint(1, 6))
+    parts.append(f"B.Sc. {rng.randint(1995, 2015)}")
+    return "\n".join(parts)
+
+
+def _time(fn, docs: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for d in docs:
+            fn(d)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    docs = [make_resume(rng) for _ in range(args.docs)]
+    mismatches = sum(legacy_estimate(d) != estimate_experience_years(d) for d in docs)
+    if mismatches:
+        raise SystemExit(f"{mismatches} documents disagree between the two code paths")
+
+    old = _time(legacy_estimate, docs, args.repeat)
+    new = _time(estimate_experience_years, docs, args.repeat)
+    print(f"legacy      : {args.docs / old:9.0f} docs/s")
+    print(f"single-pass : {args.docs / new:9.0f} docs/s  ({old / new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
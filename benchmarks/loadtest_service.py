@@ -0,0 +1,64 @@
+"""Load test for a running `resume-ranker serve`: p50/p99 latency and requests/sec.
+
+    python benchmarks/loadtest_service.py [--url http://127.0.0.1:8000] [--concurrency 16]
+        [--requests 400] [--jd samples/jd/product-analyst.txt] [--resumes samples/resumes]
+
+Every request posts the JD and all resumes in the folder to /rank.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--jd", type=Path, default=Path("samples/jd/product-analyst.txt"))
+    ap.add_argument("--resumes", type=Path, default=Path("samples/resumes"))
+    args = ap.parse_args()
+
+    jd = (args.jd.name, args.jd.read_bytes())
+    resumes = [(p.name, p.read_bytes()) for p in sorted(args.resumes.iterdir()) if p.is_file()]
+    files = [("jd", jd)] + [("resumes", r) for r in resumes]
+    latencies = []
+    errors = 0
+    todo = iter(range(args.requests))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for _ in todo:
+            t0 = time.perf_counter()
+            r = await client.post(f"{args.url}/rank", files=files)
+            latencies.append(time.perf_counter() - t0)
+            errors += r.status_code != 200
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        await client.post(f"{args.url}/rank", files=files)  # warm-up
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        wall = time.perf_counter() - t0
+        batches = (await client.get(f"{args.url}/healthz")).json()
+
+    ms = np.array(latencies) * 1000
+    print(
+        f"{len(ms)} requests, {errors} errors, concurrency {args.concurrency}, "
+        f"{len(resumes)} resumes each"
+    )
+    print(
+        f"p50 {np.percentile(ms, 50):.1f} ms   p99 {np.percentile(ms, 99):.1f} ms   "
+        f"{len(ms) / wall:.1f} req/s"
+    )
+    print(f"model batches: {batches['batches']} for {batches['requests']} encode calls")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""Embedding backends behind `embed.get_model`.
+
+Every backend exposes the subset of the SentenceTransformer interface that `embed` uses:
+`encode(texts, batch_size=..., normalize_embeddings=...)`, `get_sentence_embedding_dimension()`
+and, when it tokenizes, `tokenizer` / `max_seq_length` for length bucketing.
+
+- ``torch``: sentence-transformers on PyTorch (the reference).
+- ``onnx``: an ONNX Runtime export of the same model, typically int8-quantized; loaded
+  from a local folder holding ``model_quantized.onnx`` (or ``model.onnx``) and the
+  tokenizer files.
+- ``sklearn``: hashed TF-IDF-style features with a fixed random projection; needs no
+  download and no fitting, so vectors are stable across runs and cacheable per text.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "sklearn")
+
+ONNX_FILES = ("model_quantized.onnx", "model_int8.onnx", "model.onnx")
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def onnx_model_file(model_dir: Path) -> Path:
+    """The exported model in `model_dir`, by the preference order of ONNX_FILES."""
+    path = next((model_dir / f for f in ONNX_FILES if (model_dir / f).exists()), None)
+    if path is None:
+        raise FileNotFoundError(f"no {' / '.join(ONNX_FILES)} in {model_dir}")
+    return path
+
+
+class OnnxEncoder:
+    """Mean-pooled sentence embeddings from an exported transformer run on ONNX Runtime."""
+
+    def __init__(self, model_dir: Path, threads: Optional[int] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_dir = Path(model_dir)
+        self.path = path = onnx_model_file(self.model_dir)
+        opts = ort.SessionOptions()
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(path), opts, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        st_cfg = self.model_dir / "sentence_bert_config.json"
+        self.max_seq_length = (
+            json.loads(st_cfg.read_text())["max_seq_length"] if st_cfg.exists() else 256
+        )
+        self._inputs = [i.name for i in self.session.get_inputs()]
+        self._dim = int(self.session.get_outputs()[0].shape[-1])
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def encode(
+        self, texts: Sequence[str], batch_size: int = 32, normalize_embeddings: bool = False, **_
+    ) -> np.ndarray:
+        out: List[np.ndarray] = []
+        for b in range(0, len(texts), batch_size):
+            enc = self.tokenizer(
+                list(texts[b : b + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            mask = enc["attention_mask"].astype(np.int64)
+            feed = {}
+            for name in self._inputs:
+                feed[name] = enc[name].astype(np.int64) if name in enc else np.zeros_like(mask)
+            hidden = self.session.run(None, feed)[0]
+            pooled = (hidden * mask[..., None]).sum(1) / np.maximum(mask.sum(1, keepdims=True), 1)
+            out.append(pooled.astype(np.float32))
+        emb = np.concatenate(out) if out else np.zeros((0, self._dim), dtype=np.float32)
+        return _normalize(emb) if normalize_embeddings else emb
+
+
+class HashingEncoder:
+    """Stateless lexical embeddings: hashed word 1-2-grams, log tf, fixed random projection.
+
+    LSA would need an SVD fitted to a corpus, which makes a resume's vector depend on the
+    rest of the folder; a seeded sparse projection keeps every text's vector independent.
+    """
+
+    NAME = "sklearn-hashing-384"
+
+    def __init__(self, dim: int = 384, n_features: int = 2**18, seed: int = 0):
+        import scipy.sparse as sp
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.random_projection import SparseRandomProjection
+
+        self._vec = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None,
+        )
+        self._proj = SparseRandomProjection(n_components=dim, dense_output=True, random_state=seed)
+        self._proj.fit(sp.csr_matrix((1, n_features)))  # only the shape is used
+        self._dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def encode(
+        self, texts: Sequence[str], batch_size: int = 32, normalize_embeddings: bool = False, **_
+    ) -> np.ndarray:
+        if not len(texts):
+            return np.zeros((0, self._dim), dtype=np.float32)
+        x = self._vec.transform(list(texts))
+        x.data = np.log1p(x.data)
+        emb = np.asarray(self._proj.transform(x), dtype=np.float32)
+        return _normalize(emb) if normalize_embeddings else emb
+
+
+def load(
+    name: str, model_name: str, onnx_dir: Optional[Path] = None, threads: Optional[int] = None
+):
+    if name == "torch":
+        # deferred: sentence_transformers pulls in torch, which costs seconds at import
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+    if name == "onnx":
+        if onnx_dir is None:
+            raise ValueError("the onnx backend needs onnx_model_dir (--onnx-dir)")
+        return OnnxEncoder(onnx_dir, threads=threads)
+    if name == "sklearn":
+        return HashingEncoder()
+    raise ValueError(f"unknown embedding backend {name!r}; choose from {', '.join(BACKENDS)}")
@@ -0,0 +1,129 @@
+"""Per-stage timings over a synthetic corpus, and regression checks against a baseline.
+
+Stages are timed separately on the same extracted texts: `extract` (load_resumes),
+`skills` (score_skills), `experience` (estimate_experience_years), `embed` (encode)
+and `rank` (pipeline.rank end to end, caches off). Results compare on milliseconds per
+document, so a baseline recorded at one scale still gates runs at another.
+"""
+
+import json
+import platform
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .config import Config
+from .synth import FORMATS, generate_corpus
+
+FORMAT_VERSION = 1
+STAGES = ("extract", "skills", "experience", "embed", "rank")
+
+
+def _timed(fn: Callable[[], Any]) -> tuple:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def run_bench(
+    workdir: Path,
+    n: int,
+    cfg: Optional[Config] = None,
+    seed: int = 0,
+    formats: Sequence[str] = FORMATS,
+    stages: Sequence[str] = STAGES,
+) -> Dict[str, Any]:
+    """Generate (or reuse) an n-resume corpus under `workdir` and time each stage once."""
+    from .embed import configure, encode, model_id
+    from .experience import estimate_experience_years
+    from .io import load_resumes
+    from .pipeline import rank
+    from .skills import score_skills
+
+    cfg = (cfg or Config()).model_copy(update={"cache_dir": None})
+    resumes_dir, gen_s = _timed(lambda: generate_corpus(workdir, n, seed=seed, formats=formats))
+    jd = workdir / "jd.txt"
+    configure(cfg)
+    resumes, t_extract = _timed(lambda: load_resumes(resumes_dir, workers=cfg.extract_workers))
+    texts = [t for _, t in resumes]
+    timings: Dict[str, float] = {"extract": t_extract}
+    if "skills" in stages:
+        _, timings["skills"] = _timed(lambda: [score_skills(t, cfg.skills) for t in texts])
+    if "experience" in stages:
+        _, timings["experience"] = _timed(lambda: [estimate_experience_years(t) for t in texts])
+    if "embed" in stages:
+        encode(texts[:2], cfg.embed_batch_size)  # model load and warm-up stay out of the timing
+        _, timings["embed"] = _timed(lambda: encode(texts, cfg.embed_batch_size))
+    if "rank" in stages:
+        _, timings["rank"] = _timed(lambda: rank(jd, resumes_dir, top_k=10, cfg=cfg))
+    return {
+        "version": FORMAT_VERSION,
+        "docs": len(texts),
+        "seed": seed,
+        "formats": list(formats),
+        "model": model_id(),
+        "workers": cfg.extract_workers,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "generate_seconds": round(gen_s, 3),
+        "stages": {
+            name: {
+                "seconds": round(secs, 4),
+                "ms_per_doc": round(1000 * secs / max(len(texts), 1), 4),
+                "docs_per_sec": round(len(texts) / secs, 1) if secs > 0 else None,
+            }
+            for name, secs in timings.items()
+            if name in stages
+        },
+    }
+
+
+COMPARABLE = ("model", "machine")  # fields a baseline must share with the run it gates
+
+
+def regressions(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+) -> List[str]:
+    """Stages whose ms/doc grew by more than `tolerance` over the baseline.
+
+    Stages that took under `min_seconds` in both runs are skipped: at that size timer
+    noise is larger than any regression worth failing on. Raises ValueError when the two
+    runs used a different model or machine, since their timings do not compare.
+    """
+    differ = [
+        f"{key} {result[key]!r} vs baseline {baseline[key]!r}"
+        for key in COMPARABLE
+        if key in result and key in baseline and result[key] != baseline[key]
+    ]
+    if differ:
+        raise ValueError(f"not comparable with the baseline: {'; '.join(differ)}")
+    found = []
+    for name, cur in result["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None or max(cur["seconds"], base["seconds"]) < min_seconds:
+            continue
+        limit = base["ms_per_doc"] * (1 + tolerance)
+        if cur["ms_per_doc"] > limit:
+            found.append(
+                f"{name}: {cur['ms_per_doc']:.3f} ms/doc vs baseline {base['ms_per_doc']:.3f} "
+                f"(+{100 * (cur['ms_per_doc'] / base['ms_per_doc'] - 1):.0f}%, "
+                f"allowed +{100 * tolerance:.0f}%)"
+            )
+    return found
+
+
+def summary(result: Dict[str, Any]) -> str:
+    lines = [f"{result['docs']} docs, model {result['model']}"]
+    for name, s in result["stages"].items():
+        lines.append(f"  {name:<10} {s['seconds']:9.3f}s  {s['ms_per_doc']:9.3f} ms/doc")
+    return "\n".join(lines)
+
+
+def load(path: Path) -> Dict[str, Any]:
+    data = json.loads(Path(path).read_text())
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark format {data.get('version')!r}")
+    return data
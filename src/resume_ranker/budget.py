@@ -0,0 +1,199 @@
+"""Per-file extraction budgets enforced in killable worker processes.
+
+A `ProcessPoolExecutor` cannot stop one stuck task, so `BudgetedPool` runs its own
+workers, each fed over a pipe: a file that overruns its wall-clock timeout gets its
+worker killed and replaced, and a worker started with a memory ceiling (RLIMIT_AS,
+POSIX only) fails the allocation instead of swapping the machine.
+"""
+
+import multiprocessing
+import os
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .config import Config
+
+
+@dataclass(frozen=True)
+class ExtractLimits:
+    max_pages: Optional[int] = None  # PDF pages read per file
+    max_chars: Optional[int] = None  # stop reading once this much text is in hand
+    timeout: Optional[float] = None  # wall-clock seconds per file
+    max_memory_mb: Optional[float] = None  # address-space growth allowed per worker
+
+    @classmethod
+    def from_config(cls, cfg: "Config") -> "ExtractLimits":
+        return cls(
+            max_pages=cfg.extract_max_pages,
+            max_chars=cfg.extract_max_chars,
+            timeout=cfg.extract_timeout,
+            max_memory_mb=cfg.extract_max_mb,
+        )
+
+    @property
+    def truncates(self) -> bool:
+        """Output may be a prefix of the document (so it must not be cached as the full text)."""
+        return bool(self.max_pages or self.max_chars)
+
+    @property
+    def isolated(self) -> bool:
+        """Needs killable workers rather than in-process or pooled extraction."""
+        return bool(self.timeout or self.max_memory_mb)
+
+
+@dataclass
+class ExtractError:
+    path: str
+    kind: str  # "timeout", "memory", "crash", "error" or "unsupported" (file type)
+    message: str
+    seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _address_space() -> int:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _limit_memory(max_mb: float) -> None:
+    try:
+        import resource
+
+        base = _address_space()
+    except (ImportError, OSError):
+        return  # no RLIMIT_AS / procfs here; the timeout still applies
+    cap = base + int(max_mb * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+
+
+def _worker(conn, max_mb: Optional[float], max_pages: Optional[int], max_chars: Optional[int]):
+    from .io import extract_file
+
+    if max_mb:
+        _limit_memory(max_mb)
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+        if path is None:
+            return
+        t0 = time.perf_counter()
+        try:
+            text = extract_file(Path(path), max_pages=max_pages, max_chars=max_chars)
+            conn.send(("ok", text, time.perf_counter() - t0))
+        except MemoryError:
+            conn.send(("memory", f"exceeded {max_mb:g} MB", time.perf_counter() - t0))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", time.perf_counter() - t0))
+
+
+class _Slot:
+    def __init__(self, ctx, limits: ExtractLimits):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_worker,
+            args=(child, limits.max_memory_mb, limits.max_pages, limits.max_chars),
+            daemon=True,
+        )
+        self.proc.start()
+        child.close()
+        self.task: Optional[Tuple[Path, Any, float]] = None  # (path, tag, started)
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+
+class BudgetedPool:
+    """`workers` extraction processes that enforce `limits` on every file."""
+
+    def __init__(self, workers: int, limits: ExtractLimits):
+        self.limits = limits
+        # spawn: the parent may already hold torch/OpenMP threads, which do not survive fork
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = [_Slot(self._ctx, limits) for _ in range(max(workers, 1))]
+
+    def __enter__(self) -> "BudgetedPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for s in self._slots:
+            try:
+                s.conn.send(None)
+            except OSError:
+                pass
+        for s in self._slots:
+            s.proc.join(timeout=1)
+            if s.proc.is_alive():
+                s.proc.kill()
+            s.conn.close()
+
+    def _replace(self, i: int) -> None:
+        self._slots[i].kill()
+        self._slots[i] = _Slot(self._ctx, self.limits)
+
+    def run(
+        self, items: Iterable[Tuple[Path, Any]]
+    ) -> Iterator[Tuple[Path, Any, Optional[str], Optional[ExtractError], float]]:
+        """Yield (path, tag, text, error, seconds) per item, in completion order."""
+        queue = iter(items)
+        timeout = self.limits.timeout
+        pending = True
+        while True:
+            for s in self._slots:
+                if s.task is None and pending:
+                    nxt = next(queue, None)
+                    if nxt is None:
+                        pending = False
+                        break
+                    s.conn.send(str(nxt[0]))
+                    s.task = (nxt[0], nxt[1], time.monotonic())
+            busy = [i for i, s in enumerate(self._slots) if s.task is not None]
+            if not busy:
+                return
+            wait_for: Optional[float] = None
+            if timeout:
+                now = time.monotonic()
+                wait_for = max(min(self._slots[i].task[2] for i in busy) + timeout - now, 0)
+            handles: List[Any] = []
+            for i in busy:
+                handles += [self._slots[i].conn, self._slots[i].proc.sentinel]
+            ready = set(wait(handles, timeout=wait_for))
+            for i in busy:
+                s = self._slots[i]
+                path, tag, started = s.task
+                elapsed = time.monotonic() - started
+                if s.conn in ready or (s.proc.sentinel in ready and s.conn.poll()):
+                    try:
+                        kind, payload, secs = s.conn.recv()
+                    except (EOFError, OSError):
+                        kind, payload, secs = "crash", "worker exited", elapsed
+                    s.task = None
+                    if kind == "ok":
+                        yield path, tag, payload, None, secs
+                    else:
+                        yield path, tag, None, ExtractError(str(path), kind, payload, secs), secs
+                    if kind == "crash":
+                        self._replace(i)
+                elif s.proc.sentinel in ready:
+                    s.task = None
+                    code = s.proc.exitcode
+                    self._replace(i)
+                    err = ExtractError(str(path), "crash", f"worker exited with {code}", elapsed)
+                    yield path, tag, None, err, elapsed
+                elif timeout and elapsed >= timeout:
+                    s.task = None
+                    self._replace(i)
+                    err = ExtractError(str(path), "timeout", f"exceeded {timeout:g}s", elapsed)
+                    yield path, tag, None, err, elapsed
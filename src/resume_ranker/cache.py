@@ -0,0 +1,324 @@
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get("RESUME_RANKER_CACHE")
+    return Path(env) if env else Path.home() / ".cache" / "resume-ranker"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class EmbeddingStore:
+    """Content-addressed embedding cache: SQLite index over a memory-mapped float32 matrix.
+
+    Rows are keyed by the SHA-256 of the text. The store belongs to one model; opening it
+    with a different model name wipes it. Least-recently-used rows are evicted once the
+    matrix grows past `max_mb`; their matrix rows go on a free list for the next writes.
+    Several processes may share a store: each write allocates its rows and inserts them
+    in one `BEGIN IMMEDIATE` transaction.
+    """
+
+    def __init__(self, root: Path, model: Optional[str] = None, max_mb: float = 512.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_mb = max_mb
+        self._db = sqlite3.connect(str(self.root / "embeddings.sqlite"), timeout=30.0)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS vectors (
+                hash TEXT PRIMARY KEY, row INTEGER NOT NULL, last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS vectors_lru ON vectors(last_used);
+            CREATE TABLE IF NOT EXISTS free_rows (row INTEGER PRIMARY KEY);
+            """
+        )
+        self._mat: Optional[np.memmap] = None
+        if model is not None and self._meta("model") not in (None, model):
+            self.clear()
+        if model is not None:
+            self._set_meta("model", model)
+            self._db.commit()
+
+    # ── metadata ──────────────────────────────────────────────────────────────
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: object) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._meta("model")
+
+    @property
+    def dim(self) -> Optional[int]:
+        v = self._meta("dim")
+        return int(v) if v else None
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0])
+
+    # ── matrix file ───────────────────────────────────────────────────────────
+
+    @property
+    def _path(self) -> Path:
+        return self.root / "embeddings.f32"
+
+    def _capacity(self) -> int:
+        return int(self._meta("capacity") or 0)
+
+    def _matrix(self) -> Optional[np.memmap]:
+        dim, cap = self.dim, self._capacity()
+        if not dim or not cap or not self._path.exists():
+            return None
+        if self._mat is None or self._mat.shape != (cap, dim):
+            self._mat = np.memmap(self._path, dtype=np.float32, mode="r+", shape=(cap, dim))
+        return self._mat
+
+    def _grow(self, need: int, dim: int) -> None:
+        cap = self._capacity()
+        if need <= cap:
+            return
+        limit_rows = int(self.max_mb * 1e6 // (dim * 4))
+        new_cap = max(need, min(max(cap * 2, 256), limit_rows))
+        self._mat = None
+        with open(self._path, "ab") as f:
+            f.truncate(new_cap * dim * 4)
+        self._set_meta("capacity", new_cap)
+
+    def _next_row(self) -> int:
+        """First matrix row never handed out; rows below it are in use or on the free list."""
+        v = self._meta("next_row")
+        if v is not None:
+            return int(v)
+        # a store written before the free list existed: find its gaps once
+        used = {r for (r,) in self._db.execute("SELECT row FROM vectors")}
+        top = max(used) + 1 if used else 0
+        self._db.executemany(
+            "INSERT OR IGNORE INTO free_rows VALUES (?)",
+            [(r,) for r in range(top) if r not in used],
+        )
+        self._set_meta("next_row", top)
+        return top
+
+    def _alloc(self, n: int, dim: int) -> List[int]:
+        """Take `n` rows, freed ones first; call inside the write transaction."""
+        top = self._next_row()
+        rows = [r for (r,) in self._db.execute("SELECT row FROM free_rows LIMIT ?", (n,))]
+        self._db.executemany("DELETE FROM free_rows WHERE row = ?", [(r,) for r in rows])
+        if len(rows) < n:
+            rows += range(top, top + n - len(rows))
+            top = rows[-1] + 1
+            self._set_meta("next_row", top)
+            self._grow(top, dim)
+        return rows
+
+    def _present(self, hashes: Sequence[str]) -> List[str]:
+        found: List[str] = []
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i : i + 500]
+            q = f"SELECT hash FROM vectors WHERE hash IN ({','.join('?' * len(chunk))})"
+            found += [h for (h,) in self._db.execute(q, chunk)]
+        return found
+
+    # ── public API ────────────────────────────────────────────────────────────
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        mat = self._matrix()
+        if mat is None or not hashes:
+            return {}
+        found: Dict[str, np.ndarray] = {}
+        uniq = list(dict.fromkeys(hashes))
+        for i in range(0, len(uniq), 500):
+            chunk = uniq[i : i + 500]
+            q = f"SELECT hash, row FROM vectors WHERE hash IN ({','.join('?' * len(chunk))})"
+            for h, r in self._db.execute(q, chunk):
+                found[h] = np.array(mat[r])
+        if found:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE vectors SET last_used = ? WHERE hash = ?", [(now, h) for h in found]
+            )
+            self._db.commit()
+        return found
+
+    def put_many(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._db.commit()
+        self._db.execute("BEGIN IMMEDIATE")  # other writers wait until this one commits
+        try:
+            dim = self.dim
+            if dim is None:
+                dim = int(vectors.shape[1])
+                self._set_meta("dim", dim)
+            elif dim != vectors.shape[1]:
+                raise ValueError(f"embedding dim {vectors.shape[1]} does not match store dim {dim}")
+            now = time.time()
+            existing = set(self._present(list(dict.fromkeys(hashes))))
+            self._db.executemany(
+                "UPDATE vectors SET last_used = ? WHERE hash = ?", [(now, h) for h in existing]
+            )
+            new = {h: v for h, v in zip(hashes, vectors) if h not in existing}
+            if new:
+                rows = self._alloc(len(new), dim)
+                mat = self._matrix()
+                assert mat is not None
+                for row, v in zip(rows, new.values()):
+                    mat[row] = v
+                mat.flush()  # before the rows become visible to readers
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO vectors VALUES (?, ?, ?)",
+                    [(h, row, now) for row, h in zip(rows, new)],
+                )
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        if new:
+            self.prune()
+
+    def size_mb(self) -> float:
+        return len(self) * (self.dim or 0) * 4 / 1e6
+
+    def prune(self, max_mb: Optional[float] = None) -> int:
+        """Evict least-recently-used rows until the live data fits in `max_mb`."""
+        limit = self.max_mb if max_mb is None else max_mb
+        dim = self.dim
+        if not dim:
+            return 0
+        keep = int(limit * 1e6 // (dim * 4))
+        self._db.commit()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            excess = len(self) - keep
+            if excess > 0:
+                victims = self._db.execute(
+                    "SELECT hash, row FROM vectors ORDER BY last_used ASC LIMIT ?", (excess,)
+                ).fetchall()
+                self._db.executemany(
+                    "DELETE FROM vectors WHERE hash = ?", [(h,) for h, _ in victims]
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO free_rows VALUES (?)", [(r,) for _, r in victims]
+                )
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        return max(excess, 0)
+
+    def clear(self) -> None:
+        self._mat = None
+        self._db.execute("DELETE FROM vectors")
+        self._db.execute("DELETE FROM free_rows")
+        self._db.execute("DELETE FROM meta")
+        self._db.commit()
+        if self._path.exists():
+            self._path.unlink()
+
+    def info(self) -> Dict[str, object]:
+        return {
+            "path": str(self.root),
+            "model": self.model,
+            "dim": self.dim,
+            "entries": len(self),
+            "size_mb": round(self.size_mb(), 2),
+            "file_mb": round(self._path.stat().st_size / 1e6, 2) if self._path.exists() else 0.0,
+            "max_mb": self.max_mb,
+        }
+
+    def close(self) -> None:
+        self._mat = None
+        self._db.close()
+
+
+class TextCache:
+    """Persistent cache of extracted resume text.
+
+    Lookups first try path + size + mtime (no read at all), then the SHA-256 of the file
+    bytes, so renamed or touched-but-unchanged files are still hits.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.root / "extract.sqlite"))
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS texts (hash TEXT PRIMARY KEY, text TEXT NOT NULL);
+            """
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _text(self, h: str) -> Optional[str]:
+        row = self._db.execute("SELECT text FROM texts WHERE hash = ?", (h,)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cached_text, content_hash); text is None on a miss."""
+        st = path.stat()
+        key = str(path.resolve())
+        row = self._db.execute(
+            "SELECT size, mtime_ns, hash FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            text = self._text(row[2])
+            if text is not None:
+                self.hits += 1
+                return text, row[2]
+        h = self.file_hash(path.read_bytes())
+        text = self._text(h)
+        if text is not None:
+            self._remember(key, st, h)
+            self._db.commit()
+            self.hits += 1
+            return text, h
+        self.misses += 1
+        return None, h
+
+    def _remember(self, key: str, st: os.stat_result, h: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (key, st.st_size, st.st_mtime_ns, h)
+        )
+
+    def store(self, path: Path, h: str, text: str) -> None:
+        self._db.execute("INSERT OR REPLACE INTO texts VALUES (?, ?)", (h, text))
+        self._remember(str(path.resolve()), path.stat(), h)
+        self._db.commit()
+
+    def info(self) -> Dict[str, object]:
+        n_files = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        n_texts, chars = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(text)), 0) FROM texts"
+        ).fetchone()
+        return {"path": str(self.root), "files": n_files, "texts": n_texts, "chars": chars}
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM files")
+        self._db.execute("DELETE FROM texts")
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
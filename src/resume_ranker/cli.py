@@ -1,27 +1,755 @@
 
 import typer
+from contextlib import ExitStack
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
-from typing import Optional
-from .pipeline import rank
+from typing import Any, List, Optional, Tuple
+
+# Heavy modules (pipeline -> pandas, embed -> torch) are imported inside each command so
+# `--help` and argument errors return without loading them; tests/test_cli.py checks this.
 
 app = typer.Typer(add_completion=False)
+cache_app = typer.Typer(add_completion=False, help="Inspect or prune the on-disk caches.")
+app.add_typer(cache_app, name="cache")
+index_app = typer.Typer(add_completion=False, help="Build and query a persistent candidate index.")
+app.add_typer(index_app, name="index")
+
+class Backend(str, Enum):
+    """Mirrors backends.BACKENDS without importing it (numpy) at CLI load."""
+    torch = "torch"
+    onnx = "onnx"
+    sklearn = "sklearn"
 
 @app.command(name="rank")
 def rank_cmd(
     jd: Path = typer.Option(..., exists=True, help="Path to job description (txt/pdf/docx)"),
     resumes: Path = typer.Option(..., exists=True, file_okay=False, help="Folder of resumes"),
-    out: Optional[Path] = typer.Option(None, help="Where to write ranked CSV"),
+    out: Optional[Path] = typer.Option(
+        None, help="Where to write the ranking (.csv, .jsonl, .parquet or .arrow)"
+    ),
     top_k: int = typer.Option(10, min=1, help="Top K candidates to return"),
     w_skills: float = 0.5,
     w_sim: float = 0.4,
     w_exp: float = 0.1,
+    batch_size: int = typer.Option(64, min=1, help="Resumes per embedding batch"),
+    threads: Optional[int] = typer.Option(None, min=1, help="CPU threads for the embedding model"),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+    workers: int = typer.Option(1, min=0, help="Processes for PDF/DOCX extraction (0 = all CPUs)"),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write the on-disk cache"
+    ),
+    streaming: bool = typer.Option(
+        False, "--streaming", help="Bounded-memory mode: keep only the top K while scoring"
+    ),
+    manifest: Optional[Path] = typer.Option(
+        None, help="Incremental mode: reuse scores recorded here for unchanged files"
+    ),
+    watch: bool = typer.Option(
+        False, "--watch", help="Keep polling the folder (needs --manifest and --out)"
+    ),
+    interval: float = typer.Option(10.0, min=0.5, help="Seconds between polls with --watch"),
+    cascade: Optional[str] = typer.Option(
+        None, help="Embed only a lexical shortlist: a share ('10%') or a count ('500')"
+    ),
+    check_recall: bool = typer.Option(
+        False, "--check-recall", help="With --cascade, also run the full path and report recall@k"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, min=0.1, help="Seconds per file before its extraction worker is killed"
+    ),
+    max_mb: Optional[float] = typer.Option(
+        None, min=16, help="Memory ceiling per extraction worker"
+    ),
+    max_pages: Optional[int] = typer.Option(None, min=1, help="PDF pages read per file"),
+    max_chars: Optional[int] = typer.Option(
+        None, min=1, help="Stop reading a file once this many characters are extracted"
+    ),
+    extract_report: Optional[Path] = typer.Option(
+        None, help="Write per-file extraction errors and timings here (JSON)"
+    ),
+    dedup: bool = typer.Option(
+        False, "--dedup", help="Score near-duplicate resumes once, listing the copies as aliases"
+    ),
+    dedup_threshold: float = typer.Option(
+        0.85, min=0.1, max=1.0, help="Shingle overlap (Jaccard) at which two resumes are duplicates"
+    ),
+    shard: Optional[str] = typer.Option(
+        None, help="Score only shard 'i/n' (0-based) and write its partial top K (.npz) to --out"
+    ),
+    staged: bool = typer.Option(
+        False,
+        "--staged",
+        help="Overlap extraction, rule scoring and embedding; report per-stage stats",
+    ),
+    queue_size: int = typer.Option(256, min=1, help="Items buffered between stages with --staged"),
+    profile: Optional[Path] = typer.Option(
+        None, help="Write a Chrome-trace timeline (JSON) here and print the slowest files"
+    ),
+    profile_top: int = typer.Option(10, min=1, help="Files listed in the --profile report"),
+    all_rows: bool = typer.Option(
+        False, "--all", help="Stream every scored candidate to --out as it is scored (unsorted)"
+    ),
+    with_embeddings: bool = typer.Option(
+        False, "--with-embeddings", help="Add each resume's embedding vector to --out"
+    ),
+    with_skill_hits: bool = typer.Option(
+        False, "--with-skill-hits", help="Add a bitset of the matched skills to --out"
+    ),
+    evidence: Optional[Path] = typer.Option(
+        None, help="Record skill hits, date ranges and closest sentences here (JSONL) for `explain`"
+    ),
 ):
     """Rank resumes against a job description."""
+    from .cache import default_cache_dir
+    from .config import Config, Weights
+    from .io import LoadStats
+
+    if watch and not (manifest and out):
+        raise typer.BadParameter("--watch needs both --manifest and --out")
+    if profile and watch:
+        raise typer.BadParameter("--profile cannot be combined with --watch")
+    keep = _parse_keep(cascade) if cascade else None
+    part = _parse_shard(shard) if shard else None
+    if cascade and (streaming or staged):
+        raise typer.BadParameter("--cascade cannot be combined with --streaming or --staged")
+    if streaming and staged:
+        raise typer.BadParameter("--streaming cannot be combined with --staged")
+    if check_recall and not cascade:
+        raise typer.BadParameter("--check-recall needs --cascade")
+    if manifest and (cascade or streaming or staged):
+        raise typer.BadParameter("--manifest cannot be combined with --cascade, --streaming "
+                                 "or --staged")
+    if part and (manifest or cascade or streaming or dedup):
+        raise typer.BadParameter("--shard cannot be combined with --manifest, --cascade, "
+                                 "--streaming or --dedup")
+    rows = None
+    if all_rows or with_embeddings or with_skill_hits or (
+        out and out.suffix.lower() in (".jsonl", ".parquet", ".arrow", ".feather")
+    ):
+        if not out:
+            raise typer.BadParameter("--all, --with-embeddings and --with-skill-hits need --out")
+        if manifest or cascade or part or staged or dedup:
+            raise typer.BadParameter("JSONL/Parquet/Arrow output, --all, --with-embeddings and "
+                                     "--with-skill-hits cannot be combined with --manifest, "
+                                     "--cascade, --shard, --staged or --dedup")
+        if with_embeddings and out.suffix.lower() == ".csv":
+            raise typer.BadParameter("CSV cannot hold embeddings; use .jsonl, .parquet or .arrow")
+        rows = (all_rows, with_embeddings, with_skill_hits)
+    if evidence and (manifest or cascade or part or staged or streaming or rows):
+        raise typer.BadParameter("--evidence needs the default in-memory ranking (no --manifest, "
+                                 "--cascade, --shard, --staged, --streaming or streamed --out)")
+
+    cfg = Config()
+    cfg.weights = Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp)
+    cfg.embed_batch_size = batch_size
+    cfg.embed_threads = threads
+    cfg.embed_backend = backend.value
+    cfg.onnx_model_dir = onnx_dir
+    cfg.extract_workers = workers
+    cfg.extract_timeout = timeout
+    cfg.extract_max_mb = max_mb
+    cfg.extract_max_pages = max_pages
+    cfg.extract_max_chars = max_chars
+    cfg.dedup = dedup
+    cfg.dedup_threshold = dedup_threshold
+    cfg.staged = staged
+    cfg.stage_queue_size = queue_size
+    cfg.cache_dir = None if no_cache else (cache_dir or default_cache_dir())
+    stats = LoadStats()
+    with ExitStack() as stack:
+        if profile:
+            from . import trace
+
+            tracer = stack.enter_context(trace.tracing())
+            stack.callback(_report_profile, tracer, profile, profile_top)
+        if evidence:
+            from .evidence import EvidenceWriter
+
+            evidence = stack.enter_context(EvidenceWriter(evidence))
+        _rank_run(_RankRun(
+            jd, resumes, out, top_k, cfg, stats, streaming=streaming, manifest=manifest,
+            watch=watch, interval=interval, keep=keep, check_recall=check_recall, part=part,
+            extract_report=extract_report, rows=rows, evidence=evidence,
+        ))
+
+@dataclass
+class _RankRun:
+    """The `rank` options once validated; exactly one mode applies (see `_rank_run`)."""
+    jd: Path
+    resumes: Path
+    out: Optional[Path]
+    top_k: int
+    cfg: Any  # Config, not imported at CLI load
+    stats: Any  # LoadStats
+    streaming: bool = False
+    manifest: Optional[Path] = None
+    watch: bool = False
+    interval: float = 10.0
+    keep: Optional[float] = None  # --cascade
+    check_recall: bool = False
+    part: Optional[Tuple[int, int]] = None  # --shard
+    extract_report: Optional[Path] = None
+    rows: Optional[Tuple[bool, bool, bool]] = None  # (--all, --with-embeddings, --with-skill-hits)
+    evidence: Any = None  # EvidenceWriter
+
+def _rank_run(run: _RankRun) -> None:
+    from .embed import EncodeStats
+    from .pipeline import rank
+
+    jd, resumes, out, top_k, cfg, stats = (
+        run.jd, run.resumes, run.out, run.top_k, run.cfg, run.stats
+    )
+    extract_report, evidence = run.extract_report, run.evidence
+
+    if run.rows is not None:
+        from .pipeline import rank_to_sink
+        from .sinks import open_sink
+
+        all_rows, embeddings, skill_hits = run.rows
+        estats = EncodeStats()
+        try:
+            sink = open_sink(out, cfg.skills)
+        except (ValueError, ImportError) as e:
+            raise typer.BadParameter(str(e))
+        with sink:
+            n = rank_to_sink(jd, resumes, sink, top_k=None if all_rows else top_k, cfg=cfg,
+                             stats=stats, estats=estats, embeddings=embeddings,
+                             skill_hits=skill_hits)
+        typer.echo(f"Wrote {out} ({n} rows)")
+        _report_load(stats, extract_report)
+        typer.echo(estats.summary(), err=True)
+        return
+    if run.manifest:
+        _rank_incremental(run)
+        return
+    part = run.part
+    if part is not None:
+        from .pipeline import rank_shard
+
+        dest = out or Path(f"shard-{part[0]}-of-{part[1]}.npz")
+        top = rank_shard(jd, resumes, dest, part, top_k=top_k, cfg=cfg, stats=stats)
+        typer.echo(f"Wrote {dest} ({len(top)} rows, shard {part[0]}/{part[1]})")
+        _report_load(stats, extract_report)
+        return
+    if run.keep is not None:
+        from .pipeline import CascadeStats, rank_cascade
+
+        cstats = CascadeStats()
+        df = rank_cascade(jd, resumes, top_k=top_k, keep=run.keep, cfg=cfg, stats=stats,
+                          cstats=cstats, check_recall=run.check_recall)
+        _emit(df, out)
+        _report_load(stats, extract_report)
+        typer.echo(cstats.summary(), err=True)
+        return
+    from .stages import PipelineStats
+
+    estats, pstats = EncodeStats(), PipelineStats()
+    df = rank(jd, resumes, top_k=top_k, cfg=cfg, stats=stats, streaming=run.streaming,
+              estats=estats, pstats=pstats, evidence=evidence)
+    _emit(df, out)
+    if evidence is not None:
+        typer.echo(f"Wrote {evidence.path} ({evidence.rows} candidates)", err=True)
+    _report_load(stats, extract_report)
+    typer.echo(estats.summary(), err=True)
+    if pstats.stages:
+        typer.echo(pstats.summary(), err=True)
+
+def _parse_keep(value: str) -> float:
+    try:
+        keep = float(value[:-1]) / 100 if value.endswith("%") else float(value)
+    except ValueError:
+        raise typer.BadParameter(f"--cascade expects '10%' or a count, got {value!r}")
+    if keep <= 0 or (value.endswith("%") and keep > 1):
+        raise typer.BadParameter("--cascade must be a positive count or a share up to 100%")
+    return keep
+
+def _report_profile(tracer, path: Path, top: int) -> None:
+    tracer.write_chrome_trace(path)
+    typer.echo(f"Wrote trace {path} (open in chrome://tracing or ui.perfetto.dev)", err=True)
+    m = tracer.metrics()
+    typer.echo("Time by span:", err=True)
+    for name, s in m["spans"].items():
+        typer.echo(f"  {name:<12} {s['total_s']:9.3f}s  x{s['count']:<7} "
+                   f"mean {s['mean_ms']:9.3f} ms  max {s['max_ms']:9.3f} ms", err=True)
+    if m["counters"]:
+        typer.echo("Counters: " + ", ".join(f"{k}={v:g}" for k, v in m["counters"].items()),
+                   err=True)
+    typer.echo(f"Slowest {top} files:", err=True)
+    for f, secs, parts in tracer.slowest_files(top):
+        detail = ", ".join(f"{k} {v * 1000:.1f} ms" for k, v in sorted(parts.items()))
+        typer.echo(f"  {secs * 1000:9.1f} ms  {f}  ({detail})", err=True)
+
+def _parse_shard(value: str):
+    from .shard import parse_shard
+
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+def _report_load(stats, report: Optional[Path]) -> None:
+    typer.echo(stats.summary(), err=True)
+    for e in stats.errors:
+        typer.echo(f"  {e.kind}: {e.path} ({e.message})", err=True)
+    if report:
+        import json
+
+        report.parent.mkdir(parents=True, exist_ok=True)
+        report.write_text(json.dumps(
+            {"errors": [e.to_dict() for e in stats.errors], "timings": stats.timings}, indent=2
+        ))
+        typer.echo(f"Wrote {report}", err=True)
+
+def _emit(df, out: Optional[Path]) -> None:
+    if out:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out, index=False)
+        typer.echo(f"Wrote {out}")
+    else:
+        typer.echo(df.to_string(index=False))
+
+def _rank_incremental(run: _RankRun) -> None:
+    import time
+
+    from .io import LoadStats
+    from .manifest import ManifestStats
+    from .pipeline import rank_incremental
+
+    out, stats = run.out, run.stats
+    while True:
+        mstats = ManifestStats()
+        df = rank_incremental(run.jd, run.resumes, run.manifest, top_k=run.top_k, cfg=run.cfg,
+                              stats=stats, mstats=mstats)
+        if out:
+            if mstats.scored or mstats.removed or not out.exists():
+                out.parent.mkdir(parents=True, exist_ok=True)
+                df.to_csv(out, index=False)
+                typer.echo(f"Wrote {out}")
+        else:
+            typer.echo(df.to_string(index=False))
+        _report_load(stats, run.extract_report)
+        typer.echo(mstats.summary(), err=True)
+        if not run.watch:
+            return
+        try:
+            time.sleep(run.interval)
+        except KeyboardInterrupt:
+            return
+        stats = LoadStats()  # per poll
+
+@app.command(name="merge")
+def merge_cmd(
+    parts: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Shard .npz files"),
+    out: Optional[Path] = typer.Option(None, help="Where to write the merged ranked CSV"),
+    top_k: Optional[int] = typer.Option(
+        None, min=1, help="Rows to keep (default and maximum: the shards' top K)"
+    ),
+):
+    """Combine `rank --shard` outputs into the single-node ranking."""
+    from .shard import merge_partials
+
+    try:
+        table = merge_partials(parts, top_k=top_k)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    _emit(table.to_frame(), out)
+
+@app.command(name="explain")
+def explain_cmd(
+    evidence: Optional[Path] = typer.Option(
+        None, exists=True, dir_okay=False, help="Evidence JSONL written by `rank --evidence`"
+    ),
+    candidate: Optional[List[str]] = typer.Option(
+        None, help="Candidate name or resume path; repeat for several (default: all in --evidence)"
+    ),
+    jd: Optional[Path] = typer.Option(
+        None, exists=True, help="Without --evidence: score one --candidate file against this JD"
+    ),
+    out: Optional[Path] = typer.Option(
+        None, help="Report file (.md) or folder (one <candidate>.md each); default: print"
+    ),
+    top_k: Optional[int] = typer.Option(None, min=1, help="Only the best K stored candidates"),
+    backend: Backend = typer.Option(Backend.torch, help="Embedding backend (without --evidence)"),
+):
+    """Per-candidate reports: matched skills, experience ranges, closest sentences."""
+    import itertools
+
+    from .evidence import iter_evidence, render, report_name
+
+    if evidence:
+        if candidate:
+            # a stored name as given, else the stem of a resume file (names may contain dots)
+            stems = {c: Path(c).stem for c in candidate if Path(c).is_file()}
+            wanted = set(candidate) | set(stems.values())
+            found = [ev for ev in iter_evidence(evidence) if ev.candidate in wanted]
+            stored = {ev.candidate for ev in found}
+            keep = {c if c in stored else stems.get(c) for c in candidate}
+            missing = [c for c in candidate if c not in stored and stems.get(c) not in stored]
+            if missing:
+                raise typer.BadParameter(f"not in {evidence}: {', '.join(missing)}")
+            reports = [ev for ev in found if ev.candidate in keep][:top_k]
+        else:
+            reports = list(itertools.islice(iter_evidence(evidence), top_k))
+    elif jd and candidate and len(candidate) == 1 and Path(candidate[0]).is_file():
+        from .config import Config
+        from .pipeline import explain_file
+
+        cfg = Config()
+        cfg.embed_backend = backend.value
+        reports = [explain_file(jd, Path(candidate[0]), cfg)]
+    else:
+        raise typer.BadParameter("give --evidence, or --jd with one --candidate resume file")
+
+    if out is None:
+        typer.echo("\n".join(render(ev) for ev in reports))
+    elif out.suffix.lower() == ".md" and len(reports) == 1:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(render(reports[0]), encoding="utf-8")
+        typer.echo(f"Wrote {out}")
+    else:
+        out.mkdir(parents=True, exist_ok=True)
+        for ev in reports:
+            (out / f"{report_name(ev.candidate)}.md").write_text(render(ev), encoding="utf-8")
+        typer.echo(f"Wrote {len(reports)} reports to {out}")
+
+@app.command(name="rank-many")
+def rank_many_cmd(
+    jd: List[Path] = typer.Option(
+        ..., exists=True, help="Job description file; repeat for each JD"
+    ),
+    resumes: Path = typer.Option(..., exists=True, file_okay=False, help="Folder of resumes"),
+    out: Optional[Path] = typer.Option(None, help="Where to write the combined ranked CSV"),
+    top_k: int = typer.Option(10, min=1, help="Top K candidates to return per JD"),
+    w_skills: float = 0.5,
+    w_sim: float = 0.4,
+    w_exp: float = 0.1,
+    batch_size: int = typer.Option(64, min=1, help="Resumes per embedding batch"),
+    threads: Optional[int] = typer.Option(None, min=1, help="CPU threads for the embedding model"),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+    workers: int = typer.Option(1, min=0, help="Processes for PDF/DOCX extraction (0 = all CPUs)"),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write the on-disk cache"
+    ),
+):
+    """Rank one resume folder against several job descriptions in a single pass."""
+    from .cache import default_cache_dir
+    from .config import Config, Weights
+    from .io import LoadStats
+    from .pipeline import rank_many
+
+    cfg = Config()
+    cfg.weights = Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp)
+    cfg.embed_batch_size = batch_size
+    cfg.embed_threads = threads
+    cfg.embed_backend = backend.value
+    cfg.onnx_model_dir = onnx_dir
+    cfg.extract_workers = workers
+    cfg.cache_dir = None if no_cache else (cache_dir or default_cache_dir())
+    stats = LoadStats()
+    df = rank_many(jd, resumes, top_k=top_k, cfg=cfg, stats=stats)
+    if out:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out, index=False)
+        typer.echo(f"Wrote {out}")
+    else:
+        typer.echo(df.to_string(index=False))
+    typer.echo(stats.summary(), err=True)
+
+@app.command(name="bench")
+def bench_cmd(
+    scale: str = typer.Option("1k", help="Corpus size: 100, 1k, 10k or 100k (or any count)"),
+    out: Optional[Path] = typer.Option(None, help="Where to write the results (JSON)"),
+    baseline: Optional[Path] = typer.Option(
+        None, help="Fail if any stage's ms/doc regresses past this stored result"
+    ),
+    tolerance: float = typer.Option(0.25, min=0.0, help="Allowed slowdown per stage (0.25 = +25%)"),
+    update_baseline: bool = typer.Option(
+        False, "--update-baseline", help="Write this run to --baseline instead of checking it"
+    ),
+    workdir: Optional[Path] = typer.Option(
+        None, help="Corpus folder (default: <cache>/bench/<scale>); reused between runs"
+    ),
+    formats: str = typer.Option("txt,docx,pdf", help="Resume formats, cycled per file"),
+    seed: int = typer.Option(0, help="Corpus seed"),
+    workers: int = typer.Option(1, min=0, help="Processes for PDF/DOCX extraction (0 = all CPUs)"),
+    batch_size: int = typer.Option(64, min=1, help="Resumes per embedding batch"),
+    threads: Optional[int] = typer.Option(None, min=1, help="CPU threads for the embedding model"),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+):
+    """Time extract, skills, experience, embed and end-to-end rank on a synthetic corpus."""
+    import json
+
+    from .bench import load, regressions, run_bench, summary
+    from .cache import default_cache_dir
+    from .config import Config
+    from .synth import SCALES
+
+    n = SCALES.get(scale) or (int(scale) if scale.isdigit() else 0)
+    if n < 1:
+        raise typer.BadParameter(f"--scale must be one of {', '.join(SCALES)} or a count")
+    if update_baseline and not baseline:
+        raise typer.BadParameter("--update-baseline needs --baseline")
+    cfg = Config(
+        extract_workers=workers, embed_batch_size=batch_size, embed_threads=threads,
+        embed_backend=backend.value, onnx_model_dir=onnx_dir,
+    )
+    workdir = workdir or default_cache_dir() / "bench" / f"{scale}-seed{seed}"
+    try:
+        result = run_bench(workdir, n, cfg=cfg, seed=seed, formats=formats.split(","))
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    typer.echo(summary(result))
+    payload = json.dumps(result, indent=2)
+    if out:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(payload)
+        typer.echo(f"Wrote {out}")
+    if baseline and update_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(payload)
+        typer.echo(f"Wrote baseline {baseline}")
+    elif baseline:
+        try:
+            found = regressions(result, load(baseline), tolerance=tolerance)
+        except ValueError as e:
+            raise typer.BadParameter(f"{e}; record a new one with --update-baseline")
+        for line in found:
+            typer.echo(f"REGRESSION {line}", err=True)
+        if found:
+            raise typer.Exit(1)
+        typer.echo(f"No stage regressed more than {100 * tolerance:.0f}% vs {baseline}")
+
+@app.command(name="serve")
+def serve_cmd(
+    host: str = typer.Option("127.0.0.1", help="Bind address"),
+    port: int = typer.Option(8000, help="Port"),
+    workers: int = typer.Option(0, help="Extraction processes (0 = one per CPU)"),
+    max_batch: int = typer.Option(64, help="Texts per shared model batch"),
+    max_latency_ms: float = typer.Option(10.0, help="Longest a request waits for a batch to fill"),
+    threads: Optional[int] = typer.Option(None, help="CPU threads for the embedding model"),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+):
+    """Run the HTTP service (/rank, /explain); needs the `api` extra."""
+    import uvicorn
+
+    from .config import Config
+    from .service import create_app
+
+    cfg = Config(
+        extract_workers=workers, embed_threads=threads, embed_backend=backend.value,
+        onnx_model_dir=onnx_dir,
+    )
+    uvicorn.run(create_app(cfg, max_batch=max_batch, max_latency_ms=max_latency_ms),
+                host=host, port=port)
+
+@app.command(name="serve-model")
+def serve_model_cmd(
+    socket: Optional[Path] = typer.Option(
+        None, help="Unix socket path (default: $RESUME_RANKER_MODEL_SOCKET or <cache>/model.sock)"
+    ),
+    threads: Optional[int] = typer.Option(None, help="CPU threads for the embedding model"),
+):
+    """Keep the embedding model loaded; later CLI runs encode through it."""
+    from .daemon import DaemonError, ModelServer, default_socket_path
+    from .embed import set_threads
+
+    set_threads(threads)
+    path = socket or default_socket_path()
+    try:
+        server = ModelServer(path)
+    except DaemonError as e:
+        raise typer.BadParameter(str(e))
+    with server:
+        typer.echo(f"Serving model on {path} (Ctrl-C to stop)", err=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+@cache_app.command(name="info")
+def cache_info_cmd(
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+):
+    """Show what the embedding and extraction caches hold."""
+    from .cache import EmbeddingStore, TextCache, default_cache_dir
+
+    root = cache_dir or default_cache_dir()
+    caches = {
+        "embeddings": EmbeddingStore(root / "embeddings"),
+        "extract": TextCache(root / "extract"),
+    }
+    for name, c in caches.items():
+        typer.echo(f"[{name}]")
+        for k, v in c.info().items():
+            typer.echo(f"  {k}: {v}")
+        c.close()
+
+@cache_app.command(name="prune")
+def cache_prune_cmd(
+    max_mb: float = typer.Option(
+        ..., min=0, help="Evict least-recently-used entries above this size"
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+):
+    """Shrink the embedding cache to at most MAX_MB of vectors."""
+    from .cache import EmbeddingStore, default_cache_dir
+
+    store = EmbeddingStore((cache_dir or default_cache_dir()) / "embeddings")
+    removed = store.prune(max_mb)
+    typer.echo(f"Evicted {removed} embeddings ({len(store)} left)")
+    store.close()
+
+@cache_app.command(name="clear")
+def cache_clear_cmd(
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+):
+    """Delete every cached embedding and extracted text."""
+    from .cache import EmbeddingStore, TextCache, default_cache_dir
+
+    root = cache_dir or default_cache_dir()
+    for c in (EmbeddingStore(root / "embeddings"), TextCache(root / "extract")):
+        c.clear()
+        c.close()
+    typer.echo("Cache cleared")
+
+@index_app.command(name="build")
+def index_build_cmd(
+    index: Path = typer.Option(..., help="Index folder (created if missing, extended otherwise)"),
+    resumes: Path = typer.Option(..., exists=True, file_okay=False, help="Folder of resumes"),
+    skills: Optional[str] = typer.Option(
+        None, help="Comma-separated skill vocabulary for a new index"
+    ),
+    batch_size: int = typer.Option(64, min=1, help="Resumes per embedding batch"),
+    workers: int = typer.Option(1, min=0, help="Processes for PDF/DOCX extraction (0 = all CPUs)"),
+    cache_dir: Optional[Path] = typer.Option(
+        None, help="Cache folder (default: ~/.cache/resume-ranker)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write the on-disk cache"
+    ),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+):
+    """Ingest a resume folder into the index; unchanged candidates are skipped."""
+    from .cache import default_cache_dir
+    from .config import Config
+    from .index import build_index
+    from .io import LoadStats
+
+    cfg = Config()
+    if skills:
+        cfg.skills = [s.strip() for s in skills.split(",") if s.strip()]
+    cfg.embed_batch_size = batch_size
+    cfg.extract_workers = workers
+    cfg.cache_dir = None if no_cache else (cache_dir or default_cache_dir())
+    cfg.embed_backend = backend.value
+    cfg.onnx_model_dir = onnx_dir
+    stats = LoadStats()
+    try:
+        idx = build_index(index, resumes, cfg=cfg, stats=stats)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    typer.echo(f"{len(idx)} candidates in {index}")
+    typer.echo(stats.summary(), err=True)
+
+@index_app.command(name="remove")
+def index_remove_cmd(
+    index: Path = typer.Option(..., exists=True, file_okay=False, help="Index folder"),
+    candidate: List[str] = typer.Option(..., help="Candidate name or file path; repeatable"),
+    compact: bool = typer.Option(False, "--compact", help="Rewrite the index without removed rows"),
+):
+    """Remove candidates from the index."""
+    from .index import CandidateIndex
+
+    idx = CandidateIndex(index)
+    keys = [str(Path(c).resolve()) if Path(c).exists() else c for c in candidate]
+    typer.echo(f"Removed {idx.remove(keys)} candidates")
+    if compact:
+        typer.echo(f"Compacted {idx.compact()} rows")
+
+@index_app.command(name="train")
+def index_train_cmd(
+    index: Path = typer.Option(..., exists=True, file_okay=False, help="Index folder"),
+    nlist: int = typer.Option(0, min=0, help="Number of inverted lists (0 = sqrt of rows)"),
+):
+    """Train IVF lists so queries can use --approximate."""
+    from .index import CandidateIndex
+
+    typer.echo(f"Trained {CandidateIndex(index).train_ivf(nlist)} inverted lists")
+
+@index_app.command(name="query")
+def index_query_cmd(
+    index: Path = typer.Option(..., exists=True, file_okay=False, help="Index folder"),
+    jd: Path = typer.Option(..., exists=True, help="Path to job description (txt/pdf/docx)"),
+    out: Optional[Path] = typer.Option(None, help="Where to write ranked CSV"),
+    top_k: int = typer.Option(10, min=1, help="Top K candidates to return"),
+    skills: Optional[str] = typer.Option(None, help="Comma-separated subset of the index skills"),
+    w_skills: float = 0.5,
+    w_sim: float = 0.4,
+    w_exp: float = 0.1,
+    approximate: bool = typer.Option(
+        False, "--approximate", help="Search only the nearest IVF lists"
+    ),
+    nprobe: int = typer.Option(8, min=1, help="IVF lists to visit with --approximate"),
+    backend: Backend = typer.Option(
+        Backend.torch, help="Embedding backend (onnx: int8 export, sklearn: no model download)"
+    ),
+    onnx_dir: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False, help="Exported ONNX model folder for --backend onnx"
+    ),
+):
+    """Rank indexed candidates against a job description without touching resume files."""
     from .config import Config, Weights
+    from .index import CandidateIndex
+    from .io import load_jd_text
 
+    idx = CandidateIndex(index)
     cfg = Config()
+    cfg.skills = [s.strip() for s in skills.split(",") if s.strip()] if skills else idx.skills
     cfg.weights = Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp)
-    df = rank(jd, resumes, top_k=top_k, cfg=cfg)
+    cfg.embed_backend = backend.value
+    cfg.onnx_model_dir = onnx_dir
+    try:
+        df = idx.search(load_jd_text(jd), cfg, top_k=top_k, approximate=approximate, nprobe=nprobe)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
     if out:
         out.parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(out, index=False)
@@ -29,5 +757,15 @@ def rank_cmd(
     else:
         typer.echo(df.to_string(index=False))
 
+@index_app.command(name="info")
+def index_info_cmd(
+    index: Path = typer.Option(..., exists=True, file_okay=False, help="Index folder"),
+):
+    """Show index size and settings."""
+    from .index import CandidateIndex
+
+    for k, v in CandidateIndex(index).info().items():
+        typer.echo(f"{k}: {v}")
+
 if __name__ == "__main__":
     app()
@@ -1,6 +1,7 @@
 # src/resume_ranker/config.py
+from pathlib import Path
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class Weights(BaseModel):
     w_skills: float = 0.5
@@ -14,3 +15,19 @@ class Config(BaseModel):
     ]
     weights: Weights = Weights()
     default_exp_target_years: float = 3.0  # <— NEW
+    embed_batch_size: int = 64  # resumes per model forward pass
+    embed_threads: Optional[int] = None  # model intra-op threads (None = backend default)
+    embed_backend: str = "torch"  # "torch", "onnx" (needs onnx_model_dir) or "sklearn"
+    onnx_model_dir: Optional[Path] = None  # exported (ideally int8-quantized) ONNX model
+    extract_workers: int = 1  # processes parsing PDF/DOCX (0 = one per CPU)
+    extract_timeout: Optional[float] = None  # seconds per file before its worker is killed
+    extract_max_mb: Optional[float] = None  # memory ceiling per extraction worker
+    extract_max_pages: Optional[int] = None  # PDF pages read per file
+    extract_max_chars: Optional[int] = None  # stop reading a file once this much text is in
+    staged: bool = False  # overlap extraction, rule scoring and embedding in threads
+    stage_queue_size: int = 256  # items buffered between stages (bounds memory)
+    dedup: bool = False  # fold near-duplicate resumes into one scored candidate
+    dedup_threshold: float = 0.85  # estimated Jaccard of word 3-shingles for a duplicate
+    evidence_sentences: int = 3  # resume sentences closest to the JD kept as evidence
+    cache_dir: Optional[Path] = None  # on-disk embedding cache (None = disabled)
+    cache_max_mb: float = 512.0
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .config import Config
+from .experience import target_years_from_jd
+from .skills import SkillMatcher, get_matcher
+
+if TYPE_CHECKING:
+    from .cache import EmbeddingStore
+
+
+@dataclass
+class JobContext:
+    """Everything derived from the JD alone, computed once per ranking run."""
+
+    jd_text: str
+    target_years: float
+    matcher: SkillMatcher
+    embedding: Optional[np.ndarray] = None  # L2-normalized JD vector
+
+    @classmethod
+    def build(
+        cls,
+        jd_text: str,
+        cfg: Config,
+        embed: bool = True,
+        store: Optional["EmbeddingStore"] = None,
+    ) -> "JobContext":
+        vec = None
+        if embed:
+            from .embed import encode
+
+            vec = encode([jd_text], batch_size=1, store=store)[0]
+        return cls(
+            jd_text=jd_text,
+            target_years=target_years_from_jd(jd_text, cfg.default_exp_target_years),
+            matcher=get_matcher(tuple(cfg.skills)),
+            embedding=vec,
+        )
@@ -0,0 +1,188 @@
+"""`resume-ranker serve-model`: keep the embedding model loaded behind a Unix socket.
+
+Each CLI run otherwise pays for importing torch and loading the weights. While the
+daemon is up, `embed.encode` in other processes sends texts to it instead.
+
+Wire format, both directions: two big-endian uint32 lengths (JSON header, payload),
+then the header and payload bytes. Requests carry `{"texts": [...], "batch_size": n}`;
+replies carry the model name, the row shape and EncodeStats fields, with the float32
+rows as payload.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embed import EncodeStats, model_id
+
+_HEAD = struct.Struct(">II")
+
+# A daemon that hangs must not hang its clients: past these, `embed` loads the model itself.
+CONNECT_TIMEOUT = 2.0  # seconds
+READ_TIMEOUT = 30.0  # seconds to wait for a reply, plus PER_TEXT_TIMEOUT for every text
+PER_TEXT_TIMEOUT = 0.05
+
+
+def default_socket_path() -> Path:
+    env = os.environ.get("RESUME_RANKER_MODEL_SOCKET")
+    if env:
+        return Path(env)
+    from .cache import default_cache_dir
+
+    return default_cache_dir() / "model.sock"
+
+
+def _send(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    h = json.dumps(header).encode()
+    sock.sendall(_HEAD.pack(len(h), len(payload)) + h + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("socket closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv(sock: socket.socket) -> Tuple[dict, bytes]:
+    hl, pl = _HEAD.unpack(_recv_exact(sock, _HEAD.size))
+    return json.loads(_recv_exact(sock, hl)), _recv_exact(sock, pl)
+
+
+class DaemonError(OSError):
+    """The daemon answered but cannot serve the request, or another one owns the socket.
+
+    An OSError, so `embed` falls back to the in-process model as for a dead daemon.
+    """
+
+
+class ModelClient:
+    """One persistent connection to a running daemon."""
+
+    def __init__(
+        self,
+        path: Path,
+        timeout: Optional[float] = CONNECT_TIMEOUT,
+        read_timeout: Optional[float] = READ_TIMEOUT,
+    ):
+        self.path = Path(path)
+        self.read_timeout = read_timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(self.path))
+        self._lock = threading.Lock()
+
+    def encode(
+        self, texts: Sequence[str], batch_size: int = 64, stats: Optional[EncodeStats] = None
+    ) -> np.ndarray:
+        with self._lock:
+            if self.read_timeout is not None:
+                self._sock.settimeout(self.read_timeout + PER_TEXT_TIMEOUT * len(texts))
+            _send(self._sock, {"texts": list(texts), "batch_size": batch_size})
+            header, payload = _recv(self._sock)
+        if "error" in header:
+            raise DaemonError(f"model daemon: {header['error']}")
+        if header["model"] != model_id():
+            raise DaemonError(f"model daemon serves {header['model']}, expected {model_id()}")
+        if stats is not None:
+            for f in fields(EncodeStats):
+                setattr(stats, f.name, getattr(stats, f.name) + header["stats"][f.name])
+        return np.frombuffer(payload, dtype=np.float32).reshape(header["shape"]).copy()
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+_client: Optional[ModelClient] = None
+_failed: set = set()
+
+
+def connect(path: Optional[Path] = None) -> Optional[ModelClient]:
+    """Client for the daemon at `path` (default socket), or None if nothing is listening."""
+    global _client
+    path = Path(path or default_socket_path())
+    if _client is not None and _client.path == path:
+        return _client
+    if str(path) in _failed or not path.exists():
+        return None
+    try:
+        _client = ModelClient(path, timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT)
+    except OSError:
+        _failed.add(str(path))  # stale socket file; do not retry on every call
+        return None
+    return _client
+
+
+def disconnect() -> None:
+    global _client
+    if _client is not None:
+        _failed.add(str(_client.path))
+        _client.close()
+        _client = None
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        from .embed import _encode_local
+
+        server: "ModelServer" = self.server  # type: ignore[assignment]
+        while True:
+            try:
+                req, _ = _recv(self.request)
+            except (ConnectionError, OSError):
+                return
+            stats = EncodeStats()
+            try:
+                with server.lock:
+                    vecs = _encode_local(server.model, req["texts"], req["batch_size"], stats)
+            except Exception as e:
+                _send(self.request, {"error": repr(e)})
+                continue
+            vecs = np.ascontiguousarray(vecs, dtype=np.float32)
+            _send(
+                self.request,
+                {"model": model_id(), "shape": list(vecs.shape), "stats": asdict(stats)},
+                vecs.tobytes(),
+            )
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves encode requests from many clients; model calls are serialized."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, model=None):
+        from .embed import get_model
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # left behind by a daemon that did not shut down cleanly
+                self.path.unlink(missing_ok=True)
+            else:
+                raise DaemonError(f"a model daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+        self.model = model if model is not None else get_model()
+        self.lock = threading.Lock()
+        super().__init__(str(self.path), _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
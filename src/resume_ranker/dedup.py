@@ -0,0 +1,155 @@
+import bisect
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .skills import TOKEN_RE
+
+SHINGLE = 3  # words per shingle
+NUM_PERM = 128  # MinHash permutations
+BANDS = 16  # LSH bands of NUM_PERM // BANDS rows: candidates from Jaccard ~0.7 up
+THRESHOLD = 0.85  # estimated Jaccard at which two resumes count as the same
+
+_rng = np.random.default_rng(1)
+_A = (_rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64) | np.uint64(1)).astype(np.uint32)
+_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64).astype(np.uint32)
+
+
+def shingles(text: str, k: int = SHINGLE) -> np.ndarray:
+    """Distinct 32-bit hashes of the word k-grams of the normalized (lowercased) text."""
+    toks = TOKEN_RE.findall(text.lower())
+    if not toks:
+        return np.zeros(0, dtype=np.uint32)
+    h = np.fromiter((zlib.crc32(t.encode()) for t in toks), dtype=np.uint32, count=len(toks))
+    if len(h) >= k:
+        n = len(h) - k + 1
+        acc = h[:n].copy()
+        for j in range(1, k):
+            acc *= np.uint32(0x01000193)  # FNV prime; uint32 arithmetic wraps
+            acc ^= h[j : n + j]
+        h = acc
+    return np.unique(h)
+
+
+def minhash(sh: np.ndarray) -> np.ndarray:
+    """NUM_PERM minimums of a*x + b (mod 2^32, odd a) over the shingle hashes."""
+    m = np.multiply.outer(_A, sh)
+    m += _B[:, None]
+    return m.min(axis=1)
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of `text`, or None when it has no words to compare."""
+    sh = shingles(text)
+    return minhash(sh) if len(sh) else None
+
+
+class Deduper:
+    """Streaming MinHash/LSH: each document is checked against every earlier one in
+    (amortized) constant time by looking up its band hashes, then confirmed on the
+    signature agreement, which estimates the Jaccard similarity of the shingle sets.
+    Each group of near-duplicates has one representative key, the first added unless
+    `promote` names another.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._sigs: List[np.ndarray] = []
+        self._groups: List[int] = []  # signature -> group
+        self._reps: List[str] = []  # group -> representative key
+        self._group_of: Dict[str, int] = {}
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """Register `text`; return the representative of its near-duplicates, else None."""
+        return self.add_signature(key, signature(text))
+
+    def add_signature(self, key: str, sig: Optional[np.ndarray]) -> Optional[str]:
+        """`add` for a precomputed `signature` (None for a text without shingles)."""
+        if sig is None:
+            return None  # empty extractions are not evidence that two files are one resume
+        bands = [sig[b * self.rows : (b + 1) * self.rows].tobytes() for b in range(self.bands)]
+        seen = set()
+        for b, h in enumerate(bands):
+            for other in self._buckets[b].get(h, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                if np.mean(self._sigs[other] == sig) >= self.threshold:
+                    return self._reps[self._groups[other]]
+        idx = len(self._sigs)
+        self._group_of[key] = len(self._reps)
+        self._groups.append(len(self._reps))
+        self._reps.append(key)
+        self._sigs.append(sig)
+        for b, h in enumerate(bands):
+            self._buckets[b][h].append(idx)
+        return None
+
+    def promote(self, rep: str, key: str) -> None:
+        """Make `key` the representative of the group `rep` currently represents."""
+        g = self._group_of.pop(rep)
+        self._reps[g] = key
+        self._group_of[key] = g
+
+
+def _fold(name: str, rep: str, aliases, stats, skipped_chars: int) -> None:
+    if aliases is not None:
+        bisect.insort(aliases.setdefault(rep, []), name)
+    if stats is not None:
+        stats.duplicates += 1
+        stats.duplicate_chars += skipped_chars
+
+
+def dedup(
+    items: Iterable[Tuple[str, str]],
+    threshold: float = THRESHOLD,
+    aliases: Optional[Dict[str, List[str]]] = None,
+    stats=None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield the first of every group of near-duplicate (name, text) pairs.
+
+    Later copies are folded into `aliases[kept_name]`; `stats` (a LoadStats) counts them
+    and the characters of text that skip embedding and scoring. Which copy is kept depends
+    on the order of `items`: pass them sorted by name, or use `dedup_stream`, when that
+    order is the order extraction happened to finish in.
+    """
+    d = Deduper(threshold)
+    for name, text in items:
+        first = d.add(name, text)
+        if first is None:
+            yield name, text
+        else:
+            _fold(name, first, aliases, stats, len(text))
+
+
+def dedup_stream(
+    items: Iterable[Tuple[str, str]],
+    threshold: float = THRESHOLD,
+    aliases: Optional[Dict[str, List[str]]] = None,
+    stats=None,
+) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """`dedup` that keeps the smallest name of every group, whatever the arrival order.
+
+    Yields (name, text, replaced): `replaced` is None for the first copy of a group, or
+    the earlier yielded name that this smaller one now stands in for, which the consumer
+    drops. The displaced copy joins the aliases and counts as a duplicate in `stats`, but
+    its characters do not: it was yielded, so it has been embedded and scored too.
+    """
+    d = Deduper(threshold)
+    for name, text in items:
+        rep = d.add(name, text)
+        if rep is None:
+            yield name, text, None
+        elif name < rep:
+            d.promote(rep, name)
+            if aliases is not None and rep in aliases:
+                aliases[name] = aliases.pop(rep)
+            _fold(rep, name, aliases, stats, 0)
+            yield name, text, rep
+        else:
+            _fold(name, rep, aliases, stats, len(text))
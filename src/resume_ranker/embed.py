@@ -1,15 +1,243 @@
 
-from sentence_transformers import SentenceTransformer, util
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import trace
+
+if TYPE_CHECKING:
+    from .cache import EmbeddingStore
+    from .config import Config
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Upper bound on characters per word-piece used to cut long texts before tokenizing;
+# windows that turn out too short are re-tokenized in full.
+CHARS_PER_TOKEN = 12
 
 _model = None
+_backend = "torch"
+_onnx_dir: Optional[Path] = None
+_threads: Optional[int] = None
 
 def get_model():
     global _model
     if _model is None:
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
+        from .backends import load
+
+        with trace.span("embed.load", backend=_backend):
+            _model = load(_backend, MODEL_NAME, onnx_dir=_onnx_dir, threads=_threads)
     return _model
 
+def use_backend(name: str, onnx_dir: Optional[Path] = None) -> None:
+    """Select the embedding backend (see `backends`); a loaded model of another kind is dropped."""
+    global _model, _backend, _onnx_dir
+    from .backends import BACKENDS
+
+    if name not in BACKENDS:
+        raise ValueError(f"unknown embedding backend {name!r}; choose from {', '.join(BACKENDS)}")
+    onnx_dir = Path(onnx_dir) if onnx_dir else None
+    if (name, onnx_dir) != (_backend, _onnx_dir):
+        _backend, _onnx_dir, _model = name, onnx_dir, None
+
+def model_id() -> str:
+    """Identity of the active backend's vectors; caches and indexes are keyed by it."""
+    if _backend == "onnx":
+        # the file that would be loaded, so a re-export or requantization is a new identity
+        from .backends import onnx_model_file
+
+        if _onnx_dir is None:
+            return f"{MODEL_NAME}@onnx:"
+        try:
+            path = onnx_model_file(Path(_onnx_dir)).resolve()
+        except FileNotFoundError:
+            return f"{MODEL_NAME}@onnx:{Path(_onnx_dir).resolve()}"
+        st = path.stat()
+        return f"{MODEL_NAME}@onnx:{path}:{st.st_size}:{st.st_mtime_ns}"
+    if _backend == "sklearn":
+        from .backends import HashingEncoder
+
+        return HashingEncoder.NAME
+    return MODEL_NAME
+
+def set_threads(n: Optional[int]) -> None:
+    """Pin the number of intra-op CPU threads used by the model (None = backend default)."""
+    global _threads
+    _threads = n
+    if n and _backend == "torch":
+        import torch
+        torch.set_num_threads(n)
+
+def configure(cfg: "Config") -> None:
+    """Apply the embedding settings of `cfg`: backend and thread count."""
+    use_backend(cfg.embed_backend, cfg.onnx_model_dir)
+    set_threads(cfg.embed_threads)
+
+@dataclass
+class EncodeStats:
+    """Throughput counters for texts that went through the model."""
+    texts: int = 0
+    truncated: int = 0
+    tokens: int = 0          # real tokens fed to the model, special tokens included
+    padded_tokens: int = 0   # batch slots: sum of batch_len * longest_in_batch
+    seconds: float = 0.0
+
+    @property
+    def padding_ratio(self) -> float:
+        return 1.0 - self.tokens / self.padded_tokens if self.padded_tokens else 0.0
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Encoded {self.texts} texts ({self.truncated} truncated): "
+            f"{self.tokens} tokens, padding {self.padding_ratio:.1%}, "
+            f"{self.tokens_per_sec:,.0f} tokens/s"
+        )
+
+def _truncate(m, texts: Sequence[str]) -> Tuple[List[str], List[int], int]:
+    """Cut every text to what the model will actually see; returns (texts, token_lengths, n_cut).
+
+    Texts are first cut to a character window so a ten-page resume is not tokenized in
+    full, then the tokenizer's offset mapping gives the exact end of the last kept token.
+    Models without a tokenizer fall back to whitespace word counts and no truncation.
+    """
+    tok = getattr(m, "tokenizer", None)
+    max_len = getattr(m, "max_seq_length", None)
+    if tok is None or not max_len:
+        return list(texts), [len(t.split()) for t in texts], 0
+    budget = max_len - tok.num_special_tokens_to_add()
+    window = budget * CHARS_PER_TOKEN
+
+    def offsets(batch: List[str]) -> List[List[Tuple[int, int]]]:
+        enc = tok(
+            batch, add_special_tokens=False, truncation=True, max_length=budget,
+            return_offsets_mapping=True, return_attention_mask=False,
+        )
+        return enc["offset_mapping"]
+
+    out, lengths, n_cut = list(texts), [0] * len(texts), 0
+    spans = offsets([t[:window] for t in texts])
+    short = [i for i, sp in enumerate(spans) if len(sp) < budget and len(texts[i]) > window]
+    for i, sp in zip(short, offsets([texts[i] for i in short]) if short else []):
+        spans[i] = sp
+    for i, sp in enumerate(spans):
+        if len(sp) == budget and sp[-1][1] < len(texts[i].rstrip()):
+            out[i] = texts[i][:sp[-1][1]]
+            n_cut += 1
+        lengths[i] = len(sp) + (max_len - budget)
+    return out, lengths, n_cut
+
+def _encode_model(
+    texts: Sequence[str], batch_size: int, stats: Optional[EncodeStats] = None
+) -> np.ndarray:
+    """Run the model, in a `serve-model` daemon when one is up and no model is loaded here."""
+    with trace.span("embed", texts=len(texts)):
+        if _model is None and _backend == "torch":
+            from . import daemon
+
+            client = daemon.connect()
+            if client is not None:
+                try:
+                    return client.encode(texts, batch_size, stats)
+                except OSError:  # includes timeouts and daemon.DaemonError
+                    daemon.disconnect()  # daemon went away, hangs or failed; encode here instead
+        return _encode_local(get_model(), texts, batch_size, stats)
+
+def _encode_local(
+    m, texts: Sequence[str], batch_size: int, stats: Optional[EncodeStats] = None
+) -> np.ndarray:
+    """Length-bucketed model pass: truncate, sort by token length, batch, restore order.
+
+    Batches hold texts of similar length, so little of each batch is padding.
+    """
+    dim = m.get_sentence_embedding_dimension()
+    if not texts:
+        return np.zeros((0, dim), dtype=np.float32)
+    t0 = time.perf_counter()
+    cut, lengths, n_cut = _truncate(m, texts)
+    order = np.argsort(np.asarray(lengths), kind="stable")
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    padded = 0
+    for b in range(0, len(order), batch_size):
+        idx = order[b:b + batch_size]
+        emb = m.encode(
+            [cut[i] for i in idx],
+            batch_size=len(idx),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        out[idx] = np.asarray(emb, dtype=np.float32)
+        padded += len(idx) * lengths[idx[-1]]
+    if stats is not None:
+        stats.texts += len(texts)
+        stats.truncated += n_cut
+        stats.tokens += sum(lengths)
+        stats.padded_tokens += padded
+        stats.seconds += time.perf_counter() - t0
+    return out
+
+def encode(
+    texts: Sequence[str],
+    batch_size: int = 64,
+    store: Optional["EmbeddingStore"] = None,
+    stats: Optional[EncodeStats] = None,
+) -> np.ndarray:
+    """Encode texts into L2-normalized float32 rows in length-bucketed batches of `batch_size`.
+
+    With a `store`, cached rows are reused and only the misses go through the model.
+    """
+    if store is None:
+        return _encode_model(texts, batch_size, stats)
+    if not texts:
+        return np.zeros((0, store.dim or embedding_dim()), dtype=np.float32)
+    from .cache import text_hash
+
+    hashes = [text_hash(t) for t in texts]
+    cached = store.get_many(hashes)
+    miss_idx = [i for i, h in enumerate(hashes) if h not in cached]
+    trace.count("embed.cache_hit", len(texts) - len(miss_idx))
+    fresh = _encode_model([texts[i] for i in miss_idx], batch_size, stats)
+    store.put_many([hashes[i] for i in miss_idx], fresh)
+    dim = fresh.shape[1] if miss_idx else len(next(iter(cached.values())))
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    for i, h in enumerate(hashes):
+        if h in cached:
+            out[i] = cached[h]
+    if miss_idx:
+        out[miss_idx] = fresh
+    return out
+
+def embedding_dim() -> int:
+    """Row width of `encode` output (asks the daemon when one is serving the model)."""
+    return _encode_model([], 1).shape[1]
+
+def similarities(
+    jd_text: str,
+    texts: Sequence[str],
+    batch_size: int = 64,
+    store: Optional["EmbeddingStore"] = None,
+) -> np.ndarray:
+    """Cosine similarity of every text against the JD, encoding the JD once."""
+    jd_vec = encode([jd_text], batch_size=1, store=store)[0]
+    return encode(texts, batch_size=batch_size, store=store) @ jd_vec
+
+def open_store(cache_dir, max_mb: float = 512.0) -> "EmbeddingStore":
+    """Embedding store under `cache_dir`, invalidated whenever the backend's model_id changes."""
+    from .cache import EmbeddingStore
+
+    return EmbeddingStore(Path(cache_dir) / "embeddings", model=model_id(), max_mb=max_mb)
+
+def similarity_matrix(queries: np.ndarray, corpus: np.ndarray) -> np.ndarray:
+    """All pairwise cosine scores between normalized query rows and corpus rows."""
+    return np.asarray(queries, dtype=np.float32) @ np.asarray(corpus, dtype=np.float32).T
+
 def similarity(a: str, b: str) -> float:
-    m = get_model()
-    ea, eb = m.encode([a, b], normalize_embeddings=True)
-    return float(util.cos_sim(ea, eb)[0][0])
+    ea, eb = encode([a, b], batch_size=2)
+    return float(ea @ eb)
@@ -0,0 +1,184 @@
+"""Why a candidate scored what it did, recorded while scoring and rendered later.
+
+One JSON object per candidate (evidence.jsonl): the score components, every skill hit as
+(skill, start, end, kind, quote), the dated ranges behind the experience estimate and
+their merged month intervals, and the resume sentences most similar to the JD. Skill and
+sentence offsets index the extracted text; range offsets index its NFKC-normalized form
+(see `experience`). The short quotes make a record self-contained, so `explain` renders
+reports from the file alone, without extracting or embedding anything again.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .experience import ExperienceResult, _norm
+from .skills import SkillMatch
+
+MAX_SENTENCES = 64  # sentences per resume considered for the similarity evidence
+QUOTE_CHARS = 240
+
+_SENTENCE_RE = re.compile(r"[^.!?\n]+")
+_MONTHS = "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split()
+
+
+@dataclass
+class Evidence:
+    candidate: str
+    scores: Dict[str, float]
+    skills: List[Tuple[str, int, int, str, str]] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    exp_source: str = "none"
+    ranges: List[Tuple[int, int, int, int, str]] = field(default_factory=list)
+    intervals: List[Tuple[int, int]] = field(default_factory=list)
+    sentences: List[Tuple[int, int, float, str]] = field(default_factory=list)
+    aliases: List[str] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        candidate: str,
+        text: str,
+        scores: Dict[str, float],
+        skills: Sequence[str],
+        match: SkillMatch,
+        exp: ExperienceResult,
+        sentences: Sequence[Tuple[int, int, float]] = (),
+        aliases: Sequence[str] = (),
+    ) -> "Evidence":
+        norm = _norm(text)
+        hit = set(match.matched)
+        return cls(
+            candidate=candidate,
+            scores={k: float(v) for k, v in scores.items()},
+            skills=[(h.skill, h.start, h.end, h.kind, text[h.start : h.end]) for h in match.hits],
+            missing=[s for s in skills if s not in hit],
+            exp_source=exp.source,
+            ranges=[(a, b, s, e, norm[a:b]) for a, b, s, e in exp.ranges],
+            intervals=[tuple(iv) for iv in exp.intervals],
+            sentences=[
+                (a, b, round(float(sim), 4), text[a:b][:QUOTE_CHARS]) for a, b, sim in sentences
+            ],
+            aliases=list(aliases),
+        )
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Evidence":
+        return cls(**d)
+
+
+def split_sentences(text: str, max_n: int = MAX_SENTENCES) -> List[Tuple[int, int]]:
+    """(start, end) of up to `max_n` sentences or lines with at least four words."""
+    out = []
+    for m in _SENTENCE_RE.finditer(text):
+        chunk = m.group()
+        if len(chunk.split()) < 4:
+            continue
+        lead = len(chunk) - len(chunk.lstrip())
+        out.append((m.start() + lead, m.start() + len(chunk.rstrip())))
+        if len(out) == max_n:
+            break
+    return out
+
+
+def similar_sentences(
+    texts: Sequence[str],
+    jd_vec: np.ndarray,
+    k: int = 3,
+    batch_size: int = 64,
+) -> List[List[Tuple[int, int, float]]]:
+    """The `k` sentences of each text closest to the JD, in one encode call for all texts.
+
+    The sentence vectors bypass the embedding store: there are many per resume and they
+    are rarely asked for again, so caching them would evict the resume and JD vectors.
+    """
+    from .embed import encode
+
+    spans = [split_sentences(t) if k > 0 else [] for t in texts]
+    flat = [t[a:b] for t, sp in zip(texts, spans) for a, b in sp]
+    sims = encode(flat, batch_size=batch_size) @ jd_vec if flat else np.zeros(0)
+    out, i = [], 0
+    for sp in spans:
+        s = sims[i : i + len(sp)]
+        i += len(sp)
+        best = np.argsort(-s, kind="stable")[:k]
+        out.append([(sp[j][0], sp[j][1], float(s[j])) for j in best])
+    return out
+
+
+class EvidenceWriter:
+    """Appends one JSON line per candidate; usable as a context manager."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: IO[str] = open(self.path, "w", encoding="utf-8")
+        self.rows = 0
+
+    def __enter__(self) -> "EvidenceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, ev: Evidence) -> None:
+        self._fh.write(json.dumps(asdict(ev), separators=(",", ":")) + "\n")
+        self.rows += 1
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def iter_evidence(path: Path) -> Iterator[Evidence]:
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield Evidence.from_json(json.loads(line))
+
+
+def _month(idx: int) -> str:
+    return f"{_MONTHS[idx % 12]} {idx // 12}"
+
+
+def render(ev: Evidence) -> str:
+    """Markdown report for one candidate."""
+    sc = ev.scores
+    n_hit = len(ev.skills)
+    lines = [
+        f"# {ev.candidate}",
+        "",
+        f"**Total {sc['total']:.3f}**: skills {sc['skills']:.3f}, "
+        f"similarity {sc['sim']:.3f}, experience {sc['exp_score']:.3f}",
+    ]
+    if ev.aliases:
+        lines.append(f"Near-duplicates folded into this candidate: {', '.join(ev.aliases)}")
+    lines += ["", f"## Skills ({n_hit} of {n_hit + len(ev.missing)} matched)"]
+    for skill, start, end, kind, quote in ev.skills:
+        lines.append(f'- **{skill}** ({kind}, chars {start}-{end}): "{quote}"')
+    if ev.missing:
+        lines.append(f"- missing: {', '.join(ev.missing)}")
+    lines += [
+        "",
+        f"## Experience: {sc['exp_years']:.2f} years "
+        f"(target {sc['exp_target']:g}, from {ev.exp_source})",
+    ]
+    for start, end, _, _, quote in ev.ranges:
+        lines.append(f'- "{quote}" (chars {start}-{end})')
+    if ev.intervals:
+        merged = ", ".join(f"{_month(s)} - {_month(e)}" for s, e in ev.intervals)
+        months = sum(e - s for s, e in ev.intervals)
+        lines.append(f"- merged: {merged} ({months} months)")
+    if ev.sentences:
+        lines += ["", "## Closest to the job description"]
+        for start, end, sim, quote in ev.sentences:
+            lines.append(f'- {sim:.3f}: "{quote}" (chars {start}-{end})')
+    return "\n".join(lines) + "\n"
+
+
+def report_name(candidate: str) -> str:
+    """File name for a candidate's report (names are file stems, but may hold any text)."""
+    return re.sub(r"[^\w.\-]+", "_", candidate).strip("._") or "candidate"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import re
 import unicodedata
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Tuple
 
@@ -26,10 +27,10 @@ def _norm(text: str) -> str:
     t = unicodedata.normalize("NFKC", text or "")
     return t.replace("—", "-").replace("–", "-").replace("−", "-").replace("’", "'")
 
-def _to_year(val: str) -> Optional[int]:
+def _to_year(val: str, current: Optional[int] = None) -> Optional[int]:
     val = val.strip().lower()
     if val in {"present", "current", "now", "date", "till date", "to date"}:
-        return datetime.now().year
+        return current or datetime.now().year
     if re.fullmatch(r"\d{4}", val):
         return int(val)
     if re.fullmatch(r"\d{2}", val):
@@ -86,60 +87,114 @@ EXPLICIT_RE = re.compile(
 
 YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
 
+# every pattern above needs a digit run, so the extractor only scans for those
+DIGITS_RE = re.compile(r"\d+")
+
 # ── main extractors ───────────────────────────────────────────────────────────
 
+@dataclass
+class ExperienceResult:
+    years: float
+    source: str  # "explicit", "intervals", "years" or "none"
+    # (start_char, end_char, start_month, end_month) for every valid date range, unmerged;
+    # offsets refer to the NFKC-normalized text
+    ranges: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    intervals: List[Tuple[int, int]] = field(default_factory=list)  # merged month indexes
+
+def _range_months(sm: str, sy: str, em: str, ey: str, current: int) -> Optional[Tuple[int, int]]:
+    syi = _to_year(sy, current)
+    smi = _to_month(sm)
+    eyi = _to_year(ey, current)
+    emi = _to_month(em)
+    if syi and smi and eyi and emi:
+        s = _to_index(syi, smi)
+        e = _to_index(eyi, emi)
+        if e > s:
+            return s, e
+    return None
+
+def _month_word_start(T: str, digits_at: int) -> Optional[int]:
+    # where NAME_RANGE_RE could start for a year beginning at `digits_at`: back over the
+    # whitespace, then over at most 9 letters of the preceding word
+    j = digits_at
+    while j > 0 and T[j - 1].isspace():
+        j -= 1
+    if j == digits_at:
+        return None
+    k = j
+    while k > 0 and j - k < 9 and T[k - 1].isascii() and T[k - 1].isalpha():
+        k -= 1
+    return k if j - k >= 3 else None
+
+def _scan(
+    T: str, current: int
+) -> Tuple[Optional[float], List[Tuple[int, int, int, int]], List[int]]:
+    """One pass over the digit runs of normalized text.
+
+    Every pattern is anchored on a digit run, so instead of four full-text regex scans the
+    text is walked once and each pattern is tried with an anchored `match` at the few places
+    it can start. Results are identical to running the four scans independently.
+    """
+    explicit: Optional[float] = None
+    ranges: List[Tuple[int, int, int, int]] = []
+    years: List[int] = []
+    name_end = num_end = 0  # emulate finditer's non-overlapping matches per pattern
+
+    def add(m: re.Match) -> None:
+        span = _range_months(*m.group("sm", "sy", "em", "ey"), current)
+        if span:
+            ranges.append((m.start(), m.end(), span[0], span[1]))
+
+    for d in DIGITS_RE.finditer(T):
+        a, b = d.span()
+        if b - a == 4 and T[a:a + 2] in ("19", "20"):
+            years.append(int(T[a:b]))
+        if explicit is None:
+            m = EXPLICIT_RE.match(T, a)
+            if m:
+                explicit = float(m.group(1))
+        start = _month_word_start(T, a)
+        if start is not None and start >= name_end:
+            m = NAME_RANGE_RE.match(T, start)
+            if m:
+                name_end = m.end()
+                add(m)
+        for start in (b - 2, b - 1):
+            if start >= max(a, num_end):
+                m = NUM_RANGE_RE.match(T, start)
+                if m:
+                    num_end = m.end()
+                    add(m)
+                    break
+    return explicit, ranges, years
+
 def _collect_intervals(text: str) -> List[Tuple[int, int]]:
-    T = _norm(text)
-    intervals: List[Tuple[int, int]] = []
-
-    # Month name ranges
-    for m in NAME_RANGE_RE.finditer(T):
-        sm, sy, em, ey = m.group("sm", "sy", "em", "ey")
-        syi = _to_year(sy); smi = _to_month(sm)
-        eyi = _to_year(ey); emi = _to_month(em)
-        if syi and smi and eyi and emi:
-            s = _to_index(syi, smi)
-            e = _to_index(eyi, emi)
-            if e > s:
-                intervals.append((s, e))
-
-    # Numeric ranges
-    for m in NUM_RANGE_RE.finditer(T):
-        sm, sy, em, ey = m.group("sm", "sy", "em", "ey")
-        syi = _to_year(sy); smi = _to_month(sm)
-        eyi = _to_year(ey); emi = _to_month(em)
-        if syi and smi and eyi and emi:
-            s = _to_index(syi, smi)
-            e = _to_index(eyi, emi)
-            if e > s:
-                intervals.append((s, e))
-
-    return _merge(intervals)
+    _, ranges, _ = _scan(_norm(text), datetime.now().year)
+    return _merge([(s, e) for _, _, s, e in ranges])
 
-def estimate_experience_years(text: str) -> float:
-    """Month-accurate estimation of total experience (merged, no double-count)."""
-    T = _norm(text)
+def extract_experience(text: str, now: Optional[datetime] = None) -> ExperienceResult:
+    """Years of experience plus the date ranges behind them, from a single regex pass."""
+    current = (now or datetime.now()).year
+    explicit, ranges, years = _scan(_norm(text), current)
+    intervals = _merge([(s, e) for _, _, s, e in ranges])
 
     # Prefer explicit statements if present
-    m = EXPLICIT_RE.search(T)
-    if m:
-        try:
-            v = float(m.group(1))
-            return max(0.0, min(v, 40.0))
-        except Exception:
-            pass
+    if explicit is not None:
+        return ExperienceResult(max(0.0, min(explicit, 40.0)), "explicit", ranges, intervals)
 
-    intervals = _collect_intervals(T)
     if intervals:
         months = sum(e - s for (s, e) in intervals)  # already merged
-        return round(months / 12.0, 2)
+        return ExperienceResult(round(months / 12.0, 2), "intervals", ranges, intervals)
 
     # Fallback: span between earliest and latest year mention
-    years = [int(y) for y in YEAR_RE.findall(T)]
-    years = [y for y in years if 1980 <= y <= datetime.now().year]
+    years = [y for y in years if 1980 <= y <= current]
     if len(years) >= 2:
-        return float(max(years) - min(years))
-    return 0.0
+        return ExperienceResult(float(max(years) - min(years)), "years", ranges, intervals)
+    return ExperienceResult(0.0, "none", ranges, intervals)
+
+def estimate_experience_years(text: str) -> float:
+    """Month-accurate estimation of total experience (merged, no double-count)."""
+    return extract_experience(text).years
 
 def target_years_from_jd(jd_text: str, default: float = 3.0) -> float:
     T = _norm(jd_text or "")
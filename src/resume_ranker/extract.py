@@ -1,11 +1,53 @@
 
+from contextlib import contextmanager
+from io import BytesIO, StringIO
 from pathlib import Path
-from pdfminer.high_level import extract_text as pdf_text
+from typing import BinaryIO, Iterator, Optional, Union
+
 from docx import Document
 
-def from_pdf(path: Path) -> str:
-    return pdf_text(str(path))
+# a file on disk, its bytes, or an open binary file (e.g. an upload)
+Source = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+@contextmanager
+def open_source(src: Source) -> Iterator[BinaryIO]:
+    """Binary file object for `src`; paths are opened (and closed), file objects passed through."""
+    if isinstance(src, (str, Path)):
+        with open(src, "rb") as fp:
+            yield fp
+    elif isinstance(src, (bytes, bytearray, memoryview)):
+        yield BytesIO(src)
+    else:
+        yield src
+
+def from_pdf(src: Source, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """pdfminer's extract_text, one page at a time so it can stop early.
+
+    Reading ends after `max_pages` pages or on the page that brings the text past
+    `max_chars`; with neither set the output equals `pdfminer.high_level.extract_text`.
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    with open_source(src) as fp, StringIO() as out:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, out, laparams=LAParams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, maxpages=max_pages or 0, caching=True):
+            interpreter.process_page(page)
+            if max_chars and out.tell() >= max_chars:
+                break
+        return out.getvalue()
 
-def from_docx(path: Path) -> str:
-    doc = Document(str(path))
-    return "\n".join(p.text for p in doc.paragraphs)
+def from_docx(src: Source, max_chars: Optional[int] = None) -> str:
+    with open_source(src) as fp:
+        doc = Document(fp)
+    parts, n = [], 0
+    for p in doc.paragraphs:
+        parts.append(p.text)
+        n += len(p.text) + 1
+        if max_chars and n >= max_chars:
+            break
+    return "\n".join(parts)
@@ -0,0 +1,325 @@
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .context import JobContext
+from .experience import estimate_experience_years
+from .skills import get_matcher
+
+FORMAT_VERSION = 1
+
+# per-candidate columns stored as one .npy file each
+_COLUMNS = ("keys", "names", "hashes", "exp_years", "skill_bits", "alive", "ivf_assign")
+
+
+class CandidateIndex:
+    """On-disk candidate index: a memory-mapped float32 embedding matrix plus columnar metadata.
+
+    Layout of the index folder:
+
+    - ``meta.json``      model name, dimension, skill vocabulary, row count, IVF settings
+    - ``vectors.f32``    row-major float32 matrix, appended in place on ``add``
+    - ``<column>.npy``   one file per metadata column (keys, names, content hashes,
+                         experience years, packed skill-hit bits, tombstones, IVF lists)
+    - ``ivf_centroids.npy`` coarse centroids when an approximate index was trained
+
+    Skills are stored as hit bits against the vocabulary fixed at build time, so queries can
+    use any subset of it. Removal sets a tombstone; ``compact`` rewrites without them.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.meta = json.loads((self.root / "meta.json").read_text())
+        self.cols: Dict[str, np.ndarray] = {
+            c: np.load(self.root / f"{c}.npy", allow_pickle=False) for c in _COLUMNS
+        }
+        cent = self.root / "ivf_centroids.npy"
+        self.centroids: Optional[np.ndarray] = np.load(cent) if cent.exists() else None
+
+    # ── creation & persistence ────────────────────────────────────────────────
+
+    @classmethod
+    def create(cls, root: Path, skills: Sequence[str], model: str, dim: int) -> "CandidateIndex":
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        vocab = list(dict.fromkeys(s.lower() for s in skills))
+        meta = {"version": FORMAT_VERSION, "model": model, "dim": dim, "skills": vocab, "rows": 0}
+        (root / "meta.json").write_text(json.dumps(meta, indent=2))
+        (root / "vectors.f32").write_bytes(b"")
+        empty = {
+            "keys": np.array([], dtype=str),
+            "names": np.array([], dtype=str),
+            "hashes": np.array([], dtype=str),
+            "exp_years": np.zeros(0, dtype=np.float32),
+            "skill_bits": np.zeros((0, (len(vocab) + 7) // 8), dtype=np.uint8),
+            "alive": np.zeros(0, dtype=bool),
+            "ivf_assign": np.zeros(0, dtype=np.int32),
+        }
+        for c, arr in empty.items():
+            np.save(root / f"{c}.npy", arr)
+        (root / "ivf_centroids.npy").unlink(missing_ok=True)
+        return cls(root)
+
+    def _save(self) -> None:
+        self.meta["rows"] = int(len(self.cols["keys"]))
+        for c in _COLUMNS:
+            np.save(self.root / f"{c}.npy", self.cols[c])
+        (self.root / "meta.json").write_text(json.dumps(self.meta, indent=2))
+
+    def vectors(self) -> np.ndarray:
+        n, d = self.meta["rows"], self.meta["dim"]
+        if n == 0:
+            return np.zeros((0, d), dtype=np.float32)
+        return np.memmap(self.root / "vectors.f32", dtype=np.float32, mode="r", shape=(n, d))
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self.meta["skills"])
+
+    def __len__(self) -> int:
+        return int(self.cols["alive"].sum())
+
+    # ── mutation ──────────────────────────────────────────────────────────────
+
+    def add(
+        self,
+        items: Iterable[Tuple[str, str, str]],
+        cfg: Config,
+        store=None,
+    ) -> Tuple[int, int]:
+        """Add (key, name, text) candidates; returns (added, unchanged).
+
+        A key already present with the same text hash is skipped; with a different hash the
+        old row is tombstoned and the new one appended.
+        """
+        from .cache import text_hash
+        from .embed import encode
+
+        matcher = get_matcher(tuple(self.skills))
+        # drop bytes past the last committed row (an interrupted add) before appending
+        with open(self.root / "vectors.f32", "r+b") as f:
+            f.truncate(self.meta["rows"] * self.meta["dim"] * 4)
+        live = {k: i for i, k in enumerate(self.cols["keys"]) if self.cols["alive"][i]}
+        n0 = len(self.cols["keys"])
+        pos = {s: j for j, s in enumerate(self.skills)}
+        chunks: Dict[str, List[np.ndarray]] = {c: [] for c in _COLUMNS}
+        pending_alive: List[bool] = []
+        unchanged = 0
+        it = iter(items)
+        with open(self.root / "vectors.f32", "ab") as f:
+            while batch := list(itertools.islice(it, cfg.embed_batch_size)):
+                fresh = []
+                for key, name, text in batch:
+                    h = text_hash(text)
+                    old = live.get(key)
+                    if old is not None and old < n0 and self.cols["hashes"][old] == h:
+                        unchanged += 1
+                        continue
+                    if old is not None and old < n0:
+                        self.cols["alive"][old] = False
+                    elif old is not None:
+                        pending_alive[old - n0] = False
+                    live[key] = n0 + len(pending_alive)
+                    pending_alive.append(True)
+                    fresh.append((key, name, h, text))
+                if not fresh:
+                    continue
+                vecs = encode([t for *_, t in fresh], cfg.embed_batch_size, store=store)
+                f.write(np.ascontiguousarray(vecs, dtype=np.float32).tobytes())
+                bits = np.zeros((len(fresh), len(self.skills)), dtype=bool)
+                for i, (*_, text) in enumerate(fresh):
+                    for hit in matcher.match(text).hits:
+                        bits[i, pos[hit.skill]] = True
+                chunks["keys"].append(np.array([k for k, *_ in fresh], dtype=str))
+                chunks["names"].append(np.array([n for _, n, *_ in fresh], dtype=str))
+                chunks["hashes"].append(np.array([h for _, _, h, _ in fresh], dtype=str))
+                chunks["exp_years"].append(
+                    np.array([estimate_experience_years(t) for *_, t in fresh], np.float32)
+                )
+                chunks["skill_bits"].append(np.packbits(bits, axis=1))
+                chunks["ivf_assign"].append(
+                    np.argmax(vecs @ self.centroids.T, axis=1).astype(np.int32)
+                    if self.centroids is not None
+                    else np.full(len(fresh), -1, dtype=np.int32)
+                )
+        if pending_alive:
+            chunks["alive"].append(np.array(pending_alive, dtype=bool))
+            for c in _COLUMNS:
+                self.cols[c] = np.concatenate([self.cols[c], *chunks[c]])
+        self._save()
+        return len(pending_alive), unchanged
+
+    def remove(self, keys_or_names: Iterable[str]) -> int:
+        targets = set(keys_or_names)
+        hit = np.isin(self.cols["keys"], list(targets))
+        hit |= np.isin(self.cols["names"], list(targets))
+        hit &= self.cols["alive"]
+        self.cols["alive"][hit] = False
+        self._save()
+        return int(hit.sum())
+
+    def compact(self) -> int:
+        """Drop tombstoned rows from the matrix and every column; returns rows dropped."""
+        keep = np.flatnonzero(self.cols["alive"])
+        dropped = len(self.cols["alive"]) - len(keep)
+        if dropped == 0:
+            return 0
+        vecs = np.array(self.vectors()[keep])
+        (self.root / "vectors.f32").write_bytes(vecs.tobytes())
+        for c in _COLUMNS:
+            self.cols[c] = self.cols[c][keep]
+        self._save()
+        return dropped
+
+    def train_ivf(self, nlist: int = 0, seed: int = 0) -> int:
+        """Cluster the live vectors into `nlist` inverted lists (0 = about sqrt(rows))."""
+        from sklearn.cluster import MiniBatchKMeans
+
+        alive = np.flatnonzero(self.cols["alive"])
+        nlist = nlist or max(1, int(np.sqrt(len(alive))))
+        nlist = min(nlist, len(alive))
+        if nlist == 0:
+            return 0
+        vecs = self.vectors()
+        km = MiniBatchKMeans(n_clusters=nlist, random_state=seed, n_init=3, batch_size=4096)
+        km.fit(np.asarray(vecs[alive]))
+        cent = km.cluster_centers_.astype(np.float32)
+        cent /= np.maximum(np.linalg.norm(cent, axis=1, keepdims=True), 1e-12)
+        assign = np.full(len(self.cols["alive"]), -1, dtype=np.int32)
+        for i in range(0, len(alive), 65536):
+            rows = alive[i : i + 65536]
+            assign[rows] = np.argmax(np.asarray(vecs[rows]) @ cent.T, axis=1)
+        self.centroids = cent
+        self.cols["ivf_assign"] = assign
+        np.save(self.root / "ivf_centroids.npy", cent)
+        self.meta["ivf_nlist"] = nlist
+        self._save()
+        return nlist
+
+    # ── query ─────────────────────────────────────────────────────────────────
+
+    def skill_scores(self, skills: Sequence[str]) -> np.ndarray:
+        pos = {s: j for j, s in enumerate(self.skills)}
+        missing = [s for s in skills if s.lower() not in pos]
+        if missing:
+            raise ValueError(
+                f"skills not in the index vocabulary: {', '.join(missing)}; "
+                "rebuild the index with them in Config.skills"
+            )
+        packed = self.cols["skill_bits"]
+        hits = np.zeros(len(packed), dtype=np.int32)
+        for s in skills:
+            j = pos[s.lower()]
+            hits += (packed[:, j // 8] >> (7 - j % 8)) & 1
+        return hits / max(len(skills), 1)
+
+    def search(
+        self,
+        jd_text: str,
+        cfg: Config,
+        top_k: int = 10,
+        approximate: bool = False,
+        nprobe: int = 8,
+        store=None,
+    ) -> pd.DataFrame:
+        """Rank indexed candidates against a JD; same columns as `pipeline.rank`.
+
+        Exact mode scores every live row with one mat-vec over the memory-mapped matrix.
+        Approximate mode only visits the `nprobe` inverted lists closest to the JD.
+        """
+        from .embed import configure, model_id
+        from .pipeline import COLUMNS
+
+        configure(cfg)
+        if self.meta["model"] != model_id():
+            raise ValueError(f"index was built with {self.meta['model']}, not {model_id()}")
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        rows = np.flatnonzero(self.cols["alive"])
+        if approximate:
+            if self.centroids is None:
+                raise ValueError("index has no IVF lists; run 'index train' first")
+            probe = np.argsort(-(self.centroids @ ctx.embedding))[:nprobe]
+            rows = rows[np.isin(self.cols["ivf_assign"][rows], probe)]
+        if len(rows) == 0:
+            return pd.DataFrame(columns=COLUMNS)
+        vecs = self.vectors()
+        sub = vecs if len(rows) == len(vecs) else vecs[rows]  # no gather copy when all live
+        s_sim = (np.asarray(sub) @ ctx.embedding).astype(np.float64)
+        s_skills = self.skill_scores(cfg.skills)[rows]
+        years = self.cols["exp_years"][rows].astype(np.float64)
+        tgt = ctx.target_years
+        s_exp = np.minimum(years / tgt, 1.0) if tgt > 0 else np.zeros_like(years)
+        w = cfg.weights
+        total = w.w_skills * s_skills + w.w_sim * s_sim + w.w_exp * s_exp
+        k = min(top_k, len(rows))
+        part = np.argpartition(-total, k - 1)[:k]
+        order = part[np.argsort(-total[part], kind="stable")]
+        return pd.DataFrame(
+            {
+                "candidate": self.cols["names"][rows[order]],
+                "skills": s_skills[order],
+                "sim": s_sim[order],
+                "exp_score": s_exp[order],
+                "exp_years": np.round(years[order], 2),
+                "exp_target": tgt,
+                "total": total[order],
+            },
+            columns=COLUMNS,
+        )
+
+    def info(self) -> Dict[str, object]:
+        return {
+            "path": str(self.root),
+            "model": self.meta["model"],
+            "dim": self.meta["dim"],
+            "rows": self.meta["rows"],
+            "live": len(self),
+            "skills": len(self.skills),
+            "ivf_lists": self.meta.get("ivf_nlist", 0) if self.centroids is not None else 0,
+        }
+
+
+def build_index(
+    root: Path,
+    resumes_dir: Path,
+    cfg: Optional[Config] = None,
+    stats=None,
+) -> CandidateIndex:
+    """Create (or extend) an index at `root` from every resume under `resumes_dir`."""
+    from .cache import TextCache
+    from .embed import configure, embedding_dim, model_id, open_store
+    from .budget import ExtractLimits
+    from .io import iter_resume_files
+
+    cfg = cfg or Config()
+    configure(cfg)
+    root = Path(root)
+    if (root / "meta.json").exists():
+        idx = CandidateIndex(root)
+        if idx.meta["model"] != model_id():
+            raise ValueError(f"index was built with {idx.meta['model']}, not {model_id()}")
+    else:
+        dim = embedding_dim()
+        idx = CandidateIndex.create(root, cfg.skills, model_id(), dim)
+    text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        files = iter_resume_files(
+            resumes_dir,
+            workers=cfg.extract_workers,
+            cache=text_cache,
+            stats=stats,
+            limits=ExtractLimits.from_config(cfg),
+        )
+        idx.add(((str(p.resolve()), p.stem, text) for p, text in files), cfg, store=store)
+    finally:
+        if text_cache is not None:
+            text_cache.close()
+        if store is not None:
+            store.close()
+    return idx
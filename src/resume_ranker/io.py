@@ -1,27 +1,250 @@
 
+import hashlib
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
-from .extract import from_pdf, from_docx
+from typing import (
+    TYPE_CHECKING, Dict, Iterable, Iterator, List, MutableMapping, Optional, Sequence, Tuple,
+)
+from . import trace
+from .budget import BudgetedPool, ExtractError, ExtractLimits
+from .extract import Source, from_pdf, from_docx, open_source
+
+if TYPE_CHECKING:
+    from .cache import TextCache
 
 SUPPORTED = (".pdf", ".docx", ".txt")
 
-def load_jd_text(path: Path) -> str:
-    if path.suffix.lower() == ".pdf":
-        return from_pdf(path)
-    if path.suffix.lower() == ".docx":
-        return from_docx(path)
-    return path.read_text(encoding="utf-8")
-
-def load_resumes(folder: Path) -> List[Tuple[str, str]]:
-    items = []
-    for p in folder.glob("**/*"):
-        if p.suffix.lower() not in SUPPORTED:
-            continue
-        if p.suffix.lower() == ".pdf":
-            text = from_pdf(p)
-        elif p.suffix.lower() == ".docx":
-            text = from_docx(p)
+@dataclass
+class LoadStats:
+    """Counters collected while loading a resume folder."""
+    files: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    errors: List[ExtractError] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # path -> extraction seconds
+    duplicates: int = 0       # near-duplicates folded into an earlier resume
+    duplicate_chars: int = 0  # their text, which skipped embedding and scoring
+
+    def summary(self) -> str:
+        msg = (
+            f"Loaded {self.files} files "
+            f"(extraction cache: {self.cache_hits} hits, {self.cache_misses} misses)"
+        )
+        if self.errors:
+            msg += f"; {len(self.errors)} failed"
+        if self.duplicates:
+            msg += (
+                f"; {self.duplicates} near-duplicates folded "
+                f"({self.duplicate_chars:,} chars not embedded or scored)"
+            )
+        return msg
+
+    def slowest(self, n: int = 5) -> List[Tuple[str, float]]:
+        return sorted(self.timings.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+def load_jd_text(path: Source, name: Optional[str] = None) -> str:
+    return extract_file(path, name=name)
+
+def extract_file(
+    p: Source,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    name: Optional[str] = None,
+) -> str:
+    """Text of a path, of raw bytes or of a binary file object.
+
+    The format comes from the suffix of `name`, else of the path (or the file object's
+    `.name`); anything that is not .pdf or .docx is read as UTF-8 text.
+    """
+    if name is None:
+        name = str(p) if isinstance(p, (str, Path)) else getattr(p, "name", "") or ""
+    suffix = Path(name).suffix
+    if suffix.lower() == ".pdf":
+        return from_pdf(p, max_pages=max_pages, max_chars=max_chars)
+    if suffix.lower() == ".docx":
+        return from_docx(p, max_chars=max_chars)
+    if isinstance(p, (str, Path)):
+        return Path(p).read_text(encoding="utf-8")
+    with open_source(p) as fp:
+        # universal newlines, as read_text gives for the same file on disk
+        return fp.read().decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+def _extract_timed(
+    p: Path, limits: ExtractLimits
+) -> Tuple[Optional[str], Optional[ExtractError], float]:
+    t0 = time.perf_counter()
+    try:
+        text = extract_file(p, max_pages=limits.max_pages, max_chars=limits.max_chars)
+        return text, None, time.perf_counter() - t0
+    except Exception as e:
+        dt = time.perf_counter() - t0
+        return None, ExtractError(str(p), "error", f"{type(e).__name__}: {e}", dt), dt
+
+def list_resume_files(folder: Path) -> List[Path]:
+    return sorted(p for p in folder.glob("**/*") if p.suffix.lower() in SUPPORTED)
+
+def iter_resume_files(
+    folder: Optional[Path],
+    workers: int = 1,
+    cache: Optional["TextCache"] = None,
+    stats: Optional[LoadStats] = None,
+    files: Optional[Sequence[Path]] = None,
+    limits: Optional[ExtractLimits] = None,
+) -> Iterator[Tuple[Path, str]]:
+    """Yield (path, text) as files finish extracting.
+
+    Cache hits are served first from the main process; misses are parsed in a pool of
+    `workers` processes (0 = one per CPU) with a bounded number of files in flight, so
+    consumers can start scoring while the rest of the folder is still being parsed.
+    `files` replaces the folder listing when the caller has already chosen the files.
+    Files that fail, or overrun `limits`, are skipped and recorded in `stats.errors`;
+    truncating limits bypass the cache so partial text is never stored as the full text.
+    """
+    limits = limits or ExtractLimits()
+    if limits.truncates:
+        cache = None
+    hits0, misses0 = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    todo: List[Tuple[Path, Optional[str]]] = []
+    n = 0
+    try:
+        for p in (files if files is not None else list_resume_files(folder)):
+            if cache is not None and p.suffix.lower() != ".txt":
+                text, h = cache.lookup(p)
+                if text is not None:
+                    trace.count("extract.cache_hit")
+                    n += 1
+                    yield p, text
+                    continue
+                todo.append((p, h))
+            else:
+                todo.append((p, None))
+
+        workers = workers or os.cpu_count() or 1
+        for p, h, text, err, secs in _extract_all(todo, workers, limits):
+            trace.record("extract", secs, file=p.stem, path=str(p))
+            if stats is not None:
+                stats.timings[str(p)] = secs
+            if err is not None:
+                trace.count(f"extract.{err.kind}")
+                if stats is not None:
+                    stats.errors.append(err)
+                continue
+            if cache is not None and h is not None:
+                cache.store(p, h, text)
+            n += 1
+            yield p, text
+    finally:
+        if stats is not None:
+            stats.files += n
+            if cache is not None:
+                stats.cache_hits += cache.hits - hits0
+                stats.cache_misses += cache.misses - misses0
+
+def iter_resumes(
+    folder: Path,
+    workers: int = 1,
+    cache: Optional["TextCache"] = None,
+    stats: Optional[LoadStats] = None,
+    limits: Optional[ExtractLimits] = None,
+    files: Optional[Sequence[Path]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (name, text) as files finish extracting; see iter_resume_files."""
+    for p, text in iter_resume_files(folder, workers=workers, cache=cache, stats=stats,
+                                     files=files, limits=limits):
+        yield p.stem, text
+
+def iter_documents(
+    docs: Iterable[Tuple[str, Source]],
+    stats: Optional[LoadStats] = None,
+    limits: Optional[ExtractLimits] = None,
+    memo: Optional[MutableMapping[str, str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (name, text) for in-memory (filename, bytes or file object) pairs.
+
+    Extraction runs in this process, one document at a time, so callers can show results
+    as they come. `memo` maps the SHA-256 of a document's bytes to its text: pass the same
+    dict again (e.g. one per app session) and unchanged uploads are not parsed twice.
+    Failures are skipped and recorded in `stats.errors`; `limits.timeout` and
+    `limits.max_memory_mb` need worker processes and are not applied here.
+    """
+    limits = limits or ExtractLimits()
+    if limits.truncates:
+        memo = None
+    for filename, src in docs:
+        data = src if isinstance(src, (bytes, bytearray, memoryview)) else None
+        if data is None:
+            with open_source(src) as fp:
+                data = fp.read()
+        h = hashlib.sha256(data).hexdigest()
+        text = memo.get(h) if memo is not None else None
+        if text is not None:
+            trace.count("extract.cache_hit")
+            if stats is not None:
+                stats.cache_hits += 1
         else:
-            text = p.read_text(encoding="utf-8")
-        items.append((p.stem, text))
-    return items
+            t0 = time.perf_counter()
+            err = None
+            try:
+                text = extract_file(data, limits.max_pages, limits.max_chars, name=filename)
+            except Exception as e:
+                err = ExtractError(filename, "error", f"{type(e).__name__}: {e}", 0.0)
+            secs = time.perf_counter() - t0
+            trace.record("extract", secs, file=Path(filename).stem, path=filename)
+            if stats is not None:
+                stats.timings[filename] = secs
+                if memo is not None:
+                    stats.cache_misses += 1
+            if err is not None:
+                err.seconds = secs
+                trace.count(f"extract.{err.kind}")
+                if stats is not None:
+                    stats.errors.append(err)
+                continue
+            if memo is not None:
+                memo[h] = text
+        if stats is not None:
+            stats.files += 1
+        yield Path(filename).stem, text
+
+def _extract_all(
+    todo: List[Tuple[Path, Optional[str]]], workers: int, limits: ExtractLimits
+) -> Iterator[Tuple[Path, Optional[str], Optional[str], Optional[ExtractError], float]]:
+    if limits.isolated and todo:
+        with BudgetedPool(min(workers, len(todo)), limits) as pool:
+            yield from pool.run(todo)
+        return
+    if workers <= 1 or len(todo) <= 1:
+        for p, h in todo:
+            yield (p, h, *_extract_timed(p, limits))
+        return
+    # spawn: the parent may already hold torch/OpenMP threads, which do not survive fork
+    ctx = multiprocessing.get_context("spawn")
+    queue = iter(todo)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+        running: Dict[Future, Tuple[Path, Optional[str]]] = {}
+        for p, h in itertools.islice(queue, workers * 4):
+            running[ex.submit(_extract_timed, p, limits)] = (p, h)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                p, h = running.pop(fut)
+                for nxt in itertools.islice(queue, 1):
+                    running[ex.submit(_extract_timed, nxt[0], limits)] = nxt
+                yield (p, h, *fut.result())
+
+def load_resumes(
+    folder: Path,
+    cache: Optional["TextCache"] = None,
+    stats: Optional[LoadStats] = None,
+    workers: int = 1,
+    limits: Optional[ExtractLimits] = None,
+    files: Optional[Sequence[Path]] = None,
+) -> List[Tuple[str, str]]:
+    return list(iter_resumes(
+        folder, workers=workers, cache=cache, stats=stats, limits=limits, files=files
+    ))
@@ -0,0 +1,41 @@
+from typing import Sequence
+
+import numpy as np
+
+from .skills import TOKEN_RE
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def bm25_scores(
+    query: str, texts: Sequence[str], k1: float = BM25_K1, b: float = BM25_B
+) -> np.ndarray:
+    """Okapi BM25 of every text against `query`, scaled so the best text scores 1.
+
+    Term counts come from a stateless HashingVectorizer (no vocabulary to build); only the
+    columns of the query's terms are touched after the one sparse transform.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    if not len(texts):
+        return np.zeros(0)
+    hv = HashingVectorizer(
+        n_features=2**20,
+        token_pattern=TOKEN_RE.pattern,
+        alternate_sign=False,
+        norm=None,
+    )
+    X = hv.transform(list(texts)).tocsc()
+    terms = hv.transform([query]).indices
+    dl = np.asarray(X.sum(axis=1)).ravel()
+    avgdl = max(dl.mean(), 1e-9)
+    Xq = X[:, terms].tocoo()
+    df = np.bincount(Xq.col, minlength=len(terms))
+    n = len(texts)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    tf = Xq.data
+    part = idf[Xq.col] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl[Xq.row] / avgdl))
+    scores = np.bincount(Xq.row, weights=part, minlength=n)
+    top = scores.max()
+    return scores / top if top > 0 else scores
@@ -0,0 +1,109 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .config import Config
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class ManifestStats:
+    reused: int = 0
+    scored: int = 0
+    removed: int = 0
+
+    def summary(self) -> str:
+        return f"Manifest: {self.reused} reused, {self.scored} scored, {self.removed} removed"
+
+
+def manifest_key(jd_text: str, cfg: Config, model: str) -> str:
+    """Identity of everything the per-component scores depend on (weights are not part of it).
+
+    The extraction limits change the text that is scored, and dedup changes which files
+    become candidates, so both are part of it too.
+    """
+    payload = json.dumps(
+        {
+            "jd": hashlib.sha256(jd_text.encode("utf-8", "surrogatepass")).hexdigest(),
+            "model": model,
+            "skills": list(cfg.skills),
+            "default_target": cfg.default_exp_target_years,
+            "max_pages": cfg.extract_max_pages,
+            "max_chars": cfg.extract_max_chars,
+            "dedup": cfg.dedup and cfg.dedup_threshold,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Manifest:
+    """Per-file record of previously scored resumes for one JD + config.
+
+    Each entry maps a resolved file path to its size, mtime, content hash, candidate name
+    and per-component scores. Totals are recomputed from the components on every run, so
+    changing only the weights never forces a re-score. A file's size, mtime and hash are
+    taken by `diff`, before it is extracted: if it changes while being scored, the entry
+    describes the older bytes and the next run scores it again. A changed file loses its
+    entry in `diff`, so if it then fails to extract it drops out of the ranking.
+    """
+
+    def __init__(self, path: Path, key: str):
+        self.path = Path(path)
+        self.key = key
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False  # entries differ from what is on disk
+        self._pending: Dict[str, dict] = {}  # identity of each file `diff` sent to be scored
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            if data.get("version") == FORMAT_VERSION and data.get("key") == key:
+                self.entries = data["entries"]
+
+    def diff(self, files: List[Path]) -> Tuple[List[Path], List[str], int]:
+        """Split the current listing into (to_score, removed_keys, reused_count)."""
+        seen, todo, reused = set(), [], 0
+        for p in files:
+            k = str(p.resolve())
+            seen.add(k)
+            e = self.entries.get(k)
+            st = p.stat()
+            if e and e["size"] == st.st_size and e["mtime_ns"] == st.st_mtime_ns:
+                reused += 1
+                continue
+            ident = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "hash": hashlib.sha256(p.read_bytes()).hexdigest(),
+            }
+            if e and e["hash"] == ident["hash"]:
+                e["size"], e["mtime_ns"] = st.st_size, st.st_mtime_ns  # touched, not changed
+                self.dirty = True
+                reused += 1
+                continue
+            if e:
+                del self.entries[k]  # a failed re-extraction must not leave the old scores
+                self.dirty = True
+            self._pending[k] = ident
+            todo.append(p)
+        removed = [k for k in self.entries if k not in seen]
+        for k in removed:
+            del self.entries[k]
+        self.dirty = self.dirty or bool(removed)
+        return todo, removed, reused
+
+    def record(self, p: Path, name: str, scores: dict) -> None:
+        """Store the scores of a file returned by `diff`, under the identity taken there."""
+        k = str(p.resolve())
+        self.entries[k] = {"name": name, **self._pending.pop(k), **scores}
+        self.dirty = True
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        data = {"version": FORMAT_VERSION, "key": self.key, "entries": self.entries}
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self.path)
+        self.dirty = False
@@ -1,27 +1,800 @@
 
-from dataclasses import asdict
+import heapq
+import itertools
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Set, Tuple
+import numpy as np
 import pandas as pd
+from . import trace
 from .config import Config
-from .io import load_jd_text, load_resumes
-from .rank import score_candidate
+from .embed import EncodeStats, configure, encode, model_id, open_store, similarity_matrix
+from .evidence import Evidence, EvidenceWriter, similar_sentences
+from .experience import ExperienceResult, estimate_experience_years, extract_experience
+from .budget import ExtractLimits
+from .cache import TextCache
+from .context import JobContext
+from .dedup import Deduper, dedup, dedup_stream, signature
+from .io import (
+    LoadStats, extract_file, iter_documents, iter_resume_files, iter_resumes, list_resume_files,
+    load_jd_text, load_resumes,
+)
+from .extract import Source
+from .manifest import Manifest, ManifestStats, manifest_key
+from .rank import ScoreBreakdown, score_candidate
+from .results import ScoreTable
+from .skills import SkillMatch
+from .shard import save_partial, shard_files
+from .sinks import COLUMNS, Batch, Sink, hit_bits
+from .stages import PipelineStats, Stage, run_stages
 
-def rank(jd_path: Path, resumes_dir: Path, top_k: int = 10, cfg: Config | None = None) -> pd.DataFrame:
+
+@dataclass
+class RankSummary:
+    """Constant-size statistics over every scored candidate (kept by the streaming path)."""
+    count: int = 0
+    total_sum: float = 0.0
+    total_min: float = float("inf")
+    total_max: float = float("-inf")
+    histogram: List[int] = field(default_factory=lambda: [0] * 10)  # totals in 0.1-wide bins
+
+    def add(self, total: float) -> None:
+        self.count += 1
+        self.total_sum += total
+        self.total_min = min(self.total_min, total)
+        self.total_max = max(self.total_max, total)
+        self.histogram[min(max(int(total * 10), 0), 9)] += 1
+
+    @property
+    def total_mean(self) -> float:
+        return self.total_sum / self.count if self.count else 0.0
+
+@dataclass
+class CascadeStats:
+    """What the cascade kept, and (optionally) how much of the full top-k it recovered."""
+    candidates: int = 0
+    shortlisted: int = 0
+    recall: float | None = None  # |cascade top-k & full top-k| / k, when checked
+
+    def summary(self) -> str:
+        msg = f"Cascade: embedded {self.shortlisted} of {self.candidates} candidates"
+        if self.recall is not None:
+            msg += f", recall@k vs full ranking {self.recall:.3f}"
+        return msg
+
+def shortlist_size(keep: float, n: int, top_k: int) -> int:
+    """`keep` <= 1 is a fraction of the corpus, otherwise a count; never below `top_k`."""
+    size = int(np.ceil(keep * n)) if keep <= 1 else int(keep)
+    return min(max(size, top_k), n)
+
+def _row(name: str, sb: ScoreBreakdown) -> dict:
+    return {
+        "candidate": name,
+        "skills": sb.skills,
+        "sim": sb.sim,
+        "exp_score": sb.exp_score,
+        "exp_years": round(sb.exp_years, 2),
+        "exp_target": sb.exp_target,
+        "total": sb.total,
+    }
+
+def _batched(items: Iterable[Tuple[Any, str]], n: int) -> Iterator[List[Tuple[Any, str]]]:
+    it = iter(items)
+    while batch := list(itertools.islice(it, n)):
+        yield batch
+
+def _skill_scores(
+    ctx: JobContext, resumes: Sequence[Tuple[str, str]], keep: List[SkillMatch] | None = None
+) -> np.ndarray:
+    """Skill scores; `keep` collects the full matches (hits and offsets) for evidence."""
+    out = np.empty(len(resumes), dtype=np.float64)
+    for i, (name, text) in enumerate(resumes):
+        with trace.span("skills", file=name):
+            m = ctx.matcher.match(text)
+        out[i] = m.score
+        if keep is not None:
+            keep.append(m)
+    return out
+
+def _experience_years(
+    resumes: Sequence[Tuple[str, str]], keep: List[ExperienceResult] | None = None
+) -> np.ndarray:
+    """Years of experience; `keep` collects the date ranges and merged intervals behind them."""
+    out = np.empty(len(resumes), dtype=np.float64)
+    for i, (name, text) in enumerate(resumes):
+        with trace.span("experience", file=name):
+            r = extract_experience(text)
+        out[i] = r.years
+        if keep is not None:
+            keep.append(r)
+    return out
+
+def _write_evidence(
+    writer: EvidenceWriter,
+    table: ScoreTable,
+    resumes: Sequence[Tuple[str, str]],
+    cfg: Config,
+    matches: Sequence[SkillMatch],
+    exps: Sequence[ExperienceResult],
+    sentences: Sequence[Sequence[Tuple[int, int, float]]],
+    aliases: Mapping[str, List[str]],
+) -> None:
+    """One evidence record per row of `table`, best first."""
+    with trace.span("evidence", rows=len(table)):
+        order = table.order()
+        cols = {k: v[order] for k, v in table.to_batch().items() if k != "candidate"}
+        for j, i in enumerate(order):
+            name, text = resumes[i]
+            writer.write(Evidence.build(
+                name, text, {k: v[j] for k, v in cols.items()}, cfg.skills,
+                matches[i], exps[i], sentences[i], aliases.get(name, ()),
+            ))
+
+def _alias_column(names: Iterable[str], aliases: Mapping[str, List[str]]) -> List[str]:
+    return ["; ".join(aliases.get(n, ())) for n in names]
+
+def _load_corpus(
+    resumes_dir: Path,
+    cfg: Config,
+    stats: LoadStats | None,
+    aliases: Dict[str, List[str]] | None = None,
+    files: Sequence[Path] | None = None,
+) -> List[Tuple[str, str]]:
+    """Every resume's (name, text); with `cfg.dedup`, near-duplicates go to `aliases`."""
+    text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+    try:
+        resumes = load_resumes(
+            resumes_dir, cache=text_cache, stats=stats, workers=cfg.extract_workers,
+            limits=ExtractLimits.from_config(cfg), files=files,
+        )
+        if cfg.dedup:
+            # in name order, so the copy kept does not depend on which file finished first
+            resumes = list(dedup(sorted(resumes), cfg.dedup_threshold, aliases=aliases,
+                                 stats=stats))
+        return resumes
+    finally:
+        if text_cache is not None:
+            text_cache.close()
+
+def rank_topk(
+    jd_path: Path,
+    resumes_dir: Path,
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    summary: RankSummary | None = None,
+    estats: EncodeStats | None = None,
+    aliases: Dict[str, List[str]] | None = None,
+) -> List[Tuple[str, ScoreBreakdown]]:
+    """Streaming ranking with memory bounded by `top_k` plus one embedding batch.
+
+    Resumes are pulled from the loader one batch at a time, embedded, scored and dropped;
+    only a min-heap of the best `top_k` breakdowns and a RankSummary survive. With
+    `cfg.dedup` the MinHash signatures (a few hundred bytes per resume) are kept too, and
+    so is every kept candidate's breakdown: a copy with a smaller name may still arrive and
+    take its place, so the top-k is only picked at the end.
+    """
+    cfg = cfg or Config()
+    jd_text = load_jd_text(jd_path)
+    configure(cfg)
+    text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    heap: List[Tuple[float, int, str, ScoreBreakdown]] = []
+    seq = itertools.count()
+    kept: Dict[str, ScoreBreakdown] = {}
+
+    def offer(name: str, sb: ScoreBreakdown) -> None:
+        if summary is not None:
+            summary.add(sb.total)
+        # ties keep the earlier candidate, like a stable sort
+        item = (sb.total, -next(seq), name, sb)
+        if len(heap) < top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        resumes = iter_resumes(
+            resumes_dir, workers=cfg.extract_workers, cache=text_cache, stats=stats,
+            limits=ExtractLimits.from_config(cfg),
+        )
+        if cfg.dedup:
+            items = dedup_stream(resumes, cfg.dedup_threshold, aliases=aliases, stats=stats)
+        else:
+            items = ((name, text, None) for name, text in resumes)
+        for batch in _batched(items, cfg.embed_batch_size):
+            vecs = encode([t for _, t, _ in batch], cfg.embed_batch_size, store=store,
+                          stats=estats)
+            sims = vecs @ ctx.embedding
+            for (name, text, replaced), sim in zip(batch, sims):
+                sb = score_candidate(text, jd_text, cfg, sim=float(sim), ctx=ctx)
+                if cfg.dedup:
+                    kept.pop(replaced, None)
+                    kept[name] = sb
+                else:
+                    offer(name, sb)
+            del batch
+        for name, sb in kept.items():
+            offer(name, sb)
+    finally:
+        if text_cache is not None:
+            text_cache.close()
+        if store is not None:
+            store.close()
+    return [(name, sb) for _, _, name, sb in sorted(heap, reverse=True)]
+
+def _score_batch(
+    ctx: JobContext,
+    batch: Sequence[Tuple[str, str]],
+    cfg: Config,
+    store=None,
+    estats: EncodeStats | None = None,
+    matches: List[SkillMatch] | None = None,
+) -> Tuple[ScoreTable, np.ndarray]:
+    """Score one batch of (name, text) in one model pass; returns the table and the vectors."""
+    vecs = encode([t for _, t in batch], cfg.embed_batch_size, store=store, stats=estats)
+    table = ScoreTable(
+        candidate=np.array([name for name, _ in batch], dtype=object),
+        skills=_skill_scores(ctx, batch, keep=matches),
+        sim=(vecs @ ctx.embedding).astype(np.float64),
+        exp_years=_experience_years(batch),
+        exp_target=np.full(len(batch), ctx.target_years, dtype=np.float64),
+        weights=cfg.weights,
+    )
+    return table, vecs
+
+def score_texts(
+    jd_text: str,
+    resumes: Iterable[Tuple[str, str]],
+    cfg: Config | None = None,
+    estats: EncodeStats | None = None,
+) -> Iterator[ScoreTable]:
+    """Score already-extracted (name, text) pairs, one ScoreTable per embedding batch.
+
+    Nothing touches the disk unless `cfg.cache_dir` enables the embedding cache, and each
+    batch is yielded as soon as it is scored, so a UI can show results while the rest of
+    the collection is still being extracted or embedded. `ScoreTable.concat` joins them.
+    """
+    cfg = cfg or Config()
+    configure(cfg)
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        for batch in _batched(resumes, cfg.embed_batch_size):
+            yield _score_batch(ctx, batch, cfg, store, estats)[0]
+    finally:
+        if store is not None:
+            store.close()
+
+def rank_documents(
+    jd: str | Source,
+    docs: Iterable[Tuple[str, Source]],
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    estats: EncodeStats | None = None,
+    jd_name: str | None = None,
+) -> pd.DataFrame:
+    """`rank` for an in-memory collection: (filename, bytes or file object) pairs.
+
+    `jd` is the JD text itself when a `str`; otherwise a path, bytes or file object whose
+    format `jd_name` (e.g. "jd.pdf") gives.
+    """
+    cfg = cfg or Config()
+    jd_text = jd if isinstance(jd, str) else load_jd_text(jd, name=jd_name)
+    resumes = iter_documents(docs, stats=stats, limits=ExtractLimits.from_config(cfg))
+    parts = list(score_texts(jd_text, resumes, cfg=cfg, estats=estats))
+    if not parts:
+        return pd.DataFrame(columns=COLUMNS)
+    with trace.span("sort", rows=sum(len(p) for p in parts)):
+        return ScoreTable.concat(parts).top_k(top_k).to_frame()
+
+def score_batches(
+    jd_path: Path,
+    resumes_dir: Path,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    estats: EncodeStats | None = None,
+    embeddings: bool = False,
+    skill_hits: bool = False,
+) -> Iterator[Batch]:
+    """Columnar batches of scored candidates (see `sinks`), in the order they were scored.
+
+    Memory stays at one embedding batch, as in `rank_topk`; `embeddings` and `skill_hits`
+    add the resume vectors and the matched-skill bitsets to every batch. With `cfg.dedup`
+    the kept copy of a group of near-duplicates is its smallest name, as everywhere else;
+    a smaller copy may still arrive and displace a scored one, and a yielded batch cannot
+    be taken back, so the batches are held and only yielded once every file is scored.
+    """
+    cfg = cfg or Config()
+    jd_text = load_jd_text(jd_path)
+    configure(cfg)
+    text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        resumes = iter_resumes(
+            resumes_dir, workers=cfg.extract_workers, cache=text_cache, stats=stats,
+            limits=ExtractLimits.from_config(cfg),
+        )
+        if cfg.dedup:
+            items = dedup_stream(resumes, cfg.dedup_threshold, stats=stats)
+        else:
+            items = ((name, text, None) for name, text in resumes)
+        held: List[Batch] = []
+        dropped: Set[str] = set()
+        for batch in _batched(items, cfg.embed_batch_size):
+            dropped.update(replaced for _, _, replaced in batch if replaced is not None)
+            matches: List[SkillMatch] = []
+            table, vecs = _score_batch(
+                ctx, [(name, text) for name, text, _ in batch], cfg, store, estats, matches
+            )
+            out = table.to_batch()
+            if embeddings:
+                out["embedding"] = vecs
+            if skill_hits:
+                out["skill_hits"] = np.stack([
+                    hit_bits(np.isin(ctx.matcher.skills, m.matched)) for m in matches
+                ])
+            if cfg.dedup:
+                held.append(out)
+            else:
+                yield out
+        for out in held:
+            keep = ~np.isin(out["candidate"], list(dropped))
+            if keep.any():
+                yield {k: v[keep] for k, v in out.items()}
+    finally:
+        if text_cache is not None:
+            text_cache.close()
+        if store is not None:
+            store.close()
+
+def rank_to_sink(
+    jd_path: Path,
+    resumes_dir: Path,
+    sink: Sink,
+    top_k: int | None = None,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    estats: EncodeStats | None = None,
+    embeddings: bool = False,
+    skill_hits: bool = False,
+) -> int:
+    """Write scored rows to `sink` without building a DataFrame; returns the rows written.
+
+    With `top_k=None` every candidate is written as soon as its batch is scored (unsorted).
+    Otherwise only the running best `top_k` rows are kept (ties by name, like
+    `ScoreTable.order`) and written, ranked, at the end.
+    """
+    batches = score_batches(jd_path, resumes_dir, cfg=cfg, stats=stats, estats=estats,
+                            embeddings=embeddings, skill_hits=skill_hits)
+    if top_k is None:
+        for b in batches:
+            sink.write(b)
+        return sink.rows
+    best: Batch | None = None
+    for b in batches:
+        if best is not None:
+            b = {k: np.concatenate([best[k], b[k]]) for k in b}
+        keep = np.lexsort((b["candidate"], -b["total"]))[:top_k]
+        best = {k: v[keep] for k, v in b.items()}
+    if best is not None:
+        sink.write(best)
+    return sink.rows
+
+def rank(
+    jd_path: Path,
+    resumes_dir: Path,
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    streaming: bool = False,
+    estats: EncodeStats | None = None,
+    pstats: PipelineStats | None = None,
+    evidence: EvidenceWriter | None = None,
+) -> pd.DataFrame:
+    cfg = cfg or Config()
+    if streaming:
+        aliases: Dict[str, List[str]] = {}
+        top = rank_topk(
+            jd_path, resumes_dir, top_k=top_k, cfg=cfg, stats=stats, estats=estats,
+            aliases=aliases,
+        )
+        df = pd.DataFrame([_row(name, sb) for name, sb in top], columns=COLUMNS)
+        if cfg.dedup:
+            df["aliases"] = _alias_column(df["candidate"], aliases)
+        return df
+    table = score_table(jd_path, resumes_dir, cfg=cfg, stats=stats, estats=estats, pstats=pstats,
+                        evidence=evidence)
+    with trace.span("sort", rows=len(table)):
+        return table.top_k(top_k).to_frame()
+
+def score_table(
+    jd_path: Path,
+    resumes_dir: Path,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    estats: EncodeStats | None = None,
+    shard: Tuple[int, int] | None = None,
+    pstats: PipelineStats | None = None,
+    evidence: EvidenceWriter | None = None,
+) -> ScoreTable:
+    """Score every resume once and keep the raw components, for cheap re-weighting later.
+
+    `shard=(i, n)` scores only the files that `shard.shard_of` assigns to shard i. With
+    `cfg.staged`, extraction, rule scoring and embedding overlap (see `_score_staged`).
+    With `evidence`, the skill hits, date ranges and the `cfg.evidence_sentences` resume
+    sentences closest to the JD are written there for every candidate (not staged).
+    """
+    cfg = cfg or Config()
+    jd_text = load_jd_text(jd_path)
+    files = None
+    if shard is not None:
+        files = shard_files(list_resume_files(resumes_dir), resumes_dir, *shard)
+    aliases: Dict[str, List[str]] = {}
+    if cfg.staged:
+        if evidence is not None:
+            raise ValueError("evidence is not recorded by the staged pipeline")
+        return _score_staged(jd_text, resumes_dir, cfg, stats, estats, pstats, aliases, files)
+    resumes = _load_corpus(resumes_dir, cfg, stats, aliases, files=files)
+    configure(cfg)
+    # one model pass over the whole corpus; the JD is encoded once
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        texts = [text for _, text in resumes]
+        vecs = encode(texts, batch_size=cfg.embed_batch_size, store=store, stats=estats)
+        sentences = None
+        if evidence is not None:
+            with trace.span("evidence.sentences", rows=len(texts)):
+                sentences = similar_sentences(texts, ctx.embedding, cfg.evidence_sentences,
+                                              cfg.embed_batch_size)
+    finally:
+        if store is not None:
+            store.close()
+    matches: List[SkillMatch] | None = [] if evidence is not None else None
+    exps: List[ExperienceResult] | None = [] if evidence is not None else None
+    skills = _skill_scores(ctx, resumes, keep=matches)
+    years = _experience_years(resumes, keep=exps)
+    with trace.span("combine", rows=len(resumes)):
+        names = [name for name, _ in resumes]
+        table = ScoreTable(
+            candidate=np.array(names, dtype=object),
+            skills=skills,
+            sim=(vecs @ ctx.embedding).astype(np.float64),
+            exp_years=years,
+            exp_target=np.full(len(texts), ctx.target_years, dtype=np.float64),
+            weights=cfg.weights,
+            aliases=np.array(_alias_column(names, aliases), dtype=object) if cfg.dedup else None,
+        )
+    if evidence is not None:
+        _write_evidence(evidence, table, resumes, cfg, matches, exps, sentences, aliases)
+    return table
+
+def _score_staged(
+    jd_text: str,
+    resumes_dir: Path,
+    cfg: Config,
+    stats: LoadStats | None,
+    estats: EncodeStats | None,
+    pstats: PipelineStats | None,
+    aliases: Dict[str, List[str]],
+    files: Sequence[Path] | None,
+) -> ScoreTable:
+    """extract -> rules (skills, experience) -> embed, each stage in its own thread.
+
+    Texts are dropped once embedded, so memory holds the queues plus the score columns
+    rather than the whole corpus.
+    """
+    configure(cfg)
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        dropped: Set[str] = set()  # scored, then replaced by a copy with a smaller name
+
+        def extracted():
+            # opened here so the SQLite text cache lives in the extraction thread
+            text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+            try:
+                resumes = iter_resumes(
+                    resumes_dir, workers=cfg.extract_workers, cache=text_cache, stats=stats,
+                    limits=ExtractLimits.from_config(cfg), files=files,
+                )
+                if not cfg.dedup:
+                    yield from resumes
+                    return
+                for name, text, replaced in dedup_stream(
+                    resumes, cfg.dedup_threshold, aliases=aliases, stats=stats
+                ):
+                    if replaced is not None:
+                        dropped.add(replaced)
+                    yield name, text
+            finally:
+                if text_cache is not None:
+                    text_cache.close()
+
+        def rules(item):
+            name, text = item
+            with trace.span("skills", file=name):
+                skills = ctx.matcher.match(text).score
+            with trace.span("experience", file=name):
+                years = estimate_experience_years(text)
+            return name, text, skills, years
+
+        def embed(items):
+            vecs = encode([t for _, t, _, _ in items], cfg.embed_batch_size, store=store,
+                          stats=estats)
+            sims = vecs @ ctx.embedding
+            return [(n, s, float(sim), y) for (n, _, s, y), sim in zip(items, sims)]
+
+        rows = list(run_stages(
+            extracted(),
+            [Stage("rules", rules), Stage("embed", embed, batch=cfg.embed_batch_size)],
+            maxsize=cfg.stage_queue_size, source_name="extract", stats=pstats,
+        ))
+    finally:
+        if store is not None:
+            store.close()
+    rows = [r for r in rows if r[0] not in dropped]
+    with trace.span("combine", rows=len(rows)):
+        names = [r[0] for r in rows]
+        return ScoreTable(
+            candidate=np.array(names, dtype=object),
+            skills=np.array([r[1] for r in rows], dtype=np.float64),
+            sim=np.array([r[2] for r in rows], dtype=np.float64),
+            exp_years=np.array([r[3] for r in rows], dtype=np.float64),
+            exp_target=np.full(len(rows), ctx.target_years, dtype=np.float64),
+            weights=cfg.weights,
+            aliases=np.array(_alias_column(names, aliases), dtype=object) if cfg.dedup else None,
+        )
+
+def explain_file(jd_path: Path, resume_path: Path, cfg: Config | None = None) -> Evidence:
+    """Evidence for one resume scored on the spot, for when none was stored by `rank`."""
     cfg = cfg or Config()
     jd_text = load_jd_text(jd_path)
+    resumes = [(Path(resume_path).stem, extract_file(Path(resume_path)))]
+    configure(cfg)
+    ctx = JobContext.build(jd_text, cfg)
+    vecs = encode([resumes[0][1]], batch_size=1)
+    sentences = similar_sentences([resumes[0][1]], ctx.embedding, cfg.evidence_sentences,
+                                  cfg.embed_batch_size)
+    matches: List[SkillMatch] = []
+    exps: List[ExperienceResult] = []
+    table = ScoreTable(
+        candidate=np.array([resumes[0][0]], dtype=object),
+        skills=_skill_scores(ctx, resumes, keep=matches),
+        sim=(vecs @ ctx.embedding).astype(np.float64),
+        exp_years=_experience_years(resumes, keep=exps),
+        exp_target=np.full(1, ctx.target_years, dtype=np.float64),
+        weights=cfg.weights,
+    )
+    scores = {k: v[0] for k, v in table.to_batch().items() if k != "candidate"}
+    return Evidence.build(*resumes[0], scores, cfg.skills, matches[0], exps[0], sentences[0])
+
+def rank_shard(
+    jd_path: Path,
+    resumes_dir: Path,
+    out: Path,
+    shard: Tuple[int, int],
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    estats: EncodeStats | None = None,
+) -> ScoreTable:
+    """Score one shard of the folder and save its top-k to `out` for `shard.merge_partials`."""
+    cfg = cfg or Config()
+    table = score_table(jd_path, resumes_dir, cfg=cfg, stats=stats, estats=estats, shard=shard)
+    top = table.top_k(top_k)
+    key = manifest_key(load_jd_text(jd_path), cfg, model_id())
+    save_partial(out, top, {"key": key, "shard": shard[0], "shards": shard[1], "top_k": top_k})
+    return top
+
+def rank_cascade(
+    jd_path: Path,
+    resumes_dir: Path,
+    top_k: int = 10,
+    keep: float = 0.1,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    cstats: CascadeStats | None = None,
+    check_recall: bool = False,
+) -> pd.DataFrame:
+    """Two-stage ranking: lexical prefilter over everyone, embeddings for the shortlist.
+
+    Stage one scores the whole corpus with the usual weights, BM25 against the JD standing
+    in for semantic similarity next to the skill and experience scores. Stage two embeds
+    only the best `keep` (fraction when <= 1, otherwise a count) and scores them with
+    `score_candidate`. With `check_recall`, the rest is embedded too and the overlap of the
+    two top-k lists is reported in `cstats`.
+    """
+    from .lexical import bm25_scores
+
+    cfg = cfg or Config()
+    jd_text = load_jd_text(jd_path)
+    aliases: Dict[str, List[str]] = {}
+    resumes = _load_corpus(resumes_dir, cfg, stats, aliases)
+    texts = [text for _, text in resumes]
+    configure(cfg)
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        ctx = JobContext.build(jd_text, cfg, store=store)
+        s_skills = _skill_scores(ctx, resumes)
+        years = _experience_years(resumes)
+        tgt = ctx.target_years
+        s_exp = np.minimum(years / tgt, 1.0) if tgt > 0 else np.zeros_like(years)
+        w = cfg.weights
+        pre = w.w_skills * s_skills + w.w_sim * bm25_scores(jd_text, texts) + w.w_exp * s_exp
+        short = np.argsort(-pre, kind="stable")[:shortlist_size(keep, len(texts), top_k)]
+        sims = encode([texts[i] for i in short], cfg.embed_batch_size, store=store) @ ctx.embedding
+        rows = []
+        for i, sim in zip(short, sims):
+            sb = score_candidate(texts[i], jd_text, cfg, sim=float(sim), ctx=ctx)
+            rows.append(_row(resumes[i][0], sb))
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df = df.sort_values("total", ascending=False, kind="stable").head(top_k)
+        if cfg.dedup:
+            df["aliases"] = _alias_column(df["candidate"], aliases)
+        if cstats is not None:
+            cstats.candidates += len(texts)
+            cstats.shortlisted += len(short)
+        if check_recall and cstats is not None and len(texts):
+            full_sim = encode(texts, cfg.embed_batch_size, store=store) @ ctx.embedding
+            full = w.w_skills * s_skills + w.w_sim * full_sim + w.w_exp * s_exp
+            best = {resumes[i][0] for i in np.argsort(-full, kind="stable")[:top_k]}
+            cstats.recall = len(best & set(df["candidate"])) / len(best)
+    finally:
+        if store is not None:
+            store.close()
+    return df
+
+def _jd_labels(jd_paths: Sequence[Path]) -> List[str]:
+    """File stems, except that JDs sharing a stem are labelled by their path as given."""
+    stems = [Path(p).stem for p in jd_paths]
+    return [s if stems.count(s) == 1 else str(p) for s, p in zip(stems, jd_paths)]
+
+def rank_many(
+    jd_paths: Sequence[Path],
+    resumes_dir: Path,
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    jd_skills: Mapping[str, Sequence[str]] | None = None,
+) -> pd.DataFrame:
+    """Rank one resume pool against several JDs, extracting and embedding the pool once.
+
+    Similarities for every JD come from one N x M matrix product; experience years are
+    extracted once per resume and skills once per distinct skill list. JDs are labelled by
+    file stem, or by the path as given when two JDs share a stem; `jd_skills` maps such a
+    label to its own skill list (default: `cfg.skills`). Returns the per-JD top-k rows
+    stacked, in `jd_paths` order, with `jd` and `rank` columns in front.
+    """
+    cfg = cfg or Config()
+    if not jd_paths:
+        return pd.DataFrame(columns=["jd", "rank", *COLUMNS])
+    aliases: Dict[str, List[str]] = {}
+    resumes = _load_corpus(resumes_dir, cfg, stats, aliases)
+    texts = [text for _, text in resumes]
+    configure(cfg)
+    store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+    try:
+        corpus = encode(texts, batch_size=cfg.embed_batch_size, store=store)
+        labels = _jd_labels(jd_paths)
+        ctxs = []
+        for label, p in zip(labels, jd_paths):
+            jd_cfg = cfg
+            if jd_skills and label in jd_skills:
+                jd_cfg = cfg.model_copy(update={"skills": list(jd_skills[label])})
+            ctxs.append(JobContext.build(load_jd_text(Path(p)), jd_cfg, store=store))
+    finally:
+        if store is not None:
+            store.close()
+
+    sims = similarity_matrix(np.stack([c.embedding for c in ctxs]), corpus)
+    years = _experience_years(resumes)
+    skill_scores: Dict[int, np.ndarray] = {}
+    w = cfg.weights
+    frames = []
+    for j, (jd_name, ctx) in enumerate(zip(labels, ctxs)):
+        key = id(ctx.matcher)
+        if key not in skill_scores:
+            skill_scores[key] = _skill_scores(ctx, resumes)
+        s_skills = skill_scores[key]
+        s_sim = sims[j].astype(np.float64)
+        tgt = ctx.target_years
+        s_exp = np.minimum(years / tgt, 1.0) if tgt > 0 else np.zeros_like(years)
+        total = w.w_skills * s_skills + w.w_sim * s_sim + w.w_exp * s_exp
+        order = np.argsort(-total, kind="stable")[:top_k]
+        frames.append(pd.DataFrame({
+            "jd": jd_name,
+            "rank": np.arange(1, len(order) + 1),
+            "candidate": [resumes[i][0] for i in order],
+            "skills": s_skills[order],
+            "sim": s_sim[order],
+            "exp_score": s_exp[order],
+            "exp_years": np.round(years[order], 2),
+            "exp_target": tgt,
+            "total": total[order],
+        }))
+        if cfg.dedup:
+            frames[-1]["aliases"] = _alias_column(frames[-1]["candidate"], aliases)
+    if not frames:
+        return pd.DataFrame(columns=["jd", "rank", *COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+def rank_incremental(
+    jd_path: Path,
+    resumes_dir: Path,
+    manifest_path: Path,
+    top_k: int = 10,
+    cfg: Config | None = None,
+    stats: LoadStats | None = None,
+    mstats: ManifestStats | None = None,
+) -> pd.DataFrame:
+    """Rank against a manifest of earlier runs: only new or changed files are scored.
+
+    Deleted files drop out of the manifest; totals for every row are recomputed from the
+    stored components with the current weights before sorting. With `cfg.dedup` each
+    entry also keeps its MinHash signature, and near-duplicates are folded over the whole
+    manifest in name order, as `rank` does.
+    """
+    cfg = cfg or Config()
+    jd_text = load_jd_text(jd_path)
+    configure(cfg)
+    manifest = Manifest(manifest_path, manifest_key(jd_text, cfg, model_id()))
+    todo, removed, reused = manifest.diff(list_resume_files(resumes_dir))
+    if todo:
+        text_cache = TextCache(cfg.cache_dir / "extract") if cfg.cache_dir else None
+        store = open_store(cfg.cache_dir, cfg.cache_max_mb) if cfg.cache_dir else None
+        try:
+            ctx = JobContext.build(jd_text, cfg, store=store)
+            files = iter_resume_files(
+                None, workers=cfg.extract_workers, cache=text_cache, stats=stats, files=todo,
+                limits=ExtractLimits.from_config(cfg),
+            )
+            for batch in _batched(files, cfg.embed_batch_size):
+                vecs = encode([t for _, t in batch], cfg.embed_batch_size, store=store)
+                sims = vecs @ ctx.embedding
+                for (p, text), sim in zip(batch, sims):
+                    sb = score_candidate(text, jd_text, cfg, sim=float(sim), ctx=ctx)
+                    scores = {
+                        "skills": sb.skills, "sim": sb.sim, "exp_years": sb.exp_years,
+                        "exp_target": sb.exp_target, "exp_score": sb.exp_score,
+                    }
+                    if cfg.dedup:
+                        sig = signature(text)
+                        scores["minhash"] = None if sig is None else sig.tobytes().hex()
+                    manifest.record(p, p.stem, scores)
+        finally:
+            if text_cache is not None:
+                text_cache.close()
+            if store is not None:
+                store.close()
+    if manifest.dirty or not manifest.path.exists():
+        manifest.save()
+    if mstats is not None:
+        mstats.reused += reused
+        mstats.scored += len(todo)
+        mstats.removed += len(removed)
+
+    w = cfg.weights
     rows = []
-    for name, text in load_resumes(resumes_dir):
-        sb = score_candidate(text, jd_text, cfg)
-        row = {
-            "candidate": name,
-            "skills": sb.skills,
-            "sim": sb.sim,
-            "exp_score": sb.exp_score,
-            "exp_years": round(sb.exp_years, 2),
-            "exp_target": sb.exp_target,
-            "total": sb.total,
-        }
-
-        rows.append(row)
-    df = pd.DataFrame(rows).sort_values("total", ascending=False)
+    aliases: Dict[str, List[str]] = {}
+    d = Deduper(cfg.dedup_threshold)
+    for _, e in sorted(manifest.entries.items(), key=lambda kv: (kv[1]["name"], kv[0])):
+        if cfg.dedup:
+            sig = e["minhash"] and np.frombuffer(bytes.fromhex(e["minhash"]), dtype=np.uint32)
+            rep = d.add_signature(e["name"], sig)
+            if rep is not None:
+                aliases.setdefault(rep, []).append(e["name"])
+                continue
+        total = w.w_skills*e["skills"] + w.w_sim*e["sim"] + w.w_exp*e["exp_score"]
+        rows.append(_row(e["name"], ScoreBreakdown(
+            e["skills"], e["sim"], e["exp_score"], e["exp_years"], e["exp_target"], total
+        )))
+    # rows are in name order, so ties on the total rank by name, as in ScoreTable.order
+    df = pd.DataFrame(rows, columns=COLUMNS).sort_values("total", ascending=False, kind="stable")
+    if cfg.dedup:
+        df["aliases"] = _alias_column(df["candidate"], aliases)
     return df.head(top_k)
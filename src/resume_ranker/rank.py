@@ -1,7 +1,10 @@
 from dataclasses import dataclass
+from typing import Optional
+from . import trace
 from .skills import score_skills
-from .embed import similarity
+from .embed import encode, similarity
 from .config import Config
+from .context import JobContext
 from .experience import estimate_experience_years, target_years_from_jd
 
 @dataclass
@@ -13,11 +16,33 @@ class ScoreBreakdown:
     exp_target: float     # target years from JD (or default)
     total: float
 
-def score_candidate(resume_text: str, jd_text: str, cfg: Config) -> ScoreBreakdown:
-    s_skills = score_skills(resume_text, cfg.skills)
-    s_sim = similarity(resume_text, jd_text)
-    yrs = estimate_experience_years(resume_text)
-    tgt = target_years_from_jd(jd_text, cfg.default_exp_target_years)
+def score_candidate(
+    resume_text: str,
+    jd_text: str,
+    cfg: Config,
+    sim: Optional[float] = None,
+    ctx: Optional[JobContext] = None,
+) -> ScoreBreakdown:
+    """Score one resume.
+
+    Pass `sim` when it was already computed in a corpus batch, and `ctx` to reuse the JD's
+    parsed target, skill matcher and embedding instead of deriving them again.
+    """
+    with trace.span("skills"):
+        if ctx is not None:
+            s_skills = ctx.matcher.match(resume_text).score
+            tgt = ctx.target_years
+        else:
+            s_skills = score_skills(resume_text, cfg.skills)
+            tgt = target_years_from_jd(jd_text, cfg.default_exp_target_years)
+    if sim is not None:
+        s_sim = float(sim)
+    elif ctx is not None and ctx.embedding is not None:
+        s_sim = float(encode([resume_text], batch_size=1)[0] @ ctx.embedding)
+    else:
+        s_sim = similarity(resume_text, jd_text)
+    with trace.span("experience"):
+        yrs = estimate_experience_years(resume_text)
     s_exp = min(yrs / tgt, 1.0) if tgt > 0 else 0.0
     total = cfg.weights.w_skills*s_skills + cfg.weights.w_sim*s_sim + cfg.weights.w_exp*s_exp
     return ScoreBreakdown(s_skills, s_sim, s_exp, yrs, tgt, total)
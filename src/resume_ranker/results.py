@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import Weights
+
+
+@dataclass(frozen=True)
+class ScoreTable:
+    """Raw per-candidate score components as parallel NumPy arrays.
+
+    Only the weighted sum depends on the weights, so `reweight`, `filter` and `top_k`
+    re-rank a scored pool without touching extraction, embeddings or skill matching.
+    """
+
+    candidate: np.ndarray  # object array of names
+    skills: np.ndarray
+    sim: np.ndarray
+    exp_years: np.ndarray
+    exp_target: np.ndarray
+    weights: Weights = field(default_factory=Weights)
+    aliases: Optional[np.ndarray] = None  # "; "-joined names folded into each row (dedup runs)
+
+    @classmethod
+    def concat(cls, tables: Sequence["ScoreTable"]) -> "ScoreTable":
+        """Rows of all `tables` in order, with the first table's weights."""
+
+        def cat(col: str) -> np.ndarray:
+            return np.concatenate([getattr(t, col) for t in tables])
+
+        has_aliases = all(t.aliases is not None for t in tables)
+        return cls(
+            candidate=cat("candidate"),
+            skills=cat("skills"),
+            sim=cat("sim"),
+            exp_years=cat("exp_years"),
+            exp_target=cat("exp_target"),
+            weights=tables[0].weights,
+            aliases=cat("aliases") if has_aliases else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.candidate)
+
+    def __getitem__(self, idx) -> "ScoreTable":
+        return replace(
+            self,
+            candidate=self.candidate[idx],
+            skills=self.skills[idx],
+            sim=self.sim[idx],
+            exp_years=self.exp_years[idx],
+            exp_target=self.exp_target[idx],
+            aliases=None if self.aliases is None else self.aliases[idx],
+        )
+
+    @property
+    def exp_score(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self.exp_target > 0, np.minimum(self.exp_years / self.exp_target, 1.0), 0.0
+            )
+
+    @property
+    def total(self) -> np.ndarray:
+        w = self.weights
+        return w.w_skills * self.skills + w.w_sim * self.sim + w.w_exp * self.exp_score
+
+    def reweight(self, weights: Weights) -> "ScoreTable":
+        return replace(self, weights=weights)
+
+    def mask(self, thresholds: Mapping[str, Optional[float]]) -> np.ndarray:
+        """Rows whose columns ("skills", "sim", "exp_score", "total", ...) meet every minimum."""
+        keep = np.ones(len(self), dtype=bool)
+        for col, lo in thresholds.items():
+            if lo is not None:
+                keep &= getattr(self, col) >= lo
+        return keep
+
+    def filter(self, thresholds: Mapping[str, Optional[float]]) -> "ScoreTable":
+        return self[self.mask(thresholds)]
+
+    def order(self) -> np.ndarray:
+        """Row order by total, best first; ties by candidate name, so the ranking does not
+        depend on the order files finished extracting (or on which shard scored them)."""
+        return np.lexsort((self.candidate, -self.total))
+
+    def top_k(self, k: int) -> "ScoreTable":
+        return self[self.order()[:k]]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Same columns as `pipeline.rank`, in the table's current row order."""
+        df = pd.DataFrame(
+            {
+                "candidate": self.candidate,
+                "skills": self.skills,
+                "sim": self.sim,
+                "exp_score": self.exp_score,
+                "exp_years": np.round(self.exp_years, 2),
+                "exp_target": self.exp_target,
+                "total": self.total,
+            }
+        )
+        if self.aliases is not None:
+            df["aliases"] = self.aliases
+        return df
+
+    def to_batch(self) -> Dict[str, np.ndarray]:
+        """The `to_frame` columns as a dict of arrays, the row format of `sinks`."""
+        return {
+            "candidate": self.candidate,
+            "skills": self.skills,
+            "sim": self.sim,
+            "exp_score": self.exp_score,
+            "exp_years": np.round(self.exp_years, 2),
+            "exp_target": self.exp_target,
+            "total": self.total,
+        }
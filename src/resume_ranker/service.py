@@ -0,0 +1,356 @@
+"""HTTP service: `/rank` and `/explain` over a model that is loaded once and shared.
+
+Requires the `api` extra (fastapi, uvicorn, python-multipart). Run with
+`resume-ranker serve` or `uvicorn resume_ranker.service:app`.
+"""
+
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from . import embed, trace
+from .budget import ExtractError, ExtractLimits
+from .config import Config, Weights
+from .context import JobContext
+from .experience import extract_experience
+from .io import SUPPORTED, extract_file
+from .rank import score_candidate
+
+CHUNK = 1 << 16
+
+
+@dataclass
+class BatcherStats:
+    requests: int = 0
+    texts: int = 0
+    batches: int = 0
+
+
+class MicroBatcher:
+    """Merges encode calls from concurrent requests into shared model batches.
+
+    The first queued request opens a batch; it is flushed once `max_batch` texts are
+    waiting or `max_latency` seconds have passed, whichever comes first. The model runs on
+    one dedicated thread, so the event loop keeps accepting requests meanwhile and those
+    pile up into the next batch.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch: int = 64,
+        max_latency: float = 0.01,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.stats = BatcherStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encode")
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._thread.shutdown(wait=True)
+
+    async def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher.start() was not called")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        assert self._queue is not None
+        while True:
+            batch = [await self._queue.get()]
+            n = len(batch[0][0])
+            deadline = loop.time() + self.max_latency
+            while n < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n += len(item[0])
+            texts = [t for ts, _ in batch for t in ts]
+            try:
+                # under the batcher task's context, so spans reach the service's tracer
+                vecs = await loop.run_in_executor(
+                    self._thread, contextvars.copy_context().run, self.encode_fn, texts
+                )
+            except Exception as e:  # hand the failure to every waiting request
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.stats.requests += len(batch)
+            self.stats.texts += len(texts)
+            self.stats.batches += 1
+            pos = 0
+            for ts, fut in batch:
+                if not fut.done():
+                    fut.set_result(vecs[pos : pos + len(ts)])
+                pos += len(ts)
+
+
+def _default_executor(workers: int) -> Executor:
+    # spawn: the parent holds torch/OpenMP threads, which do not survive fork
+    ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=ctx)
+
+
+def _extract_path(
+    path: str, name: str, limits: ExtractLimits
+) -> Tuple[Optional[str], Optional[ExtractError]]:
+    """Text of a spooled upload, or why it could not be read (reported under `name`).
+
+    The page and character limits apply. The timeout and memory cap do not: they need the
+    killable workers of `budget.BudgetedPool`, not the service's shared pool.
+    """
+    t0 = time.perf_counter()
+    try:
+        return extract_file(Path(path), limits.max_pages, limits.max_chars), None
+    except Exception as e:
+        secs = time.perf_counter() - t0
+        return None, ExtractError(name, "error", f"{type(e).__name__}: {e}", secs)
+
+
+async def _spool(upload: UploadFile, tmpdir: str, i: int) -> Optional[Path]:
+    """Copy an upload to disk chunk by chunk, never holding the whole file in memory.
+
+    Returns None, without reading the upload, for a file type that cannot be extracted.
+    """
+    name = Path(upload.filename or f"file{i}.txt").name
+    if Path(name).suffix.lower() not in SUPPORTED:
+        return None
+    dest = Path(tmpdir) / f"{i:05d}_{name}"
+    with open(dest, "wb") as fh:
+        while chunk := await upload.read(CHUNK):
+            await run_in_threadpool(fh.write, chunk)
+    return dest
+
+
+def create_app(
+    cfg: Optional[Config] = None,
+    executor: Optional[Executor] = None,
+    max_batch: int = 64,
+    max_latency_ms: float = 10.0,
+) -> FastAPI:
+    """Build the service. `executor` runs file extraction (default: a spawn process pool)."""
+    cfg = cfg or Config()
+    batcher = MicroBatcher(
+        lambda texts: embed.encode(texts, batch_size=cfg.embed_batch_size),
+        max_batch=max_batch,
+        max_latency=max_latency_ms / 1000,
+    )
+    contexts: "OrderedDict[Tuple[str, Tuple[str, ...]], JobContext]" = OrderedDict()
+    state = {}
+    limits = ExtractLimits.from_config(cfg)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        embed.configure(cfg)
+        await run_in_threadpool(embed.get_model)  # load once, before the first request
+        state["pool"] = executor or _default_executor(cfg.extract_workers)
+        # aggregates only: a long-running service must not keep every span
+        state["tracer"] = trace.Tracer(events=False)
+        with trace.use(state["tracer"]):
+            batcher.start()  # the batcher task keeps this context
+        try:
+            yield
+        finally:
+            await batcher.stop()
+            if executor is None:
+                state["pool"].shutdown(wait=True)
+
+    app = FastAPI(title="resume-ranker", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def traced(request, call_next):
+        with trace.use(state.get("tracer")):
+            return await call_next(request)
+
+    async def extract_uploads(
+        files: Sequence[UploadFile],
+    ) -> Tuple[List[Tuple[str, str]], List[ExtractError]]:
+        """(name, text) of every upload that could be read, and an error for each other."""
+        loop = asyncio.get_running_loop()
+
+        async def read(f: UploadFile, p: Optional[Path]):
+            name = f.filename or (p.name if p else "")
+            if p is None:
+                return None, ExtractError(name, "unsupported", "unsupported file type", 0.0)
+            return await loop.run_in_executor(state["pool"], _extract_path, str(p), name, limits)
+
+        tmpdir = tempfile.mkdtemp(prefix="resume-ranker-")
+        try:
+            paths = [await _spool(f, tmpdir, i) for i, f in enumerate(files)]
+            results = await asyncio.gather(*(read(f, p) for f, p in zip(files, paths)))
+        finally:
+            await run_in_threadpool(shutil.rmtree, tmpdir, True)
+        docs = [
+            (Path(f.filename or "").stem, text)
+            for f, (text, err) in zip(files, results)
+            if err is None
+        ]
+        return docs, [err for _, err in results if err is not None]
+
+    async def extract_one(upload: UploadFile) -> Tuple[str, str]:
+        docs, errors = await extract_uploads([upload])
+        if errors:
+            raise HTTPException(
+                415 if errors[0].kind == "unsupported" else 422, errors[0].to_dict()
+            )
+        return docs[0]
+
+    async def job(jd: Optional[UploadFile], jd_text: Optional[str], req_cfg: Config) -> JobContext:
+        if jd is not None:
+            jd_text = (await extract_one(jd))[1]
+        if not jd_text:
+            raise HTTPException(422, "provide a JD file (`jd`) or `jd_text`")
+        key = (jd_text, tuple(req_cfg.skills))
+        if key in contexts:
+            contexts.move_to_end(key)
+            return contexts[key]
+        ctx = JobContext.build(jd_text, req_cfg, embed=False)
+        ctx.embedding = (await batcher.encode([jd_text]))[0]
+        contexts[key] = ctx
+        if len(contexts) > 32:
+            contexts.popitem(last=False)
+        return ctx
+
+    def request_cfg(skills: Optional[str], w_skills, w_sim, w_exp) -> Config:
+        update = {}
+        if skills:
+            update["skills"] = [s.strip() for s in skills.split(",") if s.strip()]
+        given = [w is not None for w in (w_skills, w_sim, w_exp)]
+        if any(given) and not all(given):
+            raise HTTPException(422, "give all three weights (w_skills, w_sim, w_exp) or none")
+        if all(given):
+            update["weights"] = Weights(w_skills=w_skills, w_sim=w_sim, w_exp=w_exp)
+        return cfg.model_copy(update=update) if update else cfg
+
+    @app.get("/healthz")
+    async def healthz():
+        s = batcher.stats
+        return {
+            "model": embed.model_id(),
+            "requests": s.requests,
+            "texts": s.texts,
+            "batches": s.batches,
+        }
+
+    @app.get("/metrics")
+    async def metrics():
+        """Span timings (skills, experience, embed, ...) and counters since startup."""
+        return state["tracer"].metrics()
+
+    @app.post("/rank")
+    async def rank(
+        resumes: List[UploadFile] = File(...),
+        jd: Optional[UploadFile] = File(None),
+        jd_text: Optional[str] = Form(None),
+        top_k: int = Form(10, ge=1),
+        skills: Optional[str] = Form(None, description="Comma-separated skill list"),
+        w_skills: Optional[float] = Form(None),
+        w_sim: Optional[float] = Form(None),
+        w_exp: Optional[float] = Form(None),
+    ):
+        req_cfg = request_cfg(skills, w_skills, w_sim, w_exp)
+        ctx = await job(jd, jd_text, req_cfg)
+        docs, errors = await extract_uploads(resumes)
+        sims = await batcher.encode([t for _, t in docs]) @ ctx.embedding if docs else []
+
+        def score():
+            rows = []
+            for (name, text), sim in zip(docs, sims):
+                sb = score_candidate(text, ctx.jd_text, req_cfg, sim=float(sim), ctx=ctx)
+                rows.append(
+                    {
+                        "candidate": name,
+                        "skills": sb.skills,
+                        "sim": sb.sim,
+                        "exp_score": sb.exp_score,
+                        "exp_years": round(sb.exp_years, 2),
+                        "exp_target": sb.exp_target,
+                        "total": sb.total,
+                    }
+                )
+            rows.sort(key=lambda r: (-r["total"], r["candidate"]))  # ties by name
+            return rows[:top_k]
+
+        # files that could not be read are listed, not fatal to the rest of the request
+        return {"results": await run_in_threadpool(score), "errors": [e.to_dict() for e in errors]}
+
+    @app.post("/explain")
+    async def explain(
+        resume: UploadFile = File(...),
+        jd: Optional[UploadFile] = File(None),
+        jd_text: Optional[str] = Form(None),
+        skills: Optional[str] = Form(None, description="Comma-separated skill list"),
+    ):
+        req_cfg = request_cfg(skills, None, None, None)
+        ctx = await job(jd, jd_text, req_cfg)
+        name, text = await extract_one(resume)
+        sim = float((await batcher.encode([text]))[0] @ ctx.embedding)
+
+        def detail():
+            sb = score_candidate(text, ctx.jd_text, req_cfg, sim=sim, ctx=ctx)
+            match = ctx.matcher.match(text)
+            exp = extract_experience(text)
+            return {
+                "candidate": name,
+                "scores": {
+                    "skills": sb.skills,
+                    "sim": sb.sim,
+                    "exp_score": sb.exp_score,
+                    "total": sb.total,
+                },
+                "matched_skills": match.matched,
+                "missing_skills": [s for s in req_cfg.skills if s not in set(match.matched)],
+                "experience": {
+                    "years": round(exp.years, 2),
+                    "source": exp.source,
+                    "target": ctx.target_years,
+                },
+            }
+
+        return await run_in_threadpool(detail)
+
+    return app
+
+
+def __getattr__(name: str):
+    # `uvicorn resume_ranker.service:app` builds the default app on first access
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(name)
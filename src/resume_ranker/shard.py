@@ -0,0 +1,98 @@
+"""Split one ranking job across machines and merge the partial top-k lists.
+
+Each file belongs to shard `hash(relative path) % n`, so every node picks its subset
+from its own copy of the folder with no coordination. A shard keeps its top-k rows with
+every score component; because `ScoreTable.order` breaks ties by name, the top-k of the
+union of those rows is exactly the single-node top-k.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .config import Weights
+from .results import ScoreTable
+
+FORMAT_VERSION = 1
+_FIELDS = ("skills", "sim", "exp_years", "exp_target")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """ "i/n" -> (i, n), with shards numbered 0 .. n-1."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like 'i/n', got {spec!r}")
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"shard {spec!r} out of range: need 0 <= i < n")
+    return i, n
+
+
+def shard_of(rel_path: str, n: int) -> int:
+    """Stable across machines and Python runs (unlike the salted built-in `hash`)."""
+    digest = hashlib.blake2b(rel_path.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % n
+
+
+def shard_files(files: Sequence[Path], root: Path, i: int, n: int) -> List[Path]:
+    return [p for p in files if shard_of(p.relative_to(root).as_posix(), n) == i]
+
+
+def save_partial(path: Path, table: ScoreTable, meta: Dict[str, Any]) -> None:
+    """One compressed .npz: the component columns as float64 plus a JSON header."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {"version": FORMAT_VERSION, "weights": table.weights.model_dump(), **meta}
+    arrays = {f: getattr(table, f) for f in _FIELDS}
+    if table.aliases is not None:
+        arrays["aliases"] = table.aliases.astype(str)
+    with open(path, "wb") as fh:
+        np.savez_compressed(
+            fh, candidate=table.candidate.astype(str), meta=np.array(json.dumps(header)), **arrays
+        )
+
+
+def load_partial(path: Path) -> Tuple[ScoreTable, Dict[str, Any]]:
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["meta"]))
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported partial format {meta.get('version')!r}")
+        table = ScoreTable(
+            candidate=z["candidate"].astype(object),
+            **{f: z[f] for f in _FIELDS},
+            weights=Weights(**meta["weights"]),
+            aliases=z["aliases"].astype(object) if "aliases" in z.files else None,
+        )
+    return table, meta
+
+
+def merge_partials(paths: Sequence[Path], top_k: int | None = None) -> ScoreTable:
+    """Union of every shard's rows, re-ranked; fails unless the shards form one complete job."""
+    parts = [load_partial(Path(p)) for p in paths]
+    if not parts:
+        raise ValueError("no partial results to merge")
+    first = parts[0][1]
+    for p, (_, meta) in zip(paths, parts):
+        for key in ("key", "weights", "shards"):
+            if meta[key] != first[key]:
+                raise ValueError(
+                    f"{p}: {key} differs from {paths[0]}; shards are from different runs"
+                )
+    seen = sorted(meta["shard"] for _, meta in parts)
+    if seen != list(range(first["shards"])):
+        raise ValueError(f"need shards 0..{first['shards'] - 1} exactly once, got {seen}")
+    stored = min(meta["top_k"] for _, meta in parts)
+    k = stored if top_k is None else top_k
+    if k > stored:
+        raise ValueError(f"shards kept only their top {stored}; cannot merge a top {k}")
+    tables = [t for t, _ in parts]
+    with_aliases = all(t.aliases is not None for t in tables)
+    merged = ScoreTable(
+        candidate=np.concatenate([t.candidate for t in tables]),
+        **{f: np.concatenate([getattr(t, f) for t in tables]) for f in _FIELDS},
+        weights=tables[0].weights,
+        aliases=np.concatenate([t.aliases for t in tables]) if with_aliases else None,
+    )
+    return merged.top_k(k)
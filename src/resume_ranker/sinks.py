@@ -0,0 +1,221 @@
+"""Output sinks that take scored rows batch by batch instead of one finished DataFrame.
+
+A batch is a dict of equal-length arrays: the `pipeline.COLUMNS` plus, optionally,
+"embedding" (n x dim float32) and "skill_hits" (n x ceil(len(skills) / 8) uint8, bit i
+little-endian = skills[i] matched). CSV and JSONL write each batch as it arrives;
+Parquet and Arrow buffer `row_group` rows and write them as typed float32 columns, the
+embedding as a fixed-size list and the bitset as fixed-size binary. An `.arrow` file
+reloads zero-copy with `read_results` (memory-mapped).
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+Batch = Dict[str, np.ndarray]
+
+COLUMNS = ["candidate", "skills", "sim", "exp_score", "exp_years", "exp_target", "total"]
+FLOATS = COLUMNS[1:]
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow output needs pyarrow: pip install -e '.[arrow]'") from e
+    return pa
+
+
+def hit_bits(matched: Sequence[bool]) -> np.ndarray:
+    return np.packbits(np.asarray(matched, dtype=bool), bitorder="little")
+
+
+def decode_hits(bits: bytes, skills: Sequence[str]) -> List[str]:
+    on = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), bitorder="little")
+    return [s for s, b in zip(skills, on) if b]
+
+
+class Sink:
+    """Context manager; `write` takes one batch, `close` flushes and finalizes the file."""
+
+    def __init__(self, path: Path, skills: Sequence[str] = ()):
+        self.path = Path(path)
+        self.skills = list(skills)
+        self.rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, batch: Batch) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class CsvSink(Sink):
+    def __init__(self, path: Path, skills: Sequence[str] = ()):
+        super().__init__(path, skills)
+        self._fh = open(self.path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._fh)
+        self._header = False
+
+    def write(self, batch: Batch) -> None:
+        if "embedding" in batch:
+            raise ValueError("CSV output cannot hold embeddings; use .jsonl, .parquet or .arrow")
+        extra = ["skill_hits"] if "skill_hits" in batch else []
+        if not self._header:
+            self._csv.writerow(COLUMNS + extra)
+            self._header = True
+        cols = [batch[c] for c in COLUMNS]
+        hexes = [b.tobytes().hex() for b in batch["skill_hits"]] if extra else None
+        for i in range(len(cols[0])):
+            row = [cols[0][i]] + [repr(float(c[i])) for c in cols[1:]]
+            self._csv.writerow(row + ([hexes[i]] if hexes else []))
+        self.rows += len(cols[0])
+        self._fh.flush()
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            if not self._header:
+                self._csv.writerow(COLUMNS)
+            self._fh.close()
+
+
+class JsonlSink(Sink):
+    def __init__(self, path: Path, skills: Sequence[str] = ()):
+        super().__init__(path, skills)
+        self._fh = open(self.path, "w", encoding="utf-8")
+
+    def write(self, batch: Batch) -> None:
+        n = len(batch["candidate"])
+        lines = []
+        for i in range(n):
+            row: Dict[str, Any] = {"candidate": str(batch["candidate"][i])}
+            row.update((c, float(batch[c][i])) for c in FLOATS)
+            if "skill_hits" in batch:
+                row["skill_hits"] = batch["skill_hits"][i].tobytes().hex()
+            if "embedding" in batch:
+                row["embedding"] = batch["embedding"][i].tolist()
+            lines.append(json.dumps(row))
+        if lines:
+            self._fh.write("\n".join(lines) + "\n")
+            self._fh.flush()
+        self.rows += n
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class _ColumnarSink(Sink):
+    def __init__(self, path: Path, skills: Sequence[str] = (), row_group: int = 65_536):
+        super().__init__(path, skills)
+        self.pa = _pyarrow()
+        self.row_group = row_group
+        self._pending: List[Batch] = []
+        self._pending_rows = 0
+        self._writer = None
+
+    def _table(self, batch: Batch):
+        pa = self.pa
+        arrays = {"candidate": pa.array([str(c) for c in batch["candidate"]], pa.string())}
+        arrays.update((c, pa.array(np.asarray(batch[c], dtype=np.float32))) for c in FLOATS)
+        if "skill_hits" in batch:
+            bits = np.ascontiguousarray(batch["skill_hits"], dtype=np.uint8)
+            arrays["skill_hits"] = pa.FixedSizeBinaryArray.from_buffers(
+                pa.binary(bits.shape[1]), len(bits), [None, pa.py_buffer(bits.tobytes())]
+            )
+        if "embedding" in batch:
+            emb = np.ascontiguousarray(batch["embedding"], dtype=np.float32)
+            arrays["embedding"] = pa.FixedSizeListArray.from_arrays(
+                pa.array(emb.reshape(-1)), emb.shape[1]
+            )
+        meta = {b"resume_ranker.skills": json.dumps(self.skills).encode()}
+        return pa.table(arrays).replace_schema_metadata(meta)
+
+    def write(self, batch: Batch) -> None:
+        n = len(batch["candidate"])
+        if not n:
+            return
+        self._pending.append(batch)
+        self._pending_rows += n
+        self.rows += n
+        if self._pending_rows >= self.row_group:
+            self._flush(final=False)
+
+    def _flush(self, final: bool = True) -> None:
+        """Write full row groups; the remainder stays pending unless `final`."""
+        if not self._pending:
+            return
+        merged = {k: np.concatenate([b[k] for b in self._pending]) for k in self._pending[0]}
+        n = len(merged["candidate"])
+        cut = n if final else n - n % self.row_group
+        rest = {k: v[cut:] for k, v in merged.items()}
+        self._pending, self._pending_rows = ([rest], n - cut) if cut < n else ([], 0)
+        table = self._table({k: v[:cut] for k, v in merged.items()})
+        for start in range(0, table.num_rows, self.row_group):
+            self._write(table.slice(start, self.row_group))
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is None:  # nothing scored: still leave a readable, empty file
+            empty = {c: np.zeros(0) for c in FLOATS}
+            empty["candidate"] = np.zeros(0, dtype=object)
+            self._write(self._table(empty))
+        self._writer.close()
+
+
+class ParquetSink(_ColumnarSink):
+    def _write(self, table) -> None:
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.path), table.schema)
+        self._writer.write_table(table, row_group_size=self.row_group)
+
+
+class ArrowSink(_ColumnarSink):
+    def _write(self, table) -> None:
+        if self._writer is None:
+            self._writer = self.pa.ipc.new_file(str(self.path), table.schema)
+        self._writer.write_table(table, max_chunksize=self.row_group)
+
+
+_SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink, "arrow": ArrowSink}
+
+
+def open_sink(
+    path: Path, skills: Sequence[str] = (), fmt: Optional[str] = None, row_group: int = 65_536
+) -> Sink:
+    """Sink for `path`, its format taken from the suffix unless `fmt` is given."""
+    fmt = fmt or FORMATS.get(Path(path).suffix.lower())
+    if fmt not in _SINKS:
+        raise ValueError(f"unknown output format for {path}; use one of {', '.join(FORMATS)}")
+    if fmt in ("parquet", "arrow"):
+        return _SINKS[fmt](path, skills, row_group=row_group)
+    return _SINKS[fmt](path, skills)
+
+
+def read_results(path: Path):
+    """pyarrow Table of a .parquet or .arrow output; .arrow files are memory-mapped."""
+    pa = _pyarrow()
+    path = Path(path)
+    if FORMATS.get(path.suffix.lower()) == "arrow":
+        return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    import pyarrow.parquet as pq
+
+    return pq.read_table(str(path))
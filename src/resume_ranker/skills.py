@@ -1,14 +1,148 @@
 
-from typing import Iterable
-from rapidfuzz import fuzz
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from scipy import sparse
+
+# "scikit-learn", "node.js", "c++", "c#" stay single tokens; trailing punctuation is dropped
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[.\-][a-z0-9+#]+)*", re.IGNORECASE)
+
+FUZZY_THRESHOLD = 90
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Lowercased tokens with their character spans in `text`."""
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+def _trigrams(s: str) -> set:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+@dataclass(frozen=True)
+class SkillHit:
+    skill: str
+    start: int  # character offsets into the resume text
+    end: int
+    kind: str   # "exact" (verbatim) or "fuzzy"
+
+@dataclass
+class SkillMatch:
+    score: float
+    hits: List[SkillHit] = field(default_factory=list)
+
+    @property
+    def matched(self) -> List[str]:
+        return [h.skill for h in self.hits]
+
+class SkillMatcher:
+    """Precompiled matcher for one skill list: substring-or-`partial_ratio`, token-aware.
+
+    1. A token trie over every skill finds whole-token matches in one pass over the text.
+    2. The remaining skills go through a sparse skill x trigram matrix: a skill can only be
+       a substring (or a `partial_ratio` match above the threshold) if enough of its
+       trigrams occur in the text, so one sparse mat-vec discards almost all of them.
+    3. The few survivors are verified with `in` or one batched `process.cdist` call.
+
+    Hits differ from a plain `s in text or partial_ratio(s, text) > threshold` loop in two
+    ways. Token matches ignore the whitespace and punctuation between tokens, so
+    "Machine   learning" and "ci\ncd" hit "machine learning" and "ci cd". And a skill is
+    only fuzzy-matched inside a text at least as long as itself: `partial_ratio` would
+    also score a short text as a fragment of the skill, so "c" would hit "c++" and
+    "machine learning".
+    """
+
+    def __init__(self, skills: Iterable[str], threshold: float = FUZZY_THRESHOLD):
+        self.skills = list(skills)
+        self.threshold = threshold
+        self._unique = list(dict.fromkeys(s.lower() for s in self.skills))
+        self._index = {s: i for i, s in enumerate(self._unique)}
+
+        self._trie: Dict = {}
+        self._depth = 0
+        for i, s in enumerate(self._unique):
+            toks = [t for t, _, _ in tokenize(s)]
+            if not toks or " ".join(toks) != s:
+                continue  # punctuation-bearing skills ("ci/cd") are left to the substring pass
+            node = self._trie
+            for t in toks:
+                node = node.setdefault(t, {})
+            node.setdefault(None, []).append(i)
+            self._depth = max(self._depth, len(toks))
+
+        vocab: Dict[str, int] = {}
+        rows, cols = [], []
+        self._need = np.zeros(len(self._unique), dtype=np.int32)
+        for i, s in enumerate(self._unique):
+            tri = _trigrams(s)
+            for g in tri:
+                rows.append(i)
+                cols.append(vocab.setdefault(g, len(vocab)))
+            # each indel destroys at most 3 trigrams; partial_ratio > threshold bounds the indels
+            edits = math.floor(2 * len(s) * (100 - threshold) / 100)
+            self._need[i] = max(len(tri) - 3 * edits, 0)
+        self._vocab = vocab
+        self._grams = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self._unique), max(len(vocab), 1)),
+        )
+
+    def _exact(self, toks: Sequence[Tuple[str, int, int]]) -> Dict[int, Tuple[int, int]]:
+        found: Dict[int, Tuple[int, int]] = {}
+        for i in range(len(toks)):
+            node: Optional[Dict] = self._trie
+            for j in range(i, min(i + self._depth, len(toks))):
+                node = node.get(toks[j][0]) if node else None
+                if node is None:
+                    break
+                for sid in node.get(None, ()):
+                    found.setdefault(sid, (toks[i][1], toks[j][2]))
+        return found
+
+    def _candidates(self, low: str, skip: Iterable[int]) -> np.ndarray:
+        present = np.zeros(self._grams.shape[1], dtype=np.int32)
+        ids = [self._vocab[g] for g in _trigrams(low) if g in self._vocab]
+        present[ids] = 1
+        ok = (self._grams @ present) >= self._need
+        ok[list(skip)] = False
+        return np.flatnonzero(ok)
+
+    def match(self, text: str) -> SkillMatch:
+        low = text.lower()
+        found = {sid: (s, e, "exact") for sid, (s, e) in self._exact(tokenize(text)).items()}
+        fuzzy_ids = []
+        for sid in self._candidates(low, found):
+            pos = low.find(self._unique[sid])
+            if pos >= 0:
+                found[sid] = (pos, pos + len(self._unique[sid]), "exact")
+            elif len(self._unique[sid]) <= len(low):
+                fuzzy_ids.append(int(sid))
+        if fuzzy_ids:
+            scores = process.cdist(
+                [self._unique[i] for i in fuzzy_ids], [low],
+                scorer=fuzz.partial_ratio, score_cutoff=self.threshold, workers=-1,
+            )
+            for sid, sc in zip(fuzzy_ids, scores[:, 0]):
+                if sc > self.threshold:
+                    al = fuzz.partial_ratio_alignment(self._unique[sid], low)
+                    found[sid] = (al.dest_start, al.dest_end, "fuzzy")
+        hits, n_hit = [], 0
+        for s in self.skills:
+            sid = self._index[s.lower()]
+            if sid in found:
+                n_hit += 1
+                start, end, kind = found[sid]
+                hits.append(SkillHit(s, start, end, kind))
+        return SkillMatch(n_hit / max(len(self.skills), 1), hits)
+
+@lru_cache(maxsize=32)
+def get_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+def match_skills(text: str, skills: Iterable[str]) -> SkillMatch:
+    return get_matcher(tuple(skills)).match(text)
 
 def score_skills(text: str, skills: Iterable[str]) -> float:
-    text_low = text.lower()
-    skills_list = list(skills)
-    hits = 0
-    for s in skills_list:
-        s_low = s.lower()
-        exact = s_low in text_low
-        fuzzy = fuzz.partial_ratio(s_low, text_low) > 90
-        hits += 1 if (exact or fuzzy) else 0
-    return hits / max(len(skills_list), 1)
+    return match_skills(text, skills).score
@@ -0,0 +1,216 @@
+"""Overlap pipeline stages with threads joined by bounded queues.
+
+`run_stages` drains a source iterator in one thread, runs every stage but the last in a
+thread of its own and the last in the caller's thread, which is where SQLite handles
+(the embedding store) and the model can stay. Queues hold at most `maxsize` items, so a
+slow stage stalls the ones before it (backpressure) instead of letting items pile up.
+Extraction already runs in worker processes and the transformer releases the GIL, so
+parsing, rule scoring and embedding make progress at the same time.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+_DONE = object()
+_POLL = 0.1  # seconds between checks of the stop flag while waiting on a queue
+
+
+class _Stopped(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Any]  # item -> item, or list -> list when `batch` is set
+    batch: Optional[int] = None  # gather this many items per call (fewer at the end)
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    busy: float = 0.0  # seconds working
+    idle: float = 0.0  # seconds waiting for input
+    blocked: float = 0.0  # seconds waiting for room downstream
+    depth_sum: int = 0  # input queue length, sampled at every take
+    depth_max: int = 0
+    samples: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items per busy second: the rate this stage could sustain if never starved."""
+        return self.items / self.busy if self.busy > 0 else 0.0
+
+    @property
+    def mean_depth(self) -> float:
+        return self.depth_sum / self.samples if self.samples else 0.0
+
+
+@dataclass
+class PipelineStats:
+    stages: List[StageStats] = field(default_factory=list)
+    seconds: float = 0.0
+    maxsize: int = 0
+
+    def bottleneck(self) -> Optional[str]:
+        """The stage that spent the most time working."""
+        return max(self.stages, key=lambda s: s.busy).name if self.stages else None
+
+    def summary(self) -> str:
+        lines = [
+            f"Pipeline: {self.seconds:.2f}s wall, queues of {self.maxsize}, "
+            f"bottleneck {self.bottleneck()}"
+        ]
+        for s in self.stages:
+            lines.append(
+                f"  {s.name:<8} {s.items:>7} items  {s.throughput:8.1f}/s busy  "
+                f"busy {s.busy:6.2f}s  idle {s.idle:6.2f}s  blocked {s.blocked:6.2f}s  "
+                f"queue mean {s.mean_depth:5.1f} max {s.depth_max}"
+            )
+        return "\n".join(lines)
+
+
+class _Runner:
+    def __init__(self, maxsize: int):
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+        self.maxsize = maxsize
+
+    def put(self, q: queue.Queue, item: Any, st: StageStats) -> None:
+        t0 = time.perf_counter()
+        while True:
+            try:
+                q.put(item, timeout=_POLL)
+                break
+            except queue.Full:
+                if self.stop.is_set():
+                    raise _Stopped
+        st.blocked += time.perf_counter() - t0
+
+    def get(self, q: queue.Queue, st: StageStats) -> Any:
+        depth = q.qsize()
+        st.depth_sum += depth
+        st.depth_max = max(st.depth_max, depth)
+        st.samples += 1
+        t0 = time.perf_counter()
+        while True:
+            try:
+                item = q.get(timeout=_POLL)
+                break
+            except queue.Empty:
+                if self.stop.is_set():
+                    raise _Stopped
+        st.idle += time.perf_counter() - t0
+        return item
+
+    def take(self, q: queue.Queue, stage: Stage, st: StageStats) -> Optional[List[Any]]:
+        """Next batch (or single item) for `stage`; None once upstream is exhausted."""
+        items: List[Any] = []
+        want = stage.batch or 1
+        while len(items) < want:
+            item = self.get(q, st)
+            if item is _DONE:
+                q.put(_DONE)  # leave the marker for the next take
+                break
+            items.append(item)
+        return items or None
+
+    def apply(self, stage: Stage, st: StageStats, items: List[Any]) -> List[Any]:
+        t0 = time.perf_counter()
+        out = stage.fn(items) if stage.batch else [stage.fn(items[0])]
+        st.busy += time.perf_counter() - t0
+        st.items += len(items)
+        return out
+
+    def fail(self, e: BaseException) -> None:
+        self.errors.append(e)
+        self.stop.set()
+
+
+def _source_thread(run: _Runner, source: Iterable[Any], out: queue.Queue, st: StageStats):
+    it = iter(source)
+    try:
+        while True:
+            t0 = time.perf_counter()
+            item = next(it, _DONE)
+            st.busy += time.perf_counter() - t0
+            if item is _DONE:
+                break
+            st.items += 1
+            run.put(out, item, st)
+        run.put(out, _DONE, st)
+    except _Stopped:
+        pass
+    except BaseException as e:
+        run.fail(e)
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()  # runs the source generator's cleanup in the thread that opened it
+
+
+def _stage_thread(run: _Runner, stage: Stage, inq: queue.Queue, out: queue.Queue, st: StageStats):
+    try:
+        while (items := run.take(inq, stage, st)) is not None:
+            for r in run.apply(stage, st, items):
+                run.put(out, r, st)
+        run.put(out, _DONE, st)
+    except _Stopped:
+        pass
+    except BaseException as e:
+        run.fail(e)
+
+
+def run_stages(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    maxsize: int = 256,
+    source_name: str = "source",
+    stats: Optional[PipelineStats] = None,
+) -> Iterator[Any]:
+    """Yield the last stage's outputs; an error in any stage is re-raised here."""
+    if not stages:
+        raise ValueError("run_stages needs at least one stage")
+    run = _Runner(maxsize)
+    sts = [StageStats(source_name)] + [StageStats(s.name) for s in stages]
+    queues = [queue.Queue(maxsize) for _ in stages]
+    # each thread runs in a copy of the caller's context, so it reports to the same tracer
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_source_thread, run, source, queues[0], sts[0]),
+            daemon=True,
+        )
+    ]
+    for i, stage in enumerate(stages[:-1]):
+        threads.append(
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(_stage_thread, run, stage, queues[i], queues[i + 1], sts[i + 1]),
+                daemon=True,
+            )
+        )
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    last, st = stages[-1], sts[-1]
+    try:
+        while (items := run.take(queues[-1], last, st)) is not None:
+            yield from run.apply(last, st, items)
+    except _Stopped:
+        pass
+    finally:
+        run.stop.set()
+        for t in threads:
+            t.join()
+        if stats is not None:
+            stats.stages = sts
+            stats.seconds = time.perf_counter() - t0
+            stats.maxsize = maxsize
+    if run.errors:
+        raise run.errors[0]
@@ -0,0 +1,238 @@
+"""Deterministic synthetic resumes and job descriptions for benchmarks and tests.
+
+The same (n, seed) always gives the same texts. Each resume has dated roles written in
+the formats `experience` parses ("Aug 2018 - Jun 2021", "03/2019 - 11/2022",
+"Jan 2022 - Present"), a skills line drawn from the default skill list plus distractors,
+and filler prose. The PDF writer is a hand-rolled minimal PDF (Helvetica, text operators
+only), so generating 100k files needs no PDF library.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from .config import Config
+
+SCALES: Dict[str, int] = {"100": 100, "1k": 1_000, "10k": 10_000, "100k": 100_000}
+FORMATS = ("txt", "docx", "pdf")
+
+_MONTHS = "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split()
+_EXTRA_SKILLS = [
+    "java",
+    "excel",
+    "tableau",
+    "spark",
+    "airflow",
+    "docker",
+    "kubernetes",
+    "aws",
+    "gcp",
+    "power bi",
+    "javascript",
+    "react",
+    "scala",
+    "tensorflow",
+    "pytorch",
+    "dbt",
+]
+_TITLES = [
+    "Data Analyst",
+    "Data Engineer",
+    "Software Engineer",
+    "ML Engineer",
+    "BI Developer",
+    "Analytics Consultant",
+    "Research Assistant",
+]
+_COMPANIES = [
+    "Acme Corp",
+    "Globex",
+    "Initech",
+    "Umbrella Labs",
+    "Hooli",
+    "Stark Industries",
+    "Wayne Analytics",
+    "Cyberdyne",
+    "Soylent Data",
+    "Vandelay Imports",
+]
+_VERBS = [
+    "Built",
+    "Led",
+    "Automated",
+    "Designed",
+    "Maintained",
+    "Migrated",
+    "Optimized",
+    "Delivered",
+    "Analyzed",
+    "Deployed",
+]
+_OBJECTS = [
+    "reporting pipelines",
+    "customer churn models",
+    "ETL jobs",
+    "KPI dashboards",
+    "data quality checks",
+    "forecasting services",
+    "A/B test analyses",
+    "feature stores",
+    "ad-hoc SQL reports",
+    "batch scoring jobs",
+]
+_OUTCOMES = [
+    "cutting runtime by 40%",
+    "for 12 business teams",
+    "serving 2M users",
+    "saving 10 hours a week",
+    "with 99.9% uptime",
+    "across three regions",
+]
+
+
+def _date_range(rng: random.Random, start_year: int) -> tuple:
+    sm, sy = rng.randint(1, 12), start_year
+    months = rng.randint(6, 48)
+    em, ey = (sm + months - 1) % 12 + 1, sy + (sm + months - 1) // 12
+    style = rng.random()
+    if style < 0.5:
+        text = f"{_MONTHS[sm - 1]} {sy} - {_MONTHS[em - 1]} {ey}"
+    else:
+        text = f"{sm:02d}/{sy} - {em:02d}/{ey}"
+    return text, ey
+
+
+def make_resume(rng: random.Random, i: int) -> str:
+    skills = Config().skills
+    picked = rng.sample(skills, rng.randint(0, len(skills)))
+    picked += rng.sample(_EXTRA_SKILLS, rng.randint(1, 6))
+    rng.shuffle(picked)
+    lines = [
+        f"Candidate {i:06d}",
+        f"candidate{i}@example.com | +1 555 {i % 10000:04d}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(_TITLES)} with hands-on work in {', '.join(picked[:3]) or 'analytics'}.",
+        "",
+        "SKILLS",
+        ", ".join(picked),
+        "",
+        "EXPERIENCE",
+    ]
+    year = rng.randint(2008, 2020)
+    for _ in range(rng.randint(1, 4)):
+        dates, end = _date_range(rng, year)
+        lines.append(f"{rng.choice(_TITLES)}, {rng.choice(_COMPANIES)}  {dates}")
+        for _ in range(rng.randint(2, 6)):
+            lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_OUTCOMES)}.")
+        year = end + rng.randint(0, 1)
+    if year <= 2024 and rng.random() < 0.5:
+        lines.append(
+            f"{rng.choice(_TITLES)}, {rng.choice(_COMPANIES)}  "
+            f"{_MONTHS[rng.randint(0, 11)]} {year} - Present"
+        )
+        lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_OUTCOMES)}.")
+    lines += ["", "EDUCATION", f"B.Sc. Computer Science, State University {year - 10}"]
+    return "\n".join(lines)
+
+
+def make_jd(rng: random.Random) -> str:
+    skills = rng.sample(Config().skills, 5)
+    return "\n".join(
+        [
+            f"{rng.choice(_TITLES)}",
+            f"We are looking for someone with {rng.randint(2, 6)}+ years of experience.",
+            f"Must have: {', '.join(skills[:3])}. Nice to have: {', '.join(skills[3:])}.",
+            f"You will own {rng.choice(_OBJECTS)} and {rng.choice(_OBJECTS)}.",
+        ]
+    )
+
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text: str, lines_per_page: int = 60) -> bytes:
+    """A minimal valid PDF: one Helvetica text block per page, latin-1 text."""
+    lines = text.encode("latin-1", "replace").decode("latin-1").split("\n")
+    pages = [lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objs: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]  # pages filled in below
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")  # obj 3
+    kids = []
+    for page in pages:
+        body = (
+            "BT /F1 10 Tf 12 TL 50 760 Td\n"
+            + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page)
+            + "ET"
+        )
+        stream = body.encode("latin-1")
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content = len(objs)
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content
+        )
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
+
+
+def write_docx(path: Path, text: str) -> None:
+    from datetime import datetime
+
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.core_properties.created = doc.core_properties.modified = datetime(2024, 1, 1)
+    doc.save(str(path))
+
+
+def write_resume(path: Path, text: str) -> None:
+    fmt = path.suffix.lower().lstrip(".")
+    if fmt == "pdf":
+        path.write_bytes(pdf_bytes(text))
+    elif fmt == "docx":
+        write_docx(path, text)
+    else:
+        path.write_text(text, encoding="utf-8")
+
+
+def generate_corpus(out_dir: Path, n: int, seed: int = 0, formats: Sequence[str] = FORMATS) -> Path:
+    """Write `n` resumes (cycling through `formats`) under out_dir/resumes plus out_dir/jd.txt.
+
+    Returns out_dir/resumes. Files already present are kept, so an interrupted or smaller
+    earlier run of the same seed is extended rather than rewritten; files beyond `n` (or
+    of other formats) are removed.
+    """
+    bad = set(formats) - set(FORMATS)
+    if bad or not formats:
+        raise ValueError(f"formats must be drawn from {FORMATS}, got {list(formats)}")
+    res = out_dir / "resumes"
+    res.mkdir(parents=True, exist_ok=True)
+    (out_dir / "jd.txt").write_text(make_jd(random.Random(seed)), encoding="utf-8")
+    wanted = set()
+    for i in range(n):
+        path = res / f"{i // 1000:03d}" / f"r{i:06d}.{formats[i % len(formats)]}"
+        wanted.add(path)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # one generator per file, so file i is the same whatever n or the formats are
+            write_resume(path, make_resume(random.Random(f"{seed}:{i}"), i))
+    for path in res.glob("*/r*.*"):
+        if path not in wanted:
+            path.unlink()
+    return res
@@ -0,0 +1,176 @@
+"""Spans and counters for the ranking hot paths, free when nobody is listening.
+
+Instrumented code calls `span("skills", file=name)` and `count("extract.cache_hit")`.
+While no `Tracer` is active, `span` returns one shared no-op context manager and `count`
+returns at once: a global lookup and a call per use. `tracing()` installs a tracer for
+the duration of a block; its `metrics()` (per-span count/total/mean/max plus counters)
+serve the CLI, the Streamlit app and the HTTP service alike, and with `events=True` it
+also keeps every span for `chrome_trace()` (load in chrome://tracing or Perfetto) and
+`slowest_files()`.
+
+The active tracer lives in a `ContextVar`, so tracing in one thread (a Streamlit session)
+or task (an HTTP request) never sees another's spans. Threads started inside a traced
+block inherit it only when run under a copy of the context (`contextvars.copy_context`),
+as `stages.run_stages` does.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar(
+    "resume_ranker_tracer", default=None
+)
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "t0")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer, self.name, self.args = tracer, name, args
+
+    def __enter__(self) -> "_Span":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.add(self.name, self.t0, time.perf_counter() - self.t0, self.args)
+
+
+class Tracer:
+    """Collects spans and counters from every thread of this process."""
+
+    def __init__(self, events: bool = True, max_events: int = 1_000_000):
+        self.events = events
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Tuple[str, float, float, int, Dict[str, Any]]] = []
+        self._agg: Dict[str, List[float]] = {}  # name -> [count, total, max]
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def add(self, name: str, start: float, seconds: float, args: Dict[str, Any]) -> None:
+        with self._lock:
+            a = self._agg.get(name)
+            if a is None:
+                self._agg[name] = [1, seconds, seconds]
+            else:
+                a[0] += 1
+                a[1] += seconds
+                a[2] = max(a[2], seconds)
+            if self.events:
+                if len(self._events) < self.max_events:
+                    self._events.append((name, start, seconds, threading.get_ident(), args))
+                else:
+                    self.dropped += 1
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = {
+                name: {
+                    "count": int(c),
+                    "total_s": round(t, 6),
+                    "mean_ms": round(1000 * t / c, 4),
+                    "max_ms": round(1000 * m, 4),
+                }
+                for name, (c, t, m) in sorted(self._agg.items(), key=lambda kv: -kv[1][1])
+            }
+            return {"spans": spans, "counters": dict(self.counters)}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format: one complete ("X") event per span, microsecond units."""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": name,
+                    "cat": name.split(".")[0],
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": round((start - self._origin) * 1e6, 3),
+                    "dur": round(secs * 1e6, 3),
+                    "args": args,
+                }
+                for name, start, secs, tid, args in self._events
+            ]
+            counters = dict(self.counters)
+        end = round((time.perf_counter() - self._origin) * 1e6, 3)
+        if counters:
+            events.append(
+                {"name": "counters", "ph": "C", "pid": pid, "tid": 0, "ts": end, "args": counters}
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()))
+
+    def slowest_files(self, n: int = 10) -> List[Tuple[str, float, Dict[str, float]]]:
+        """(file, seconds, seconds per span name) for the `n` files that cost the most."""
+        per: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for name, _, secs, _, args in self._events:
+                f = args.get("file")
+                if f is not None:
+                    d = per.setdefault(f, {})
+                    d[name] = d.get(name, 0.0) + secs
+        ranked = sorted(per.items(), key=lambda kv: -sum(kv[1].values()))[:n]
+        return [(f, sum(parts.values()), parts) for f, parts in ranked]
+
+
+def span(name: str, **args: Any):
+    """Time the enclosed block as `name` (args such as file= go into the trace)."""
+    t = _tracer.get()
+    if t is None:
+        return _NULL
+    return _Span(t, name, args)
+
+
+def record(name: str, seconds: float, **args: Any) -> None:
+    """Add a span measured elsewhere (e.g. in a worker process) that ended just now."""
+    t = _tracer.get()
+    if t is not None:
+        t.add(name, time.perf_counter() - seconds, seconds, args)
+
+
+def count(name: str, n: float = 1) -> None:
+    t = _tracer.get()
+    if t is not None:
+        t.count(name, n)
+
+
+def active() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+@contextmanager
+def use(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Make `tracer` the active one in the current context for the block."""
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def tracing(events: bool = True) -> Iterator[Tracer]:
+    """Install a fresh Tracer for the block, in this thread or task only."""
+    with use(Tracer(events=events)) as tracer:
+        yield tracer
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from resume_ranker import embed
+
+
+class FakeModel:
+    """Bag-of-letters encoder standing in for the transformer."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 26
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, **kwargs):
+        self.calls.append(len(texts))
+        out = np.zeros((len(texts), 26), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for ch in t.lower():
+                if "a" <= ch <= "z":
+                    out[i, ord(ch) - 97] += 1
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    fake = FakeModel()
+    monkeypatch.setattr(embed, "_model", fake)
+    return fake
+
+
+@pytest.fixture
+def restore_backend(monkeypatch):
+    """Undo any embed.use_backend / configure done by the test."""
+    for name in ("_model", "_backend", "_onnx_dir", "_threads"):
+        monkeypatch.setattr(embed, name, getattr(embed, name))
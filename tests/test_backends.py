@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from resume_ranker import embed
+from resume_ranker.config import Config
+from resume_ranker.pipeline import rank
+
+SAMPLES = Path(__file__).resolve().parents[1] / "samples"
+
+
+def test_sklearn_backend_is_stateless_and_ranks(tmp_path, restore_backend):
+    embed.use_backend("sklearn")
+    texts = ["python sql pandas analyst", "python sql analyst", "forklift warehouse operator"]
+    a = embed.encode(texts)
+    embed.use_backend("torch")
+    embed.use_backend("sklearn")  # fresh encoder instance
+    b = embed.encode(texts[::-1])[::-1]
+    assert np.array_equal(a, b)
+    assert np.allclose(np.linalg.norm(a, axis=1), 1.0, atol=1e-5)
+    assert a[0] @ a[1] > a[0] @ a[2]
+    assert embed.model_id() == "sklearn-hashing-384"
+
+    cfg = Config(embed_backend="sklearn", cache_dir=tmp_path / "cache")
+    df = rank(SAMPLES / "jd" / "product-analyst.txt", SAMPLES / "resumes", cfg=cfg)
+    assert len(df) == 2 and df["sim"].between(-1, 1).all()
+
+
+def _tiny_onnx_model(root: Path, dim: int = 8) -> np.ndarray:
+    """Word-level tokenizer + embedding-lookup ONNX graph shaped like a BERT export."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("transformers")
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "python": 2, "sql": 3, "pandas": 4, "forklift": 5}
+    tok = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tok.pre_tokenizer = pre_tokenizers.Whitespace()
+    PreTrainedTokenizerFast(
+        tokenizer_object=tok, pad_token="[PAD]", unk_token="[UNK]"
+    ).save_pretrained(str(root))
+
+    table = np.random.default_rng(0).normal(size=(len(vocab), dim)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["last_hidden_state"])],
+        "tiny",
+        [
+            helper.make_tensor_value_info(n, TensorProto.INT64, ["b", "t"])
+            for n in ("input_ids", "attention_mask", "token_type_ids")
+        ],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["b", "t", dim])],
+        [numpy_helper.from_array(table, "table")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=8)
+    onnx.save(model, str(root / "model.onnx"))
+    return table
+
+
+def test_onnx_backend_mean_pools_masked_tokens(tmp_path, restore_backend):
+    table = _tiny_onnx_model(tmp_path)
+    embed.use_backend("onnx", tmp_path)
+    out = embed.encode(["python sql", "pandas", "python zzz forklift"], batch_size=2)
+
+    def ref(ids):
+        v = table[ids].mean(0)
+        return v / np.linalg.norm(v)
+
+    expected = np.array([ref([2, 3]), ref([4]), ref([2, 1, 5])])
+    assert np.allclose(out, expected, atol=1e-5)
+    st = (tmp_path / "model.onnx").stat()
+    ident = f"all-MiniLM-L6-v2@onnx:{(tmp_path / 'model.onnx').resolve()}:{st.st_size}"
+    assert embed.model_id() == f"{ident}:{st.st_mtime_ns}"
+    os.utime(tmp_path / "model.onnx", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert embed.model_id() != f"{ident}:{st.st_mtime_ns}"  # re-exported in place
+
+    # an int8 export next to it takes precedence and stays close to float32
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        str(tmp_path / "model.onnx"),
+        str(tmp_path / "model_quantized.onnx"),
+        op_types_to_quantize=["Gather"],
+        weight_type=QuantType.QInt8,
+    )
+    embed.use_backend("torch")
+    embed.use_backend("onnx", tmp_path)
+    q = embed.encode(["python sql", "pandas", "python zzz forklift"])
+    assert embed.get_model().path.name == "model_quantized.onnx"
+    assert np.abs(q - expected).max() < 0.05
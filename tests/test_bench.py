@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from resume_ranker.bench import regressions
+from resume_ranker.cli import app
+from resume_ranker.experience import estimate_experience_years
+from resume_ranker.io import extract_file
+from resume_ranker.skills import score_skills
+from resume_ranker.synth import generate_corpus
+
+
+def test_corpus_is_deterministic_and_parseable(tmp_path):
+    a = generate_corpus(tmp_path / "a", 6)
+    b = generate_corpus(tmp_path / "b", 9)
+    files = sorted(p.relative_to(a) for p in a.rglob("r*.*"))
+    assert [p.suffix for p in files] == [".txt", ".docx", ".pdf"] * 2
+    for rel in files:
+        text = extract_file(a / rel)
+        assert text.strip() == extract_file(b / rel).strip()
+        assert estimate_experience_years(text) > 0
+        assert "EXPERIENCE" in text and score_skills(text, ["python", "sql", "java"]) >= 0
+    generate_corpus(tmp_path / "b", 3, formats=["txt"])
+    assert sorted(p.name for p in (tmp_path / "b" / "resumes").rglob("r*.*")) == [
+        "r000000.txt",
+        "r000001.txt",
+        "r000002.txt",
+    ]
+
+
+def _result(**ms):
+    return {"stages": {k: {"seconds": v, "ms_per_doc": v * 10} for k, v in ms.items()}}
+
+
+def test_regressions_respect_tolerance_and_noise_floor():
+    base = _result(extract=1.0, skills=0.01, embed=2.0)
+    assert regressions(_result(extract=1.2, skills=0.03, embed=1.0), base) == []
+    found = regressions(_result(extract=1.3, skills=0.01, embed=2.0), base)
+    assert len(found) == 1 and found[0].startswith("extract:")
+
+    with pytest.raises(ValueError, match="model 'a' vs baseline 'b'"):
+        regressions(dict(base, model="a", machine="x86"), dict(base, model="b", machine="x86"))
+
+
+def test_bench_command_gates_on_baseline(tmp_path, restore_backend):
+    out, base = tmp_path / "run.json", tmp_path / "base.json"
+    common = ["bench", "--scale", "9", "--backend", "sklearn", "--workdir", str(tmp_path / "c")]
+    r = CliRunner().invoke(app, [*common, "--out", str(out)])
+    assert r.exit_code == 0, r.output
+    result = json.loads(out.read_text())
+    assert result["docs"] == 9
+    assert set(result["stages"]) == {"extract", "skills", "experience", "embed", "rank"}
+
+    fast = dict(result, stages={k: {"seconds": 10.0, "ms_per_doc": 1e-6} for k in result["stages"]})
+    base.write_text(json.dumps(fast))
+    r = CliRunner().invoke(app, [*common, "--baseline", str(base)])
+    assert r.exit_code == 1 and "REGRESSION" in r.output
+
+    base.write_text(json.dumps(dict(fast, machine="another-arch")))
+    r = CliRunner().invoke(app, [*common, "--baseline", str(base)])
+    assert r.exit_code == 2 and "machine" in r.output
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+from docx import Document
+
+from resume_ranker.budget import ExtractLimits
+from resume_ranker.io import LoadStats, extract_file, load_resumes
+
+
+def test_docx_early_exit(tmp_path):
+    doc = Document()
+    for i in range(100):
+        doc.add_paragraph(f"paragraph {i} " + "x" * 50)
+    doc.save(tmp_path / "long.docx")
+    full = extract_file(tmp_path / "long.docx")
+    short = extract_file(tmp_path / "long.docx", max_chars=200)
+    assert full.startswith(short) and 200 <= len(short) < 300
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="needs FIFOs and RLIMIT_AS")
+def test_failures_are_recorded_not_raised(tmp_path):
+    folder = tmp_path / "res"
+    folder.mkdir()
+    (folder / "ok.txt").write_text("python sql")
+    (folder / "broken.pdf").write_bytes(b"not a pdf at all")
+    os.mkfifo(folder / "stuck.txt")  # no writer: reading blocks forever
+    with open(folder / "huge.txt", "wb") as fh:
+        fh.truncate(256 * 1024 * 1024)  # sparse; reading it needs far more than the ceiling
+
+    stats = LoadStats()
+    limits = ExtractLimits(timeout=3, max_memory_mb=64)
+    got = load_resumes(folder, stats=stats, workers=2, limits=limits)
+
+    assert got == [("ok", "python sql")]
+    kinds = {os.path.basename(e.path): e.kind for e in stats.errors}
+    assert kinds == {"broken.pdf": "error", "stuck.txt": "timeout", "huge.txt": "memory"}
+    assert set(stats.timings) == {str(p) for p in folder.iterdir()}
+    assert "3 failed" in stats.summary()
@@ -0,0 +1,96 @@
+import numpy as np
+
+from resume_ranker import embed
+from resume_ranker.cache import EmbeddingStore, text_hash
+
+
+def test_store_roundtrip_and_model_invalidation(tmp_path):
+    store = EmbeddingStore(tmp_path, model="m1")
+    vecs = np.eye(3, 4, dtype=np.float32)
+    hashes = [text_hash(t) for t in ("a", "b", "c")]
+    store.put_many(hashes, vecs)
+    got = store.get_many(hashes)
+    assert np.array_equal(got[hashes[1]], vecs[1])
+    store.close()
+
+    assert len(EmbeddingStore(tmp_path, model="m1")) == 3
+    assert len(EmbeddingStore(tmp_path, model="m2")) == 0
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = EmbeddingStore(tmp_path, model="m", max_mb=1.0)
+    dim = 1000  # 4 KB per row -> 250 rows per MB
+    first = [text_hash(f"old{i}") for i in range(200)]
+    store.put_many(first, np.ones((200, dim), dtype=np.float32))
+    store.get_many(first[:10])  # touch
+    second = [text_hash(f"new{i}") for i in range(100)]
+    store.put_many(second, np.ones((100, dim), dtype=np.float32))
+    assert len(store) == 250
+    assert len(store.get_many(first[:10])) == 10
+    assert len(store.get_many(second)) == 100
+    assert len(store.get_many(first[10:])) == 140
+
+
+def test_encode_only_runs_model_on_misses(tmp_path, fake_model):
+    store = EmbeddingStore(tmp_path, model="fake")
+    first = embed.encode(["python", "sql"], store=store)
+    again = embed.encode(["sql", "pandas", "python"], store=store)
+    assert fake_model.calls == [2, 1]
+    assert np.array_equal(again[0], first[1])
+    assert np.array_equal(again[2], first[0])
+
+
+def test_text_cache_skips_unchanged_files(tmp_path, monkeypatch):
+    from resume_ranker import io
+    from resume_ranker.cache import TextCache
+
+    folder = tmp_path / "res"
+    folder.mkdir()
+    (folder / "a.pdf").write_bytes(b"%PDF a")
+    (folder / "b.docx").write_bytes(b"docx b")
+    parsed = []
+    monkeypatch.setattr(io, "extract_file", lambda p, **kw: parsed.append(p.name) or p.name.upper())
+
+    cache = TextCache(tmp_path / "cache")
+    first = io.load_resumes(folder, cache=cache)
+    (folder / "c.pdf").write_bytes(b"%PDF c")
+    stats = io.LoadStats()
+    second = io.load_resumes(folder, cache=cache, stats=stats)
+
+    assert sorted(parsed) == ["a.pdf", "b.docx", "c.pdf"]
+    assert set(first) <= set(second)
+    assert (stats.files, stats.cache_hits, stats.cache_misses) == (3, 2, 1)
+
+
+def _put_range(root, start):
+    store = EmbeddingStore(root, model="m")
+    for i in range(start, start + 60, 3):  # the two writers overlap on half of the texts
+        hashes = [text_hash(f"t{j}") for j in range(i, i + 3)]
+        store.put_many(hashes, np.array([[j, -j] for j in range(i, i + 3)], dtype=np.float32))
+    store.close()
+
+
+def test_store_is_safe_with_concurrent_writers(tmp_path):
+    import multiprocessing
+
+    EmbeddingStore(tmp_path, model="m").close()
+    procs = [multiprocessing.Process(target=_put_range, args=(tmp_path, s)) for s in (0, 30)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert [p.exitcode for p in procs] == [0, 0]
+    store = EmbeddingStore(tmp_path, model="m")
+    got = store.get_many([text_hash(f"t{j}") for j in range(90)])
+    assert len(got) == 90
+    assert all(np.array_equal(got[text_hash(f"t{j}")], [j, -j]) for j in range(90))
+
+
+def test_store_reuses_evicted_rows(tmp_path):
+    store = EmbeddingStore(tmp_path, model="m", max_mb=0.04)  # 10 rows of 1000 floats
+    for i in range(5):
+        hashes = [text_hash(f"b{i}.{j}") for j in range(10)]
+        store.put_many(hashes, np.full((10, 1000), i, dtype=np.float32))
+    assert len(store) == 10
+    assert store._capacity() == 20  # the limit plus one batch, then evicted rows are reused
+    assert np.array_equal(store.get_many(hashes)[hashes[0]], np.full(1000, 4))
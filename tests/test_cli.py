@@ -0,0 +1,174 @@
+import json
+import re
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from resume_ranker import daemon, embed
+
+HEAVY = ("torch", "sentence_transformers", "pandas", "sklearn")
+
+# budget for `import resume_ranker.cli` (cumulative microseconds from -X importtime)
+IMPORT_BUDGET_US = 1_500_000
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True
+    )
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["rank", "--help"], ["rank", "--top-k", "x"]])
+def test_help_and_bad_args_skip_heavy_imports(argv):
+    code = (
+        "import json, sys\n"
+        "from resume_ranker.cli import app\n"
+        f"try:\n    app({argv!r})\nexcept SystemExit:\n    pass\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]), file=sys.stderr)\n"
+    )
+    proc = _run(code)
+    assert json.loads(proc.stderr.strip().splitlines()[-1]) == []
+
+
+def test_cli_import_time_budget():
+    proc = _run("import resume_ranker.cli")
+    cumulative = [
+        int(m.group(1))
+        for m in re.finditer(r"\|\s*(\d+) \| resume_ranker\.cli$", proc.stderr, re.M)
+    ]
+    assert cumulative and cumulative[0] < IMPORT_BUDGET_US
+
+
+def test_encode_goes_through_model_daemon(tmp_path, monkeypatch, fake_model):
+    import threading
+
+    sock = tmp_path / "m.sock"
+    server = daemon.ModelServer(sock, model=fake_model)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        monkeypatch.setattr(embed, "_model", None)
+        monkeypatch.setenv("RESUME_RANKER_MODEL_SOCKET", str(sock))
+        stats = embed.EncodeStats()
+        out = embed.encode(["python sql", "java"], stats=stats)
+        assert fake_model.calls == [2] and stats.texts == 2
+        assert embed._model is None  # nothing loaded in this process
+        assert np.allclose(
+            out, fake_model.encode(["python sql", "java"], normalize_embeddings=True)
+        )
+        assert embed.embedding_dim() == 26
+    finally:
+        daemon.disconnect()
+        server.shutdown()
+        server.server_close()
+
+
+def test_encode_falls_back_when_the_daemon_hangs(tmp_path, monkeypatch, fake_model):
+    import socket
+
+    sock = tmp_path / "m.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(sock))
+    listener.listen(1)  # connects, never answers
+    try:
+        monkeypatch.setattr(embed, "_model", None)
+        monkeypatch.setattr(embed, "get_model", lambda: fake_model)
+        monkeypatch.setattr(daemon, "READ_TIMEOUT", 0.2)
+        monkeypatch.setenv("RESUME_RANKER_MODEL_SOCKET", str(sock))
+        out = embed.encode(["python sql"])
+        assert fake_model.calls == [1]  # encoded in this process after the timeout
+        assert np.allclose(out, fake_model.encode(["python sql"], normalize_embeddings=True))
+        assert daemon.connect() is None  # not retried
+    finally:
+        daemon.disconnect()
+        daemon._failed.discard(str(sock))
+        listener.close()
+
+
+def test_daemon_errors_fall_back_and_live_sockets_are_kept(tmp_path, monkeypatch, fake_model):
+    import socket
+    import threading
+
+    class Broken:
+        def get_sentence_embedding_dimension(self):
+            return 26
+
+        def encode(self, *a, **kw):
+            raise ValueError("out of memory")
+
+    sock = tmp_path / "m.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(sock))
+    stale.close()  # the socket file outlives its listener
+    server = daemon.ModelServer(sock, model=Broken())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(daemon.DaemonError, match="already listening"):
+            daemon.ModelServer(sock, model=fake_model)
+        assert sock.exists()
+
+        monkeypatch.setattr(embed, "_model", None)
+        monkeypatch.setattr(embed, "get_model", lambda: fake_model)
+        monkeypatch.setenv("RESUME_RANKER_MODEL_SOCKET", str(sock))
+        out = embed.encode(["python sql"])
+        assert fake_model.calls == [1]  # the daemon failed, so encoded here
+        assert np.allclose(out, fake_model.encode(["python sql"], normalize_embeddings=True))
+    finally:
+        daemon.disconnect()
+        daemon._failed.discard(str(sock))
+        server.shutdown()
+        server.server_close()
+
+
+def test_rank_cli_manifest_mode(tmp_path, fake_model):
+    import json
+
+    from typer.testing import CliRunner
+
+    from resume_ranker.cli import app
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    res_dir = tmp_path / "res"
+    res_dir.mkdir()
+    (res_dir / "a.txt").write_text("I love Python and SQL for analytics")
+    base = [
+        "rank",
+        "--jd",
+        str(jd),
+        "--resumes",
+        str(res_dir),
+        "--no-cache",
+        "--manifest",
+        str(tmp_path / "m.json"),
+    ]
+    for flag in (["--streaming"], ["--staged"], ["--cascade", "50%"]):
+        r = CliRunner().invoke(app, base + flag)
+        assert r.exit_code != 0 and "--manifest cannot be combined" in r.output
+
+    report = tmp_path / "report.json"
+    r = CliRunner().invoke(app, base + ["--extract-report", str(report)])
+    assert r.exit_code == 0, r.output
+    assert "Loaded 1 files" in r.output
+    assert json.loads(report.read_text())["errors"] == []
+
+
+@pytest.mark.parametrize(
+    "flags, message",
+    [
+        (["--cascade", "50%", "--streaming"], "--cascade cannot be combined"),
+        (["--cascade", "50%", "--staged"], "--cascade cannot be combined"),
+        (["--streaming", "--staged"], "--streaming cannot be combined"),
+        (["--check-recall"], "--check-recall needs --cascade"),
+    ],
+)
+def test_rank_rejects_options_it_would_ignore(tmp_path, flags, message):
+    from typer.testing import CliRunner
+
+    from resume_ranker.cli import app
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python")
+    r = CliRunner().invoke(app, ["rank", "--jd", str(jd), "--resumes", str(tmp_path), *flags])
+    assert r.exit_code != 0 and message in r.output
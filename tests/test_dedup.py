@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from resume_ranker.config import Config
+from resume_ranker.dedup import Deduper, dedup
+from resume_ranker.io import LoadStats
+
+WORDS = (
+    "python sql pandas numpy etl airflow spark dashboard analyst engineer team led built "
+    "pipeline model deployed reporting stakeholders cloud aws docker testing metrics"
+).split()
+
+
+def _resume(seed: int, n: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def test_near_duplicates_fold_into_first_copy():
+    base = _resume(0)
+    edited = base.upper().replace(" ", "  ", 5) + " references available on request"
+    items = [("a", base), ("b", _resume(1)), ("a_copy", edited), ("c", _resume(2))]
+    aliases, stats = {}, LoadStats()
+    kept = list(dedup(items, aliases=aliases, stats=stats))
+    assert [n for n, _ in kept] == ["a", "b", "c"]
+    assert aliases == {"a": ["a_copy"]}
+    assert stats.duplicates == 1 and stats.duplicate_chars == len(edited)
+    assert "1 near-duplicates folded" in stats.summary()
+
+
+def test_distinct_and_empty_texts_are_kept():
+    d = Deduper()
+    assert all(d.add(str(i), _resume(i)) is None for i in range(50))
+    assert d.add("x", "") is None and d.add("y", "") is None
+
+
+def test_rank_scores_duplicates_once(tmp_path, fake_model):
+    from resume_ranker.pipeline import rank
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas analyst")
+    res = tmp_path / "res"
+    res.mkdir()
+    (res / "ann.txt").write_text(_resume(3))
+    (res / "ann_v2.txt").write_text(_resume(3) + " python")
+    (res / "bob.txt").write_text(_resume(4))
+    cfg = Config(dedup=True)
+    df = rank(jd, res, top_k=5, cfg=cfg)
+    assert sum(fake_model.calls) == 3  # the JD and two resumes
+    assert sorted(df["candidate"]) == ["ann", "bob"]
+    assert dict(zip(df["candidate"], df["aliases"])) == {"ann": "ann_v2", "bob": ""}
+    streamed = rank(jd, res, top_k=5, cfg=cfg, streaming=True)
+    assert set(streamed["candidate"]) == {"ann", "bob"}
+
+
+def test_kept_copy_does_not_depend_on_arrival_order():
+    from resume_ranker.dedup import dedup_stream
+
+    base = _resume(5)
+    items = [("z", base), ("b", _resume(6)), ("m", base + " docker"), ("a", base + " aws")]
+    aliases, stats = {}, LoadStats()
+    out = list(dedup_stream(items, aliases=aliases, stats=stats))
+    assert [(n, r) for n, _, r in out] == [("z", None), ("b", None), ("m", "z"), ("a", "m")]
+    assert aliases == {"a": ["m", "z"]} and stats.duplicates == 2
+    assert stats.duplicate_chars == 0  # each displaced copy had been scored as well
+
+    kept = list(dedup(sorted(items), aliases={}))
+    assert [n for n, _ in kept] == ["a", "b"]
+
+
+@pytest.mark.parametrize("mode", ["streaming", "staged"])
+def test_streaming_paths_keep_the_smallest_name(tmp_path, fake_model, monkeypatch, mode):
+    from resume_ranker import pipeline
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas analyst")
+    res = tmp_path / "res"
+    res.mkdir()
+    (res / "ann.txt").write_text(_resume(3))
+    (res / "ann_v2.txt").write_text(_resume(3) + " python")
+    (res / "bob.txt").write_text(_resume(4))
+    arrival = [res / "ann_v2.txt", res / "bob.txt", res / "ann.txt"]  # e.g. cache hits first
+    monkeypatch.setattr(
+        pipeline, "iter_resumes", lambda *a, **kw: ((p.stem, p.read_text()) for p in arrival)
+    )
+    cfg = Config(dedup=True, staged=mode == "staged")
+    df = pipeline.rank(jd, res, top_k=5, cfg=cfg, streaming=mode == "streaming")
+    assert dict(zip(df["candidate"], df["aliases"])) == {"ann": "ann_v2", "bob": ""}
+
+
+def test_score_batches_keeps_the_smallest_name(tmp_path, fake_model, monkeypatch):
+    from resume_ranker import pipeline
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas analyst")
+    res = tmp_path / "res"
+    res.mkdir()
+    (res / "ann.txt").write_text(_resume(3))
+    (res / "ann_v2.txt").write_text(_resume(3) + " python")
+    (res / "bob.txt").write_text(_resume(4))
+    arrival = [res / "ann_v2.txt", res / "bob.txt", res / "ann.txt"]
+    monkeypatch.setattr(
+        pipeline, "iter_resumes", lambda *a, **kw: ((p.stem, p.read_text()) for p in arrival)
+    )
+    cfg = Config(dedup=True, embed_batch_size=1)
+    stats = LoadStats()
+    batches = list(pipeline.score_batches(jd, res, cfg=cfg, stats=stats))
+    assert sorted(n for b in batches for n in b["candidate"]) == ["ann", "bob"]
+    assert (stats.duplicates, stats.duplicate_chars) == (1, 0)
@@ -0,0 +1,46 @@
+import re
+
+import numpy as np
+
+from resume_ranker import embed
+
+
+def test_similarities_encode_corpus_in_one_pass(fake_model):
+    texts = ["python sql", "project manager", "sql python pandas"]
+    sims = embed.similarities("python sql", texts, batch_size=16)
+    assert fake_model.calls == [1, 3]  # JD once, corpus once
+    assert sims.shape == (3,)
+    assert sims[0] == sims.max()
+    assert np.isclose(sims[0], 1.0)
+
+
+class WordTokenizer:
+    """Whitespace tokenizer with the fast-tokenizer call signature used by embed._truncate."""
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, texts, max_length=None, **kwargs):
+        spans = [[(m.start(), m.end()) for m in re.finditer(r"\S+", t)][:max_length] for t in texts]
+        return {"offset_mapping": spans}
+
+
+def test_encode_buckets_by_length_and_truncates(fake_model):
+    fake_model.tokenizer = WordTokenizer()
+    fake_model.max_seq_length = 8  # 6 words + 2 special tokens
+    seen = []
+    real = fake_model.encode
+    fake_model.encode = lambda texts, **kw: (seen.append(list(texts)), real(texts, **kw))[1]
+
+    texts = ["a b c d e f g h i", "x", "p q r", "y", "s t u v"]
+    stats = embed.EncodeStats()
+    out = embed.encode(texts, batch_size=2, stats=stats)
+
+    assert seen == [["x", "y"], ["p q r", "s t u v"], ["a b c d e f"]]
+    assert np.allclose(
+        out, real(["a b c d e f", "x", "p q r", "y", "s t u v"], normalize_embeddings=True)
+    )
+    assert stats.truncated == 1
+    assert stats.tokens == 3 + 5 + 6 + 8 + 3
+    assert stats.padded_tokens == 2 * 3 + 2 * 6 + 8
+    assert 0 < stats.padding_ratio < 0.2
@@ -0,0 +1,130 @@
+import json
+
+import numpy as np
+from typer.testing import CliRunner
+
+from resume_ranker.cli import app
+from resume_ranker.config import Config
+from resume_ranker.evidence import EvidenceWriter, iter_evidence, render, split_sentences
+
+JANE = (
+    "Jane Doe\nSKILLS: Python, SQL, pandas, scikit learn\n"
+    "Data Analyst, Acme  Aug 2018 - Jun 2021\n"
+    "- Built reporting dashboards in Python for twelve teams.\n"
+    "Engineer, Globex 03/2021 - 11/2023\n"
+    "- Migrated ETL jobs to Airflow and cut runtime.\n"
+)
+
+
+def _corpus(tmp_path):
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Data analyst with Python and SQL, 3+ years of experience building dashboards.")
+    res = tmp_path / "res"
+    res.mkdir()
+    (res / "jane.txt").write_text(JANE)
+    (res / "bob.txt").write_text("Bob\nExcel and Word. Jan 2020 - Jan 2021 clerk at a bank.")
+    (res / "amy.txt").write_text("Amy\nPython numpy\n2015 2019")
+    return jd, res
+
+
+def test_split_sentences_offsets():
+    text = "Hi.\n  Built ETL jobs in Python daily. Short one!\nLed a team of five people"
+    spans = split_sentences(text)
+    assert [text[a:b] for a, b in spans] == [
+        "Built ETL jobs in Python daily",
+        "Led a team of five people",
+    ]
+
+
+def test_rank_records_evidence_for_every_candidate(tmp_path, fake_model):
+    from resume_ranker.pipeline import rank
+
+    jd, res = _corpus(tmp_path)
+    cfg = Config(cache_dir=None)
+    with EvidenceWriter(tmp_path / "ev.jsonl") as w:
+        df = rank(jd, res, top_k=1, cfg=cfg, evidence=w)
+    records = list(iter_evidence(tmp_path / "ev.jsonl"))
+    assert len(records) == 3 and records[0].candidate == df["candidate"][0]
+    jane = next(r for r in records if r.candidate == "jane")
+
+    hits = {s: (start, end, kind, quote) for s, start, end, kind, quote in jane.skills}
+    assert hits["python"][2] == "exact" and JANE[hits["python"][0] : hits["python"][1]] == "Python"
+    assert hits["scikit-learn"][2:] == ("fuzzy", "scikit learn")
+    assert "numpy" in jane.missing
+    assert [q for *_, q in jane.ranges] == ["Aug 2018 - Jun 2021", "03/2021 - 11/2023"]
+    assert len(jane.intervals) == 1 and jane.exp_source == "intervals"
+    assert len(jane.sentences) == 3
+    assert all(JANE[a:b] == q for a, b, _, q in jane.sentences)
+
+    full = rank(jd, res, top_k=3, cfg=cfg).set_index("candidate")
+    assert np.isclose(jane.scores["total"], full.loc["jane", "total"])
+    report = render(jane)
+    assert "**scikit-learn** (fuzzy" in report and "merged: Aug 2018 - Nov 2023" in report
+
+
+def test_explain_renders_stored_evidence_in_bulk(tmp_path, fake_model):
+    jd, res = _corpus(tmp_path)
+    ev = tmp_path / "ev.jsonl"
+    r = CliRunner().invoke(
+        app, ["rank", "--jd", str(jd), "--resumes", str(res), "--no-cache", "--evidence", str(ev)]
+    )
+    assert r.exit_code == 0, r.output
+    calls = len(fake_model.calls)
+
+    r = CliRunner().invoke(app, ["explain", "--evidence", str(ev), "--out", str(tmp_path / "rep")])
+    assert r.exit_code == 0, r.output
+    assert sorted(p.name for p in (tmp_path / "rep").iterdir()) == ["amy.md", "bob.md", "jane.md"]
+    r = CliRunner().invoke(
+        app, ["explain", "--evidence", str(ev), "--candidate", str(res / "bob.txt")]
+    )
+    assert r.exit_code == 0 and r.output.startswith("# bob\n")
+    assert len(fake_model.calls) == calls  # nothing re-embedded
+
+    r = CliRunner().invoke(app, ["explain", "--evidence", str(ev), "--candidate", "nobody"])
+    assert r.exit_code != 0 and "nobody" in r.output
+
+    r = CliRunner().invoke(app, ["explain", "--jd", str(jd), "--candidate", str(res / "jane.txt")])
+    assert r.exit_code == 0, r.output
+    stored = json.loads(next(line for line in ev.read_text().splitlines() if '"jane"' in line))
+    assert f"**Total {stored['scores']['total']:.3f}**" in r.output
+
+
+def test_explain_matches_stored_names_exactly(tmp_path, fake_model):
+    jd, res = _corpus(tmp_path)
+    (res / "j.r.smith.txt").write_text(JANE.replace("Jane Doe", "J. R. Smith"))
+    ev = tmp_path / "ev.jsonl"
+    r = CliRunner().invoke(
+        app, ["rank", "--jd", str(jd), "--resumes", str(res), "--no-cache", "--evidence", str(ev)]
+    )
+    assert r.exit_code == 0, r.output
+
+    r = CliRunner().invoke(app, ["explain", "--evidence", str(ev), "--candidate", "j.r.smith"])
+    assert r.exit_code == 0 and r.output.startswith("# j.r.smith\n"), r.output
+    r = CliRunner().invoke(
+        app,
+        [
+            "explain",
+            "--evidence",
+            str(ev),
+            "--top-k",
+            "1",
+            "--candidate",
+            "jane",
+            "--candidate",
+            "nobody",
+        ],
+    )
+    assert r.exit_code != 0 and "nobody" in r.output
+
+
+def test_evidence_sentences_stay_out_of_the_embedding_store(tmp_path, fake_model):
+    from resume_ranker.embed import open_store
+    from resume_ranker.pipeline import rank
+
+    jd, res = _corpus(tmp_path)
+    cfg = Config(cache_dir=tmp_path / "cache")
+    with EvidenceWriter(tmp_path / "ev.jsonl") as w:
+        rank(jd, res, cfg=cfg, evidence=w)
+    store = open_store(cfg.cache_dir)
+    assert len(store) == 4  # the JD and three resumes
+    store.close()
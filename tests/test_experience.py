@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from resume_ranker.experience import estimate_experience_years, extract_experience
+
+
+def test_single_pass_returns_years_and_intervals():
+    text = "Analyst, Acme\nAug 2019 – Jun 2021\nEngineer 05/2021 - 12/2022\nB.Sc. 2015"
+    res = extract_experience(text, now=datetime(2025, 1, 1))
+    assert res.source == "intervals"
+    assert res.intervals == [(2019 * 12 + 7, 2022 * 12 + 11)]  # overlapping ranges merged
+    assert [text[s:e] for s, e, _, _ in res.ranges] == ["Aug 2019 – Jun 2021", "05/2021 - 12/2022"]
+    assert res.years == estimate_experience_years(text) == 3.33
+
+
+def test_explicit_statement_wins_and_year_fallback():
+    assert extract_experience("7+ years of experience; Jan 2020 - Jan 2021").years == 7.0
+    res = extract_experience("Graduated 2012, joined Acme in 2016")
+    assert (res.source, res.years) == ("years", 4.0)
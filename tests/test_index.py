@@ -0,0 +1,38 @@
+import pytest
+
+from resume_ranker.config import Config
+from resume_ranker.index import CandidateIndex, build_index
+from resume_ranker.pipeline import rank
+
+from test_pipeline import _corpus
+
+
+def test_index_query_matches_pipeline(tmp_path, fake_model):
+    res = _corpus(tmp_path)
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas, 3 years of experience")
+    idx = build_index(tmp_path / "idx", res)
+    assert len(idx) == 5
+
+    cfg = Config()
+    got = CandidateIndex(tmp_path / "idx").search(jd.read_text(), cfg, top_k=3)
+    want = rank(jd, res, top_k=3, cfg=cfg)
+    assert list(got.columns) == list(want.columns)
+    assert list(got["candidate"]) == list(want["candidate"])
+    assert list(got["total"]) == pytest.approx(list(want["total"]), abs=1e-6)
+
+    # incremental: unchanged files are skipped, edits replace, removals drop out
+    (res / "c3.txt").write_text("python sql pandas numpy etl mlops")
+    build_index(tmp_path / "idx", res)
+    idx = CandidateIndex(tmp_path / "idx")
+    assert (len(idx), idx.meta["rows"]) == (5, 6)
+    assert idx.remove(["c3"]) == 1
+    assert idx.compact() == 2
+    assert "c3" not in list(idx.search(jd.read_text(), cfg, top_k=10)["candidate"])
+
+    idx.train_ivf(nlist=2)
+    approx = idx.search(jd.read_text(), cfg, top_k=4, approximate=True, nprobe=2)
+    assert list(approx["candidate"]) == list(idx.search(jd.read_text(), cfg, top_k=4)["candidate"])
+
+    with pytest.raises(ValueError):
+        idx.search(jd.read_text(), Config(skills=["rust"]))
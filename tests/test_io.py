@@ -0,0 +1,44 @@
+from resume_ranker.io import LoadStats, iter_resumes, load_resumes
+
+
+def test_pool_loader_matches_serial(tmp_path):
+    for i in range(6):
+        (tmp_path / f"r{i}.txt").write_text(f"resume {i} python")
+    (tmp_path / "notes.md").write_text("ignored")
+    stats = LoadStats()
+    pooled = sorted(iter_resumes(tmp_path, workers=2, stats=stats))
+    assert pooled == sorted(load_resumes(tmp_path))
+    assert len(pooled) == stats.files == 6
+
+
+def test_documents_extract_from_bytes_and_file_objects(tmp_path):
+    import io
+
+    from resume_ranker.io import extract_file, iter_documents
+    from resume_ranker.synth import pdf_bytes, write_docx
+
+    write_docx(tmp_path / "d.docx", "Docx person\npython")
+    (tmp_path / "t.txt").write_bytes(b"line one\r\nline two")
+    pdf = pdf_bytes("Pdf person\nsql")
+    assert "sql" in extract_file(pdf, name="p.pdf")
+    assert extract_file(
+        io.BytesIO((tmp_path / "t.txt").read_bytes()), name="t.txt"
+    ) == extract_file(tmp_path / "t.txt")
+    with open(tmp_path / "d.docx", "rb") as fh:
+        assert extract_file(fh) == extract_file(tmp_path / "d.docx")
+
+    docs = [
+        ("p.pdf", pdf),
+        ("d.docx", (tmp_path / "d.docx").read_bytes()),
+        ("bad.pdf", b"not a pdf"),
+        ("copy.pdf", io.BytesIO(pdf)),
+    ]
+    memo, stats = {}, LoadStats()
+    out = list(iter_documents(docs, stats=stats, memo=memo))
+    assert [n for n, _ in out] == ["p", "d", "copy"] and out[0][1] == out[2][1]
+    assert (stats.files, stats.cache_hits, stats.cache_misses) == (3, 1, 3)
+    assert [e.path for e in stats.errors] == ["bad.pdf"] and len(memo) == 2
+
+    again = LoadStats()
+    assert list(iter_documents(docs[:2], stats=again, memo=memo)) == out[:2]
+    assert again.cache_hits == 2 and not again.timings
@@ -0,0 +1,17 @@
+import numpy as np
+
+from resume_ranker.lexical import bm25_scores
+
+
+def test_bm25_prefers_rare_query_terms_and_short_documents():
+    texts = [
+        "python developer",
+        "python python sql",
+        "python " + "filler " * 10 + "sql",
+        "sales and marketing",
+    ]
+    s = bm25_scores("python sql", texts)
+    assert s.max() == 1.0 and s[3] == 0.0
+    assert np.argmax(s) == 1
+    assert s[1] > s[2] > s[0]  # the rarer "sql" outweighs "python"; length is penalized
+    assert bm25_scores("python", []).shape == (0,)
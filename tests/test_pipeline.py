@@ -0,0 +1,224 @@
+from pathlib import Path
+
+import pytest
+
+from resume_ranker.pipeline import RankSummary, rank, rank_topk
+
+
+def _corpus(tmp_path: Path) -> Path:
+    res = tmp_path / "res"
+    res.mkdir()
+    for i, body in enumerate(
+        [
+            "Python SQL pandas analyst, 4 years of experience",
+            "Project manager, stakeholder comms",
+            "numpy scikit-learn python etl",
+            "sales and marketing",
+            "python sql dashboarding streamlit mlops",
+        ]
+    ):
+        (res / f"c{i}.txt").write_text(body)
+    return res
+
+
+def test_streaming_topk_matches_full_rank(tmp_path, fake_model):
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    res = _corpus(tmp_path)
+    full = rank(jd, res, top_k=3)
+    streamed = rank(jd, res, top_k=3, streaming=True)
+    assert list(streamed["candidate"]) == list(full["candidate"])
+    assert list(streamed.columns) == list(full.columns)
+
+    summary = RankSummary()
+    top = rank_topk(jd, res, top_k=2, summary=summary)
+    assert len(top) == 2
+    assert summary.count == 5 and sum(summary.histogram) == 5
+    assert summary.total_max == top[0][1].total
+
+
+def test_rank_many_matches_single_jd_runs(tmp_path, fake_model):
+    from resume_ranker.pipeline import rank_many
+
+    res = _corpus(tmp_path)
+    jd_a = tmp_path / "analyst.txt"
+    jd_a.write_text("Python SQL pandas, 5 years of experience")
+    jd_b = tmp_path / "pm.txt"
+    jd_b.write_text("Project manager for stakeholder comms")
+    fake_model.calls.clear()
+    many = rank_many([jd_a, jd_b], res, top_k=2)
+    assert fake_model.calls == [5, 1, 1]  # corpus once, then each JD
+    assert list(many["jd"]) == ["analyst", "analyst", "pm", "pm"]
+    for jd in (jd_a, jd_b):
+        single = rank(jd, res, top_k=2)
+        part = many[many["jd"] == jd.stem]
+        assert list(part["candidate"]) == list(single["candidate"])
+        assert list(part["total"]) == pytest.approx(list(single["total"]), abs=1e-6)
+
+
+def test_incremental_rank_rescores_only_changes(tmp_path, fake_model):
+    from resume_ranker.manifest import ManifestStats
+    from resume_ranker.pipeline import rank_incremental
+
+    res = _corpus(tmp_path)
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    manifest = tmp_path / "manifest.json"
+    first = rank_incremental(jd, res, manifest, top_k=5)
+    assert list(first["candidate"]) == list(rank(jd, res, top_k=5)["candidate"])
+
+    (res / "c1.txt").unlink()
+    (res / "c5.txt").write_text("python sql pandas analyst")
+    fake_model.calls.clear()
+    m = ManifestStats()
+    second = rank_incremental(jd, res, manifest, top_k=5, mstats=m)
+    assert (m.reused, m.scored, m.removed) == (4, 1, 1)
+    assert fake_model.calls == [1, 1]  # JD + the one new resume
+    assert list(second["candidate"]) == list(rank(jd, res, top_k=5)["candidate"])
+
+
+def test_cascade_embeds_only_the_shortlist(tmp_path, fake_model):
+    from resume_ranker.pipeline import CascadeStats, rank_cascade
+
+    res = _corpus(tmp_path)
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    full = rank(jd, res, top_k=2)
+
+    fake_model.calls.clear()
+    cs = CascadeStats()
+    df = rank_cascade(jd, res, top_k=2, keep=3, cstats=cs, check_recall=True)
+    assert fake_model.calls[:2] == [1, 3]  # JD, then only the shortlist
+    assert (cs.candidates, cs.shortlisted) == (5, 3)
+    assert cs.recall == 1.0
+    assert list(df["candidate"]) == list(full["candidate"])
+    assert df["total"].tolist() == pytest.approx(full["total"].tolist())
+
+    everyone = rank_cascade(jd, res, top_k=5, keep=1.0)
+    assert list(everyone["candidate"]) == list(rank(jd, res, top_k=5)["candidate"])
+
+
+def test_rank_documents_matches_folder_rank(tmp_path, fake_model):
+    from resume_ranker.config import Config
+    from resume_ranker.pipeline import rank_documents, score_texts
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    res = _corpus(tmp_path)
+    cfg = Config(embed_batch_size=2)
+    expected = rank(jd, res, top_k=3, cfg=cfg)
+    docs = [(p.name, p.read_bytes()) for p in sorted(res.iterdir())]
+    got = rank_documents(jd.read_text(), docs, top_k=3, cfg=cfg)
+    assert got.equals(expected)
+    got = rank_documents(jd.read_bytes(), docs, top_k=3, cfg=cfg, jd_name="jd.txt")
+    assert list(got["candidate"]) == list(expected["candidate"])
+
+    parts = list(
+        score_texts("Python SQL", [(p.stem, p.read_text()) for p in res.iterdir()], cfg=cfg)
+    )
+    assert [len(p) for p in parts] == [2, 2, 1]
+
+
+def test_empty_folder_with_cache(tmp_path, fake_model):
+    from resume_ranker.config import Config
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL")
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    cfg = Config(cache_dir=tmp_path / "cache")
+    for _ in range(2):  # second run: the store already knows its dimension
+        df = rank(jd, empty, cfg=cfg)
+        assert df.empty
+
+
+def test_rank_many_keeps_jds_with_the_same_stem_apart(tmp_path, fake_model):
+    from resume_ranker.pipeline import rank_many
+
+    res = _corpus(tmp_path)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    jd_a = tmp_path / "a" / "jd.txt"
+    jd_a.write_text("Python SQL pandas")
+    jd_b = tmp_path / "b" / "jd.txt"
+    jd_b.write_text("Project manager, sales")
+    many = rank_many([jd_a, jd_b], res, top_k=2, jd_skills={str(jd_b): ["sales"]})
+    assert list(many["jd"]) == [str(jd_a)] * 2 + [str(jd_b)] * 2
+    assert list(many["candidate"][:2]) == list(rank(jd_a, res, top_k=2)["candidate"])
+    assert many["candidate"][2] == "c3"  # the only "sales" resume
+    assert rank_many([], res).empty
+
+
+def test_manifest_key_covers_extraction_limits_and_dedup():
+    from resume_ranker.config import Config
+    from resume_ranker.manifest import manifest_key
+
+    base = manifest_key("jd", Config(), "m")
+    assert manifest_key("jd", Config(weights={"w_skills": 1, "w_sim": 0, "w_exp": 0}), "m") == base
+    for update in ({"extract_max_pages": 2}, {"extract_max_chars": 1000}, {"dedup": True}):
+        assert manifest_key("jd", Config(**update), "m") != base
+    assert manifest_key("jd", Config(dedup_threshold=0.5), "m") == base  # dedup is off
+    assert manifest_key("jd", Config(dedup=True, dedup_threshold=0.5), "m") != manifest_key(
+        "jd", Config(dedup=True), "m"
+    )
+
+
+def test_manifest_records_the_bytes_diff_saw(tmp_path):
+    import json
+    import os
+
+    from resume_ranker.manifest import Manifest
+
+    res = _corpus(tmp_path)
+    m = Manifest(tmp_path / "m.json", "k")
+    todo, _, _ = m.diff(sorted(res.iterdir()))
+    (res / "c1.txt").write_text("edited while the old text was being scored")
+    for p in todo:
+        m.record(p, p.stem, {"skills": 0.0})
+    m.save()
+    todo, _, _ = Manifest(tmp_path / "m.json", "k").diff(sorted(res.iterdir()))
+    assert [p.name for p in todo] == ["c1.txt"]
+
+    st = (res / "c2.txt").stat()
+    os.utime(res / "c2.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched only
+    m = Manifest(tmp_path / "m.json", "k")
+    assert [p.name for p in m.diff(sorted(res.iterdir()))[0]] == ["c1.txt"]
+    assert m.dirty
+    m.save()
+    entries = json.loads((tmp_path / "m.json").read_text())["entries"]
+    assert entries[str((res / "c2.txt").resolve())]["mtime_ns"] == st.st_mtime_ns + 10**9
+
+
+def test_incremental_rank_drops_a_changed_file_that_fails(tmp_path, fake_model):
+    from resume_ranker.manifest import ManifestStats
+    from resume_ranker.pipeline import rank_incremental
+
+    res = _corpus(tmp_path)
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    manifest = tmp_path / "manifest.json"
+    rank_incremental(jd, res, manifest, top_k=5)
+    (res / "c0.txt").write_bytes(b"\xff\xfe not utf-8 \xc3")
+    m = ManifestStats()
+    df = rank_incremental(jd, res, manifest, top_k=5, mstats=m)
+    assert "c0" not in set(df["candidate"]) and len(df) == 4
+    m = ManifestStats()
+    df = rank_incremental(jd, res, manifest, top_k=5, mstats=m)
+    assert m.scored == 1 and "c0" not in set(df["candidate"])  # tried again, not stale
+
+
+def test_incremental_rank_folds_duplicates_and_breaks_ties_by_name(tmp_path, fake_model):
+    from resume_ranker.config import Config
+    from resume_ranker.pipeline import rank_incremental
+
+    res = _corpus(tmp_path)
+    (res / "b.txt").write_text((res / "c0.txt").read_text())
+    (res / "z.txt").write_text((res / "c4.txt").read_text())
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas data analysis")
+    cfg = Config(dedup=True)
+    df = rank_incremental(jd, res, tmp_path / "m.json", top_k=10, cfg=cfg)
+    assert list(df["candidate"]) == list(rank(jd, res, top_k=10, cfg=cfg)["candidate"])
+    assert dict(zip(df["candidate"], df["aliases"]))["b"] == "c0"
+    df = rank_incremental(jd, res, tmp_path / "plain.json", top_k=10)
+    assert df["candidate"].tolist().index("c4") < df["candidate"].tolist().index("z")
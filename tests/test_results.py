@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from resume_ranker.config import Config, Weights
+from resume_ranker.pipeline import score_table
+from resume_ranker.rank import score_candidate
+from resume_ranker.results import ScoreTable
+from test_pipeline import _corpus
+
+
+def test_reweight_matches_full_rescoring(tmp_path, fake_model):
+    res = _corpus(tmp_path)
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas, 3+ years")
+    table = score_table(jd, res)
+    calls = len(fake_model.calls)
+
+    w = Weights(w_skills=0.2, w_sim=0.3, w_exp=0.5)
+    top = table.reweight(w).top_k(3)
+    assert len(fake_model.calls) == calls  # nothing re-encoded
+
+    cfg = Config(weights=w)
+    expected = sorted(
+        (
+            (score_candidate(p.read_text(), jd.read_text(), cfg).total, p.stem)
+            for p in sorted(res.iterdir())
+        ),
+        key=lambda x: -x[0],
+    )[:3]
+    assert list(top.candidate) == [name for _, name in expected]
+    assert top.total == pytest.approx([t for t, _ in expected])
+
+
+def test_filter_and_frame():
+    t = ScoreTable(
+        candidate=np.array(["a", "b", "c"], dtype=object),
+        skills=np.array([1.0, 0.2, 0.6]),
+        sim=np.array([0.5, 0.9, 0.1]),
+        exp_years=np.array([6.0, 1.0, 0.0]),
+        exp_target=np.array([3.0, 3.0, 0.0]),
+    )
+    assert t.exp_score.tolist() == pytest.approx([1.0, 1 / 3, 0.0])
+    assert list(t.filter({"skills": 0.5, "sim": None}).candidate) == ["a", "c"]
+    df = t.top_k(2).to_frame()
+    assert list(df["candidate"]) == ["a", "b"]
+    assert list(df.columns) == [
+        "candidate",
+        "skills",
+        "sim",
+        "exp_score",
+        "exp_years",
+        "exp_target",
+        "total",
+    ]
@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from resume_ranker.config import Config  # noqa: E402
+from resume_ranker.service import MicroBatcher, create_app  # noqa: E402
+
+
+def test_microbatcher_merges_concurrent_requests(fake_model):
+    from resume_ranker import embed
+
+    async def run():
+        b = MicroBatcher(lambda t: embed.encode(t, batch_size=64), max_latency=0.05)
+        b.start()
+        out = await asyncio.gather(
+            *(b.encode([f"text {c}"] * (i + 1)) for i, c in enumerate("abcd"))
+        )
+        await b.stop()
+        return b, out
+
+    b, out = asyncio.run(run())
+    assert (b.stats.batches, b.stats.requests, b.stats.texts) == (1, 4, 10)
+    assert fake_model.calls == [10]
+    assert [len(o) for o in out] == [1, 2, 3, 4]
+    assert np.allclose(out[3][0], embed.encode(["text d"])[0])
+
+
+def test_rank_and_explain_endpoints(fake_model):
+    cfg = Config(skills=["python", "sql", "tableau"])
+    files = [
+        ("resumes", ("ann.txt", b"Python and SQL analyst, 2016-2022")),
+        ("resumes", ("bob.txt", b"Warehouse forklift operator")),
+    ]
+    with ThreadPoolExecutor(2) as pool, TestClient(create_app(cfg, executor=pool)) as client:
+        r = client.post("/rank", data={"jd_text": "python sql analyst", "top_k": 5}, files=files)
+        assert r.status_code == 200
+        rows = r.json()["results"]
+        assert [row["candidate"] for row in rows] == ["ann", "bob"]
+        assert rows[0]["skills"] == pytest.approx(2 / 3)
+
+        r = client.post(
+            "/explain",
+            data={"jd_text": "python sql analyst"},
+            files={"resume": ("ann.txt", b"Python and SQL analyst, 2016-2022")},
+        )
+        body = r.json()
+        assert body["matched_skills"] == ["python", "sql"]
+        assert body["missing_skills"] == ["tableau"]
+
+        r = client.post("/explain", data={"jd_text": "x"}, files={"resume": ("a.exe", b"")})
+        assert r.status_code == 415
+
+        spans = client.get("/metrics").json()["spans"]  # two /rank rows + one /explain
+        assert spans["skills"]["count"] == 3 and spans["embed"]["count"] >= 1
+
+
+def test_unreadable_uploads_are_reported_per_file(fake_model):
+    files = [
+        ("resumes", ("ann.txt", b"Python and SQL analyst")),
+        ("resumes", ("broken.pdf", b"not a pdf")),
+    ]
+    with ThreadPoolExecutor(2) as pool, TestClient(create_app(Config(), executor=pool)) as client:
+        r = client.post("/rank", data={"jd_text": "python sql analyst"}, files=files)
+        assert r.status_code == 200
+        body = r.json()
+        assert [row["candidate"] for row in body["results"]] == ["ann"]
+        [err] = body["errors"]
+        assert err["path"] == "broken.pdf" and err["kind"] == "error"
+
+        r = client.post(
+            "/explain", data={"jd_text": "python"}, files={"resume": ("broken.pdf", b"not a pdf")}
+        )
+        assert r.status_code == 422 and r.json()["detail"]["path"] == "broken.pdf"
+
+        r = client.post("/rank", data={"jd_text": "python", "w_skills": 1.0}, files=files[:1])
+        assert r.status_code == 422 and "all three weights" in r.json()["detail"]
+
+        files.append(("resumes", ("setup.exe", b"MZ")))
+        r = client.post("/rank", data={"jd_text": "python sql analyst"}, files=files)
+        assert r.status_code == 200
+        errors = {e["path"]: e["kind"] for e in r.json()["errors"]}
+        assert errors == {"broken.pdf": "error", "setup.exe": "unsupported"}
+
+        r = client.post("/rank", data={"jd_text": "python", "top_k": 0}, files=files[:1])
+        assert r.status_code == 422
+
+
+def test_rank_endpoint_orders_ties_by_name_and_applies_limits(fake_model):
+    from resume_ranker.synth import pdf_bytes
+
+    files = [("resumes", (f"{name}.txt", b"python analyst")) for name in ("cat", "bob", "ann")]
+    files.append(("resumes", ("two_pages.pdf", pdf_bytes("python\nsql", lines_per_page=1))))
+    cfg = Config(skills=["python", "sql"], extract_max_pages=1)
+    with ThreadPoolExecutor(2) as pool, TestClient(create_app(cfg, executor=pool)) as client:
+        r = client.post("/rank", data={"jd_text": "python sql"}, files=files)
+        rows = {row["candidate"]: row for row in r.json()["results"]}
+        assert [n for n in rows if n != "two_pages"] == ["ann", "bob", "cat"]  # ties by name
+        assert rows["two_pages"]["skills"] == 0.5  # "sql" is on page 2
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from resume_ranker.shard import merge_partials, parse_shard, shard_of
+
+SKILLS = ["python", "sql", "pandas", "etl", "streamlit", "aws", "java", "excel"]
+
+
+def _cli(*args):
+    proc = subprocess.run(
+        [sys.executable, "-m", "resume_ranker.cli", *map(str, args)],
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc
+
+
+def test_shard_assignment_is_stable_and_total():
+    assert shard_of("a/b.pdf", 4) == shard_of("a/b.pdf", 4)
+    picked = [shard_of(f"r{i}.txt", 3) for i in range(300)]
+    assert set(picked) == {0, 1, 2} and min(picked.count(s) for s in range(3)) > 50
+    assert parse_shard("2/3") == (2, 3)
+    with pytest.raises(ValueError):
+        parse_shard("3/3")
+
+
+def test_sharded_subprocess_runs_merge_to_single_node_ranking(tmp_path):
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas ETL analyst, 3 years of experience")
+    res = tmp_path / "res"
+    (res / "sub").mkdir(parents=True)
+    for i in range(40):
+        skills = " ".join(SKILLS[j] for j in range(len(SKILLS)) if (i >> (j % 5)) & 1)
+        folder = res / "sub" if i % 3 == 0 else res
+        text = f"Analyst using {skills}, {i % 7} years of experience"
+        (folder / f"c{i:02d}.txt").write_text(text)
+    (res / "twin.txt").write_text((res / "c05.txt").read_text())  # tie on total: name decides
+
+    common = ["--jd", jd, "--resumes", res, "--top-k", 8, "--backend", "sklearn", "--no-cache"]
+    single = tmp_path / "single.csv"
+    _cli("rank", *common, "--out", single)
+    n = 3
+    parts = [tmp_path / f"part{i}.npz" for i in range(n)]
+    for i, part in enumerate(parts):
+        _cli("rank", *common, "--shard", f"{i}/{n}", "--out", part)
+    merged = tmp_path / "merged.csv"
+    _cli("merge", *parts, "--out", merged)
+
+    assert merged.read_text() == single.read_text()
+    assert len(pd.read_csv(merged)) == 8
+    with pytest.raises(ValueError, match="exactly once"):
+        merge_partials(parts[:2])
+    with pytest.raises(ValueError, match="top 8"):
+        merge_partials(parts, top_k=9)
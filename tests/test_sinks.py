@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from resume_ranker.config import Config
+from resume_ranker.sinks import COLUMNS, decode_hits, hit_bits, open_sink, read_results
+
+SKILLS = ["python", "sql", "excel"]
+
+
+def _batch(start: int, n: int, dim: int = 4):
+    rng = np.random.default_rng(start)
+    b = {"candidate": np.array([f"c{i:03d}" for i in range(start, start + n)], dtype=object)}
+    b.update((c, rng.random(n)) for c in COLUMNS[1:])
+    b["embedding"] = rng.random((n, dim)).astype(np.float32)
+    b["skill_hits"] = np.stack([hit_bits([i % 2 == 0, True, False]) for i in range(n)])
+    return b
+
+
+def test_hit_bits_roundtrip():
+    bits = hit_bits([True, False, True] + [False] * 6 + [True])
+    assert len(bits) == 2
+    assert decode_hits(bits.tobytes(), list("abcdefghij")) == ["a", "c", "j"]
+
+
+def test_jsonl_and_csv_stream_each_batch(tmp_path):
+    with open_sink(tmp_path / "r.jsonl", SKILLS) as sink:
+        sink.write(_batch(0, 3))
+        assert len((tmp_path / "r.jsonl").read_text().splitlines()) == 3  # flushed already
+        sink.write(_batch(3, 2))
+    rows = [json.loads(line) for line in (tmp_path / "r.jsonl").read_text().splitlines()]
+    assert [r["candidate"] for r in rows] == ["c000", "c001", "c002", "c003", "c004"]
+    assert len(rows[0]["embedding"]) == 4
+    assert decode_hits(bytes.fromhex(rows[1]["skill_hits"]), SKILLS) == ["sql"]
+
+    b = _batch(0, 3)
+    del b["embedding"]
+    with open_sink(tmp_path / "r.csv", SKILLS) as sink:
+        sink.write(b)
+    df = pd.read_csv(tmp_path / "r.csv")
+    assert list(df.columns) == COLUMNS + ["skill_hits"]
+    assert np.allclose(df["total"], b["total"])
+    with open_sink(tmp_path / "bad.csv") as sink, pytest.raises(ValueError, match="embeddings"):
+        sink.write(_batch(0, 1))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_columnar_output_is_typed_and_chunked(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"r{suffix}"
+    with open_sink(path, SKILLS, row_group=4) as sink:
+        for start in range(0, 10, 3):
+            sink.write(_batch(start, 3))
+    table = read_results(path)
+    assert table.num_rows == 12
+    assert table.schema.field("total").type == pa.float32()
+    assert table.schema.field("embedding").type == pa.list_(pa.float32(), 4)
+    assert json.loads(table.schema.metadata[b"resume_ranker.skills"]) == SKILLS
+    assert decode_hits(table["skill_hits"][0].as_py(), SKILLS) == ["python", "sql"]
+    emb = table["embedding"].combine_chunks().flatten().to_numpy().reshape(-1, 4)
+    assert np.array_equal(emb[:3], _batch(0, 3)["embedding"])
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        assert pq.ParquetFile(path).num_row_groups == 3
+    else:
+        assert max(len(c) for c in table["total"].chunks) <= 4
+
+
+def test_rank_to_sink_matches_rank(tmp_path, fake_model):
+    from resume_ranker.pipeline import rank, rank_to_sink
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL analyst, 3+ years")
+    res = tmp_path / "res"
+    res.mkdir()
+    for i, body in enumerate(
+        ["python sql 2019 - 2023", "excel only", "sql tableau", "python pandas", "nothing here"]
+    ):
+        (res / f"r{i}.txt").write_text(body)
+    cfg = Config(cache_dir=None, embed_batch_size=2)
+    expected = rank(jd, res, top_k=3, cfg=cfg)
+
+    with open_sink(tmp_path / "top.jsonl", cfg.skills) as sink:
+        assert rank_to_sink(jd, res, sink, top_k=3, cfg=cfg, skill_hits=True) == 3
+    rows = [json.loads(line) for line in (tmp_path / "top.jsonl").read_text().splitlines()]
+    assert [r["candidate"] for r in rows] == list(expected["candidate"])
+    assert np.allclose([r["total"] for r in rows], expected["total"])
+    assert "python" in decode_hits(bytes.fromhex(rows[0]["skill_hits"]), cfg.skills)
+
+    with open_sink(tmp_path / "all.jsonl") as sink:
+        assert rank_to_sink(jd, res, sink, cfg=cfg, embeddings=True) == 5
+    rows = [json.loads(line) for line in (tmp_path / "all.jsonl").read_text().splitlines()]
+    assert len(rows[0]["embedding"]) == 26
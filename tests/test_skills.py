@@ -0,0 +1,44 @@
+from rapidfuzz import fuzz
+
+from resume_ranker.skills import SkillMatcher, score_skills
+
+SKILLS = ["python", "sql", "scikit-learn", "machine learning", "dashboarding", "ci/cd", "r"]
+
+
+def _legacy(text, skills):
+    low = text.lower()
+    return [s for s in skills if s in low or fuzz.partial_ratio(s, low) > 90]
+
+
+def test_matcher_agrees_with_substring_and_partial_ratio():
+    texts = [
+        "Built dashbording in Python; some MySQL and CI/CD",
+        "Machine-learning with scikit-learn",
+        "Project manager, stakeholder comms",
+        "",
+    ]
+    m = SkillMatcher(SKILLS)
+    for t in texts:
+        assert sorted(m.match(t).matched) == sorted(_legacy(t, SKILLS))
+
+    # where they differ (see SkillMatcher): token matches ignore the separators, and a
+    # text shorter than a skill is not fuzzy-matched as a fragment of it
+    skills = ["c#", "c++", "ci cd", "machine learning", "r"]
+    m = SkillMatcher(skills)
+    for t, new, legacy in [
+        ("ci\ncd pipelines", ["ci cd"], []),
+        ("Machine   learning", ["machine learning", "r"], ["r"]),
+        ("c", [], ["c#", "c++", "ci cd", "machine learning"]),
+    ]:
+        assert sorted(m.match(t).matched) == new
+        assert sorted(_legacy(t, skills)) == legacy
+
+
+def test_hits_carry_positions_and_kind():
+    text = "Senior analyst: SQL, Pythn and dashboarding"
+    hits = {h.skill: h for h in SkillMatcher(["sql", "python", "dashboarding"]).match(text).hits}
+    assert text[hits["sql"].start : hits["sql"].end] == "SQL"
+    assert hits["sql"].kind == "exact"
+    assert hits["dashboarding"].kind == "exact"
+    assert "python" not in hits  # one edit in a 6-letter skill stays below the threshold
+    assert score_skills(text, ["sql", "python"]) == 0.5
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from resume_ranker.stages import PipelineStats, Stage, run_stages
+
+
+def test_stages_keep_order_batch_and_report():
+    stats = PipelineStats()
+    out = list(
+        run_stages(
+            range(10),
+            [Stage("double", lambda x: 2 * x), Stage("sum", lambda xs: [sum(xs)], batch=4)],
+            maxsize=2,
+            stats=stats,
+        )
+    )
+    assert out == [0 + 2 + 4 + 6, 8 + 10 + 12 + 14, 16 + 18]
+    assert [s.name for s in stats.stages] == ["source", "double", "sum"]
+    assert [s.items for s in stats.stages] == [10, 10, 10]
+    assert all(s.depth_max <= 2 for s in stats.stages)
+
+
+def test_slow_consumer_applies_backpressure():
+    produced = []
+
+    def source():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    def slow(xs):
+        time.sleep(0.01)
+        return xs
+
+    baseline = threading.active_count()
+    gen = run_stages(source(), [Stage("id", lambda x: x), Stage("slow", slow, batch=1)], maxsize=4)
+    assert [next(gen) for _ in range(5)] == [0, 1, 2, 3, 4]
+    time.sleep(0.1)
+    # two queues of 4, one item in each thread's hands, one being consumed
+    assert len(produced) <= 5 + 4 + 4 + 2
+    gen.close()
+    assert threading.active_count() == baseline  # the stage threads were joined
+
+
+def test_stage_errors_reach_the_caller():
+    def boom(x):
+        if x == 3:
+            raise RuntimeError("bad item")
+        return x
+
+    with pytest.raises(RuntimeError, match="bad item"):
+        list(run_stages(range(10), [Stage("boom", boom), Stage("id", lambda xs: xs, batch=2)]))
+
+
+def test_staged_score_table_matches_sequential(tmp_path, fake_model):
+    from resume_ranker.config import Config
+    from resume_ranker.pipeline import score_table
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas analyst, 2 years of experience")
+    res = tmp_path / "res"
+    res.mkdir()
+    for i in range(30):
+        text = f"python {'sql ' * (i % 4)}analyst, {i % 6} years of experience"
+        (res / f"c{i:02d}.txt").write_text(text)
+    seq = score_table(jd, res, cfg=Config()).top_k(30).to_frame()
+    pstats = PipelineStats()
+    cfg = Config(staged=True, stage_queue_size=3, embed_batch_size=4)
+    staged = score_table(jd, res, cfg=cfg, pstats=pstats).top_k(30).to_frame()
+    assert list(staged["candidate"]) == list(seq["candidate"])
+    assert np.allclose(staged.drop(columns="candidate"), seq.drop(columns="candidate"))
+    assert [s.name for s in pstats.stages] == ["extract", "rules", "embed"]
+    assert pstats.stages[-1].items == 30 and pstats.bottleneck() in {"extract", "rules", "embed"}
+    assert "bottleneck" in pstats.summary()
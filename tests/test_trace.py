@@ -0,0 +1,92 @@
+import json
+
+from resume_ranker import trace
+from resume_ranker.pipeline import rank
+
+
+def test_disabled_tracing_is_a_shared_noop():
+    assert trace.active() is None
+    assert trace.span("x", file="a") is trace.span("y")
+    trace.count("n")
+    trace.record("z", 1.0)
+
+
+def test_rank_spans_counters_and_chrome_trace(tmp_path, fake_model):
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL pandas, 3 years of experience")
+    res = tmp_path / "res"
+    res.mkdir()
+    for i in range(4):
+        (res / f"c{i}.txt").write_text(f"Python analyst {'sql ' * i} 2015 - 2020")
+    with trace.tracing() as tracer:
+        rank(jd, res, top_k=2)
+    assert trace.active() is None
+
+    spans = tracer.metrics()["spans"]
+    assert {"extract", "skills", "experience", "embed", "combine", "sort"} <= set(spans)
+    assert spans["extract"]["count"] == spans["skills"]["count"] == 4
+
+    slow = tracer.slowest_files(2)
+    assert len(slow) == 2 and {"extract", "skills", "experience"} <= set(slow[0][2])
+    assert slow[0][1] >= slow[1][1]
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert {e["args"].get("file") for e in events if e["name"] == "skills"} == {
+        "c0",
+        "c1",
+        "c2",
+        "c3",
+    }
+
+
+def test_aggregate_only_tracer_keeps_no_events():
+    with trace.tracing(events=False) as tracer:
+        for _ in range(3):
+            with trace.span("work"):
+                pass
+        trace.count("hits", 2)
+    assert tracer.metrics()["spans"]["work"]["count"] == 3
+    assert tracer.metrics()["counters"] == {"hits": 2}
+    assert tracer.chrome_trace()["traceEvents"][:-1] == []
+
+
+def test_overlapping_tracers_in_threads_stay_separate():
+    import threading
+
+    entered, release = threading.Barrier(2), threading.Barrier(2)
+    tracers = {}
+
+    def session(name):
+        with trace.tracing(events=False) as tracer:
+            tracers[name] = tracer
+            entered.wait()
+            with trace.span(name):
+                pass
+            release.wait()
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert trace.active() is None
+    assert set(tracers["a"].metrics()["spans"]) == {"a"}
+    assert set(tracers["b"].metrics()["spans"]) == {"b"}
+
+
+def test_staged_threads_report_to_the_callers_tracer(tmp_path, fake_model):
+    from resume_ranker.config import Config
+
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Python SQL")
+    res = tmp_path / "res"
+    res.mkdir()
+    for i in range(3):
+        (res / f"c{i}.txt").write_text(f"Python analyst {i}")
+    with trace.tracing(events=False) as tracer:
+        rank(jd, res, cfg=Config(staged=True))
+    spans = tracer.metrics()["spans"]
+    assert spans["skills"]["count"] == 3 and "embed" in spans